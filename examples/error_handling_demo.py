@@ -67,13 +67,13 @@ class ErrorHandlingDemo:
         logger.info("\nSimulating connection state changes...")
         for server_name in states.keys():
             # Simulate connection attempt
-            self.manager._connection_states[server_name] = ConnectionState.CONNECTING
+            self.manager._set_state(server_name, ConnectionState.CONNECTING)
             logger.info(f"{server_name}: DISCONNECTED -> CONNECTING")
             
             await asyncio.sleep(0.5)
             
             # Simulate connection failure
-            self.manager._connection_states[server_name] = ConnectionState.RECONNECTING
+            self.manager._set_state(server_name, ConnectionState.RECONNECTING)
             logger.info(f"{server_name}: CONNECTING -> RECONNECTING")
             
             await asyncio.sleep(0.5)
@@ -138,13 +138,13 @@ class ErrorHandlingDemo:
         for server_name, _, _ in self.demo_servers:
             # Simulate different health states
             if "playwright" in server_name:
-                self.manager._connection_states[server_name] = ConnectionState.CONNECTED
+                self.manager._set_state(server_name, ConnectionState.CONNECTED)
                 self.manager._health_check_failures[server_name] = 0
             elif "filesystem" in server_name:
-                self.manager._connection_states[server_name] = ConnectionState.RECONNECTING
+                self.manager._set_state(server_name, ConnectionState.RECONNECTING)
                 self.manager._health_check_failures[server_name] = 2
             else:
-                self.manager._connection_states[server_name] = ConnectionState.DISCONNECTED
+                self.manager._set_state(server_name, ConnectionState.DISCONNECTED)
                 self.manager._health_check_failures[server_name] = 5
         
         # Update last health check time
@@ -215,7 +215,7 @@ class ErrorHandlingDemo:
         # Scenario 1: Single server reconnection
         logger.info("Scenario 1: Single server reconnection")
         server_name = "playwright_demo"
-        self.manager._connection_states[server_name] = ConnectionState.DISCONNECTED
+        self.manager._set_state(server_name, ConnectionState.DISCONNECTED)
         self.manager._health_check_failures[server_name] = 3
         
         logger.info(f"Before: {server_name} is {self.manager._connection_states[server_name].value}")
@@ -230,7 +230,7 @@ class ErrorHandlingDemo:
         failed_servers = ["filesystem_demo", "search_demo"]
         
         for server in failed_servers:
-            self.manager._connection_states[server] = ConnectionState.DISCONNECTED
+            self.manager._set_state(server, ConnectionState.DISCONNECTED)
             self.manager._health_check_failures[server] = 5
             logger.info(f"{server} marked as failed")
         
@@ -392,5 +392,10 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    # 运行主函数
-    asyncio.run(main())
\ No newline at end of file
+    # 运行主函数，安装了 uvloop 时使用其事件循环（uvicorn[standard] 已包含 uvloop，Windows 除外）
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
@@ -81,14 +81,14 @@ app.add_middleware(GZipMiddleware, minimum_size=1000)
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """记录请求日志"""
-    start_time = time.time()
+    start_time = time.monotonic()
     
     # 记录请求信息
     logger.info(f"Request: {request.method} {request.url}")
     
     try:
         response = await call_next(request)
-        process_time = time.time() - start_time
+        process_time = time.monotonic() - start_time
         
         # 记录响应信息
         logger.info(
@@ -100,7 +100,7 @@ async def log_requests(request: Request, call_next):
         return response
         
     except Exception as e:
-        process_time = time.time() - start_time
+        process_time = time.monotonic() - start_time
         logger.error(
             f"Request failed: {request.method} {request.url} - "
             f"{process_time:.3f}s - {str(e)}"
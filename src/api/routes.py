@@ -7,7 +7,6 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import asyncio
 import json
-import uuid
 
 from ..core.orchestrator import Orchestrator, JobRequest, JobStatus
 from ..modules.skill_library import SkillLibrary, SkillManifest
@@ -125,7 +124,7 @@ async def get_job_status(
             "error": job.error,
             "created_at": job.created_at.isoformat(),
             "updated_at": job.updated_at.isoformat() if job.updated_at else None,
-            "execution_log": job.execution_log[-10:] if job.execution_log else []  # 最近10条日志
+            "execution_log": job.execution_log_entries(limit=10)  # 最近10条日志
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -31,6 +31,12 @@ except ImportError:
     print("请安装click库: pip install click")
     sys.exit(1)
 
+# 可选：更快的事件循环实现
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # 项目模块
 from ..core.orchestrator import Orchestrator, JobRequest, JobStatus
 from ..modules.command_parser import CommandParser
@@ -480,6 +486,12 @@ def cli():
     """Aura智能浏览器自动化系统CLI"""
     pass
 
+def _run(coro):
+    """运行协程，安装了 uvloop 时使用其事件循环"""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
 @cli.command()
 @click.option('--config', '-c', default='development', help='配置环境')
 def interactive(config):
@@ -489,7 +501,7 @@ def interactive(config):
         if await cli_app.initialize():
             await cli_app.run_interactive()
     
-    asyncio.run(run())
+    _run(run())
 
 @cli.command()
 @click.argument('command')
@@ -501,7 +513,7 @@ def execute(command, config):
         if await cli_app.initialize():
             await cli_app.process_command(command)
     
-    asyncio.run(run())
+    _run(run())
 
 @cli.command()
 def version():
@@ -5,7 +5,7 @@
 
 from enum import Enum
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Mapping, Tuple
 
 
 class MCPServerType(Enum):
@@ -57,4 +57,56 @@ class MCPServerConfig:
             timeout=data.get("timeout", 30),
             max_retries=data.get("max_retries", 3),
             health_check_interval=data.get("health_check_interval", 60)
-        )
\ No newline at end of file
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class HealthMetrics:
+    """MCP服务器健康指标快照（不可变，可在缓存中共享）"""
+    total_servers: int
+    enabled_servers: int
+    healthy_servers: int
+    failed_servers: int
+    reconnecting_servers: int
+    health_check_failures: Mapping[str, int]
+    health_check_error_rates: Mapping[str, float]
+    last_health_check: float
+    server_states: Mapping[str, str]
+    healthy_server_list: Tuple[str, ...]
+    failed_server_list: Tuple[str, ...]
+    reconnecting_server_list: Tuple[str, ...]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式（每次返回新的字典和列表）"""
+        return {
+            "total_servers": self.total_servers,
+            "enabled_servers": self.enabled_servers,
+            "healthy_servers": self.healthy_servers,
+            "failed_servers": self.failed_servers,
+            "reconnecting_servers": self.reconnecting_servers,
+            "health_check_failures": dict(self.health_check_failures),
+            "health_check_error_rates": dict(self.health_check_error_rates),
+            "last_health_check": self.last_health_check,
+            "server_states": dict(self.server_states),
+            "healthy_server_list": list(self.healthy_server_list),
+            "failed_server_list": list(self.failed_server_list),
+            "reconnecting_server_list": list(self.reconnecting_server_list)
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class ConnectionDiagnosis:
+    """MCP连接诊断结果（不可变，可在缓存中共享）"""
+    timestamp: float
+    overall_health: str
+    issues: Tuple[str, ...]
+    recommendations: Tuple[str, ...]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式（每次返回新的字典和列表）"""
+        return {
+            "timestamp": self.timestamp,
+            "overall_health": self.overall_health,
+            "issues": list(self.issues),
+            "recommendations": list(self.recommendations)
+        }
@@ -2,6 +2,7 @@
 
 包含系统的核心组件：
 - Orchestrator: 任务调度器
+- TaskStore: 已结束任务的外部存储（Redis / 本地文件）
 - ActionGraph: 执行图引擎
 - PolicyEngine: 策略引擎
 - RiskEngine: 风险评估引擎
@@ -14,7 +14,7 @@ import time
 import uuid
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from datetime import datetime
 
 
@@ -49,7 +49,7 @@ class ExecutionMode(Enum):
     REPLAY = "replay"  # 回放模式
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionNode:
     """Action Graph节点"""
     id: str
@@ -70,7 +70,7 @@ class ActionNode:
     result: Optional[Any] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionEdge:
     """Action Graph边"""
     from_node: str
@@ -94,7 +94,8 @@ class ActionGraph:
     status: NodeStatus = NodeStatus.PENDING
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
-    execution_log: List[Dict[str, Any]] = field(default_factory=list)
+    # 执行日志，每条为 (timestamp, message)，timestamp 为 time.time() 时间戳
+    execution_log: List[Tuple[float, str]] = field(default_factory=list)
 
 
 @dataclass
@@ -108,7 +109,7 @@ class ExecutionResult:
     error_message: Optional[str] = None
     screenshots: List[str] = field(default_factory=list)
     extracted_data: Dict[str, Any] = field(default_factory=dict)
-    execution_log: List[Dict[str, Any]] = field(default_factory=list)
+    execution_log: List[Tuple[float, str]] = field(default_factory=list)
 
 
 class ActionGraphEngine:
@@ -165,7 +166,7 @@ class ActionGraphEngine:
             
             # 创建图
             graph = ActionGraph(
-                id=graph_data.get('id', str(uuid.uuid4())),
+                id=graph_data.get('id') or uuid.uuid4().hex,
                 goal=graph_data['goal'],
                 nodes=nodes,
                 edges=edges,
@@ -226,7 +227,7 @@ class ActionGraphEngine:
         graph.start_time = datetime.now()
         self.running_graphs[graph.id] = graph
         
-        start_time = time.time()
+        start_time = time.monotonic()
         completed_nodes = 0
         screenshots = []
         extracted_data = {}
@@ -267,7 +268,7 @@ class ActionGraphEngine:
             self._log_execution(graph, f"Execution failed: {error_message}")
         
         # 完成执行
-        execution_time = time.time() - start_time
+        execution_time = time.monotonic() - start_time
         graph.status = NodeStatus.COMPLETED if success else NodeStatus.FAILED
         graph.end_time = datetime.now()
         
@@ -358,12 +359,8 @@ class ActionGraphEngine:
             return False
     
     def _log_execution(self, graph: ActionGraph, message: str):
-        """记录执行日志"""
-        log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'message': message
-        }
-        graph.execution_log.append(log_entry)
+        """记录执行日志，时间戳在读取时再格式化"""
+        graph.execution_log.append((time.time(), message))
     
     # 节点执行器实现（占位符）
     async def _execute_navigate(self, node: ActionNode, page_context) -> Any:
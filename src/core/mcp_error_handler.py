@@ -52,7 +52,7 @@ import time
 from typing import Dict, List, Optional, Any, Callable, Awaitable
 from dataclasses import dataclass, field
 from enum import Enum
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
 import random
 import json
 
@@ -67,6 +67,10 @@ class ConnectionState(Enum):
     CIRCUIT_OPEN = "circuit_open"
 
 
+class CircuitOpenError(RuntimeError):
+    """断路器打开，操作被直接拒绝而未执行"""
+
+
 class ErrorType(Enum):
     """错误类型枚举"""
     CONNECTION_TIMEOUT = "connection_timeout"
@@ -86,6 +90,10 @@ class ErrorMetrics:
     error_types: Dict[ErrorType, int] = field(default_factory=lambda: defaultdict(int))
     consecutive_failures: int = 0
     success_count: int = 0
+    # 最近操作结果的滑动窗口：(单调时钟时间戳, 是否失败)
+    recent_results: deque = field(default_factory=lambda: deque(maxlen=100))
+    # 窗口内的失败次数，随窗口增减同步维护
+    recent_failures: int = 0
     
     def record_error(self, error_type: ErrorType) -> None:
         """记录错误"""
@@ -93,11 +101,22 @@ class ErrorMetrics:
         self.error_types[error_type] += 1
         self.consecutive_failures += 1
         self.last_error_time = time.time()
+        self._record_recent(True)
         
     def record_success(self) -> None:
         """记录成功"""
         self.success_count += 1
         self.consecutive_failures = 0
+        self._record_recent(False)
+        
+    def _record_recent(self, failed: bool) -> None:
+        """把操作结果写入滑动窗口，窗口已满时扣除被挤出的记录"""
+        recent = self.recent_results
+        if len(recent) == recent.maxlen and recent[0][1]:
+            self.recent_failures -= 1
+        recent.append((time.monotonic(), failed))
+        if failed:
+            self.recent_failures += 1
         
     def calculate_error_rate(self, window_seconds: int = 300) -> float:
         """计算错误率"""
@@ -105,6 +124,18 @@ class ErrorMetrics:
         if total_operations == 0:
             return 0.0
         return self.total_errors / total_operations
+        
+    def recent_error_rate(self, window_seconds: int = 300) -> float:
+        """计算最近 `window_seconds` 秒内（最多最近100次操作）的错误率"""
+        recent = self.recent_results
+        cutoff = time.monotonic() - window_seconds
+        # 丢弃窗口外的旧记录，窗口按时间递增，只需从左侧弹出
+        while recent and recent[0][0] < cutoff:
+            if recent.popleft()[1]:
+                self.recent_failures -= 1
+        if not recent:
+            return 0.0
+        return self.recent_failures / len(recent)
 
 
 @dataclass
@@ -134,7 +165,7 @@ class CircuitBreaker:
         config: Circuit breaker configuration
         state: Current circuit state
         failure_count: Number of consecutive failures
-        last_failure_time: Timestamp of last failure
+        last_failure_time: Monotonic-clock timestamp of last failure
         half_open_calls: Number of calls made in half-open state
     
     Example:
@@ -179,40 +210,40 @@ class CircuitBreaker:
             - CIRCUIT_OPEN: Allows execution only after recovery timeout
             - RECONNECTING (half-open): Allows limited executions for testing
         """
-        if self.state == ConnectionState.CONNECTED:
+        if self.state is ConnectionState.CONNECTED:
             return True
-        elif self.state == ConnectionState.CIRCUIT_OPEN:
+        elif self.state is ConnectionState.CIRCUIT_OPEN:
             # 检查是否可以进入半开状态
-            if time.time() - self.last_failure_time > self.config.recovery_timeout:
+            if time.monotonic() - self.last_failure_time > self.config.recovery_timeout:
                 self.state = ConnectionState.RECONNECTING  # 半开状态
                 self.half_open_calls = 0
                 self.logger.info("Circuit breaker entering half-open state")
                 return True
             return False
-        elif self.state == ConnectionState.RECONNECTING:
+        elif self.state is ConnectionState.RECONNECTING:
             return self.half_open_calls < self.config.half_open_max_calls
         return False
         
     def record_success(self) -> None:
         """记录成功操作"""
-        if self.state == ConnectionState.RECONNECTING:
+        if self.state is ConnectionState.RECONNECTING:
             self.half_open_calls += 1
             if self.half_open_calls >= self.config.half_open_max_calls:
                 self.state = ConnectionState.CONNECTED
                 self.failure_count = 0
                 self.logger.info("Circuit breaker closed - connection recovered")
-        elif self.state == ConnectionState.CONNECTED:
+        elif self.state is ConnectionState.CONNECTED:
             self.failure_count = 0
             
     def record_failure(self) -> None:
         """记录失败操作"""
         self.failure_count += 1
-        self.last_failure_time = time.time()
+        self.last_failure_time = time.monotonic()
         
         if self.failure_count >= self.config.failure_threshold:
             self.state = ConnectionState.CIRCUIT_OPEN
-            self.logger.warning(f"Circuit breaker opened after {self.failure_count} failures")
-        elif self.state == ConnectionState.RECONNECTING:
+            self.logger.warning("Circuit breaker opened after %s failures", self.failure_count)
+        elif self.state is ConnectionState.RECONNECTING:
             self.state = ConnectionState.CIRCUIT_OPEN
             self.logger.warning("Circuit breaker opened during half-open state")
 
@@ -367,7 +398,7 @@ class ConnectionPool:
         self.active_connections[name] = connection
         self.connection_metrics[name] = ErrorMetrics()
         self.circuit_breakers[name] = CircuitBreaker(CircuitBreakerConfig())
-        self.logger.info(f"Added connection to pool: {name}")
+        self.logger.info("Added connection to pool: %s", name)
         
     def remove_connection(self, name: str) -> None:
         """从池中移除连接"""
@@ -375,7 +406,7 @@ class ConnectionPool:
             del self.active_connections[name]
             del self.connection_metrics[name]
             del self.circuit_breakers[name]
-            self.logger.info(f"Removed connection from pool: {name}")
+            self.logger.info("Removed connection from pool: %s", name)
             
     def get_connection(self, name: str) -> Optional[Any]:
         """获取连接"""
@@ -419,6 +450,7 @@ class ConnectionPool:
                 "success_count": metrics.success_count,
                 "consecutive_failures": metrics.consecutive_failures,
                 "error_rate": metrics.calculate_error_rate(),
+                "recent_error_rate": metrics.recent_error_rate(),
                 "last_error_time": metrics.last_error_time,
                 "error_types": {et.value: count for et, count in metrics.error_types.items()}
             }
@@ -510,6 +542,10 @@ class MCPErrorHandler:
             Authentication errors are typically not retried as they indicate
             configuration issues rather than transient failures.
         """
+        # asyncio.wait_for 超时抛出的 TimeoutError 通常没有消息文本
+        if isinstance(error, TimeoutError):
+            return ErrorType.CONNECTION_TIMEOUT
+            
         error_str = str(error).lower()
         
         if "timeout" in error_str or "timed out" in error_str:
@@ -546,7 +582,8 @@ class MCPErrorHandler:
             Any: Result of successful operation (primary or fallback)
             
         Raises:
-            RuntimeError: If connection is unavailable and no fallback provided
+            CircuitOpenError: If the circuit breaker is open and no fallback provided
+            RuntimeError: If connection is not registered and no fallback provided
             Exception: Original exception if both primary and fallback operations fail
             
         Execution Flow:
@@ -566,8 +603,10 @@ class MCPErrorHandler:
         
         if not circuit_breaker or not circuit_breaker.can_execute():
             if fallback:
-                self.logger.warning(f"Connection {connection_name} unavailable, using fallback")
+                self.logger.warning("Connection %s unavailable, using fallback", connection_name)
                 return await fallback()
+            elif circuit_breaker:
+                raise CircuitOpenError(f"Circuit breaker open for connection {connection_name}")
             else:
                 raise RuntimeError(f"Connection {connection_name} is not available")
                 
@@ -587,15 +626,15 @@ class MCPErrorHandler:
             # 记录失败
             self.connection_pool.record_operation_result(connection_name, False, error_type)
             
-            self.logger.error(f"Operation failed on {connection_name}: {e} (type: {error_type.value})")
+            self.logger.error("Operation failed on %s: %s (type: %s)", connection_name, e, error_type.value)
             
             # 尝试降级处理
             if fallback:
-                self.logger.info(f"Attempting fallback for {connection_name}")
+                self.logger.info("Attempting fallback for %s", connection_name)
                 try:
                     return await fallback()
                 except Exception as fallback_error:
-                    self.logger.error(f"Fallback also failed: {fallback_error}")
+                    self.logger.error("Fallback also failed: %s", fallback_error)
                     
             raise e
             
@@ -612,6 +651,7 @@ class MCPErrorHandler:
                 - connections: Per-connection detailed statistics
                 - overall_error_rate: System-wide error rate calculation
                 - most_common_errors: Aggregated error type frequencies
+                - top_error: Most frequent (error_type, count) pair, or None
                 
         Summary Structure:
             ```python
@@ -631,7 +671,8 @@ class MCPErrorHandler:
                 "most_common_errors": {
                     "network_error": 5,
                     "timeout_error": 3
-                }
+                },
+                "top_error": ("network_error", 5)
             }
             ```
             
@@ -649,7 +690,8 @@ class MCPErrorHandler:
             "healthy_connections": len(self.connection_pool.get_healthy_connections()),
             "connections": stats,
             "overall_error_rate": 0.0,
-            "most_common_errors": defaultdict(int)
+            "most_common_errors": Counter(),
+            "top_error": None
         }
         
         # 计算整体错误率和最常见错误
@@ -666,7 +708,10 @@ class MCPErrorHandler:
         if total_operations > 0:
             summary["overall_error_rate"] = total_errors / total_operations
             
-        # 转换为普通字典
-        summary["most_common_errors"] = dict(summary["most_common_errors"])
+        # 记录最常见错误，并转换为普通字典
+        error_counter = summary["most_common_errors"]
+        if error_counter:
+            summary["top_error"] = error_counter.most_common(1)[0]
+        summary["most_common_errors"] = dict(error_counter)
         
         return summary
\ No newline at end of file
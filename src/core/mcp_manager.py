@@ -44,8 +44,10 @@
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass
+import time
+from collections import Counter, defaultdict, deque
+from typing import Dict, List, Optional, Any, Union, Set, Tuple, Iterable
+from dataclasses import dataclass, field
 from enum import Enum
 
 from agno.agent import Agent
@@ -66,16 +68,53 @@ class MultiMCPTools:
 # TODO: Replace with actual MCP imports when available
 # from agno.tools.mcp import MCPTools, StdioServerParameters, MultiMCPTools
 from ..config.mcp_config import MCPConfig
-from ..config.mcp_types import MCPServerConfig, MCPServerType
+from ..config.mcp_types import (
+    MCPServerConfig,
+    MCPServerType,
+    HealthMetrics,
+    ConnectionDiagnosis
+)
 from .mcp_error_handler import (
     MCPErrorHandler,
     ConnectionPool,
+    CircuitOpenError,
     ErrorType,
     ConnectionState,
     CircuitBreakerConfig,
     RetryConfig
 )
 
+logger = logging.getLogger(__name__)
+
+# 健康检查结果滑动窗口大小（每个服务器保留最近的探测结果数）
+_HEALTH_WINDOW_SIZE = 20
+# 窗口内失败次数达到该值时标记服务器为失败状态
+_HEALTH_WINDOW_FAILURE_LIMIT = 3
+
+# 整体健康状态的严重程度，诊断结果取最严重的一项
+_HEALTH_SEVERITY = {"healthy": 0, "recovering": 1, "degraded": 2, "unhealthy": 3}
+
+# write_metrics 输出格式对应的 HTTP Content-Type
+METRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _metric_label(value: str) -> str:
+    """按 OpenMetrics 规则转义标签值"""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+@dataclass(slots=True)
+class ServerRuntimeState:
+    """单个服务器的健康检查运行时数据（最近一次延迟和滑动窗口结果）"""
+    last_latency: float = 0.0
+    # 最近的健康检查结果（True 为成功），长度有上限
+    health_outcomes: deque = field(default_factory=lambda: deque(maxlen=_HEALTH_WINDOW_SIZE))
+    
+    def health_error_rate(self) -> float:
+        """滑动窗口内的健康检查失败率，尚无探测结果时为 0"""
+        outcomes = self.health_outcomes
+        return outcomes.count(False) / len(outcomes) if outcomes else 0.0
+
 
 class MCPManager:
     """MCP 连接管理器
@@ -109,38 +148,150 @@ class MCPManager:
         - 需要调用initialize()才能开始使用
         - 所有异步操作都在initialize()中进行
         """
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self._config = config or MCPConfig()
+        
+        # 健康指标 / 诊断结果缓存：(生成时间, 结果)，状态变更时失效
+        self._cached_health: Optional[Tuple[float, HealthMetrics]] = None
+        self._cached_diagnosis: Optional[Tuple[float, ConnectionDiagnosis]] = None
+        
+        # stdio 连接参数缓存：服务器名 -> (配置指纹, 参数)
+        self._server_params_cache: Dict[str, Tuple[Tuple[Any, ...], StdioServerParameters]] = {}
+        
+        # 工具列表缓存：工具集 -> (获取时间, 工具列表)；进行中的获取任务用于合并并发请求
+        self._tools_cache: Dict[Any, Tuple[float, List[Any]]] = {}
+        self._tools_inflight: Dict[Any, asyncio.Task] = {}
+        
+        # 全局设置快照，避免在健康检查等热路径中反复查询配置
+        self._load_settings()
+        
         self._servers: Dict[str, MCPServerConfig] = {}
+        # 已启用服务器名称，随 add/remove/enable/disable 增量维护
+        self._enabled_names: Set[str] = set()
+        # 单独连接的服务器会话（启用/重连单个服务器时使用，不影响其他连接）
         self._connections: Dict[str, MCPTools] = {}
+        self._connection_states: Dict[str, ConnectionState] = {}
+        # 各连接状态下的服务器数量，由 _set_state 增量维护
+        self._state_counts: Counter = Counter()
+        self._health_check_failures: Dict[str, int] = {}
+        # 每个服务器的健康检查运行时数据（延迟、滑动窗口结果）
+        self._runtime: Dict[str, ServerRuntimeState] = {}
+        
         self._multi_mcp: Optional[MultiMCPTools] = None
+        # 通过 MultiMCPTools 批量连接的服务器名称
+        self._multi_mcp_members: Set[str] = set()
         self._agent: Optional[Agent] = None
         self._is_initialized = False
         self._health_check_task: Optional[asyncio.Task] = None
+        # 持有后台任务的强引用，防止任务在完成前被垃圾回收
+        self._background_tasks: Set[asyncio.Task] = set()
+        # 串行化 initialize / shutdown，避免并发调用重复建立或关闭连接
+        self._lifecycle_lock = asyncio.Lock()
         
         # 错误处理和连接管理
         self._connection_pool = ConnectionPool(max_connections=20)
         self._error_handler = MCPErrorHandler(self._connection_pool)
-        self._connection_states: Dict[str, ConnectionState] = {}
         self._last_health_check = 0
-        self._health_check_failures: Dict[str, int] = {}
+        # 最后一次健康检查的墙钟时间（Unix 时间戳），供 write_metrics 导出
+        self._last_health_check_wall = 0.0
+        
+    def _load_settings(self) -> None:
+        """从配置读取全局设置并缓存为实例属性"""
+        get = self._config.get_global_setting
+        
+        self._health_metrics_ttl: float = get("health_metrics_ttl", 2.0)
+        self._diagnosis_ttl: float = get("diagnosis_ttl", 10.0)
+        self._tools_cache_ttl: float = get("tools_cache_ttl", 5.0)
+        
+        # 单次操作超时（秒），防止挂起的 MCP 子进程阻塞调用方和健康检查循环
+        self._rpc_timeout: float = get("rpc_timeout", 10)
+        self._health_check_timeout: float = get("health_check_timeout", 5)
+        self._command_timeout: float = get("command_timeout", 120)
+        
+        # 健康检查与重连策略
+        self._health_check_interval: int = get("health_check_interval", 60)
+        self._health_check_concurrency: int = get("health_check_concurrency", 8)
+        self._auto_reconnect: bool = get("auto_reconnect", True)
+        self._max_reconnect_attempts: int = get("max_reconnect_attempts", 5)
+        # 单个服务器重连的次数上限独立配置，不与整体重连共用 max_reconnect_attempts
+        self._max_single_reconnect_attempts: int = get("max_single_reconnect_attempts", 3)
+        self._reconnect_delay: float = get("reconnect_delay", 2)
+        
+    def reload_config(self) -> None:
+        """重新读取全局设置
+        
+        在运行时修改全局设置后调用。已启动的健康检查循环保持原有间隔，
+        新间隔在下次启动健康检查时生效。
+        """
+        self._load_settings()
+        self._invalidate_health_cache()
+        
+    def _set_state(self, name: str, state: ConnectionState) -> None:
+        """更新服务器连接状态并使健康缓存失效
+        
+        所有连接状态的写入都应经过此方法，以便同步维护派生的计数和缓存。
+        """
+        old = self._connection_states.get(name)
+        if old is not None:
+            self._state_counts[old] -= 1
+        self._state_counts[state] += 1
+        self._connection_states[name] = state
+        self._invalidate_health_cache()
+        
+    def _enabled_servers(self) -> Dict[str, MCPServerConfig]:
+        """获取所有启用的服务器配置"""
+        servers = self._servers
+        return {name: servers[name] for name in self._enabled_names}
+        
+    def _track_enabled(self, name: str, enabled: bool) -> None:
+        """同步已启用服务器集合并使健康缓存失效"""
+        if enabled:
+            self._enabled_names.add(name)
+        else:
+            self._enabled_names.discard(name)
+        self._invalidate_health_cache()
+        
+    def _invalidate_health_cache(self) -> None:
+        """使健康指标和诊断缓存失效"""
+        self._cached_health = None
+        self._cached_diagnosis = None
         
     def add_server(self, config: MCPServerConfig) -> None:
         """添加 MCP 服务器配置"""
         self._servers[config.name] = config
-        self.logger.info(f"Added MCP server config: {config.name} ({config.server_type.value})")
+        self._track_enabled(config.name, config.enabled)
+        self.logger.info("Added MCP server config: %s (%s)", config.name, config.server_type.value)
         
     def remove_server(self, name: str) -> bool:
         """移除 MCP 服务器配置"""
         if name in self._servers:
             del self._servers[name]
+            self._server_params_cache.pop(name, None)
+            self._track_enabled(name, False)
             if name in self._connections:
                 # 断开连接
-                asyncio.create_task(self._disconnect_server(name))
-            self.logger.info(f"Removed MCP server: {name}")
+                self._spawn_background(self._disconnect_server(name))
+            self.logger.info("Removed MCP server: %s", name)
             return True
         return False
         
+    def _spawn_background(self, coro) -> asyncio.Task:
+        """创建受跟踪的后台任务，任务完成后自动移除引用"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_done)
+        return task
+        
+    def _on_background_done(self, task: asyncio.Task) -> None:
+        """移除已完成的后台任务，并取出其异常
+        
+        无人等待的后台任务失败时，asyncio 会在任务被回收时报告
+        "Task exception was never retrieved"；这里统一取出并记录。
+        """
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.debug("Background task %s failed: %s", task.get_name(), task.exception())
+        
     async def initialize(self) -> bool:
         """初始化 MCP 管理器并建立所有连接
         
@@ -170,67 +321,104 @@ class MCPManager:
             
         注意：
         - 这个方法必须在使用任何其他功能之前调用
-        - 重复调用是安全的，会先清理现有连接
+        - 重复调用是安全的：已初始化时直接返回True，并发调用只会执行一次初始化
         - 初始化过程可能需要几秒钟时间
         """
-        try:
-            # 从配置加载服务器
-            self._load_servers_from_config()
-            
-            # 建立连接
-            await self._connect_all_servers()
-            
-            # 创建 Agno Agent
-            await self._create_agent()
-            
-            # 启动健康检查
-            await self._start_health_check()
-            
-            self._is_initialized = True
-            self.logger.info("MCP Manager initialized successfully")
+        if self._is_initialized:
             return True
             
-        except Exception as e:
-            self.logger.error(f"Failed to initialize MCP Manager: {e}")
-            return False
+        async with self._lifecycle_lock:
+            # 等待锁期间可能已由其他调用方完成初始化
+            if self._is_initialized:
+                return True
+                
+            try:
+                # 从配置加载服务器
+                self._load_servers_from_config()
+                
+                # 建立连接
+                await self._connect_all_servers()
+                
+                # 创建 Agno Agent
+                await self._create_agent()
+                
+                # 启动健康检查
+                await self._start_health_check()
+                
+                self._is_initialized = True
+                self.logger.info("MCP Manager initialized successfully")
+                return True
+                
+            except Exception as e:
+                self.logger.error("Failed to initialize MCP Manager: %s", e)
+                return False
             
     def _load_servers_from_config(self) -> None:
         """从配置文件加载服务器配置"""
         server_configs = self._config.get_server_configs()
         for config in server_configs:
             self._servers[config.name] = config
-            self.logger.info(f"Loaded server config: {config.name} ({config.server_type.value})")
+            self._track_enabled(config.name, config.enabled)
+            self.logger.info("Loaded server config: %s (%s)", config.name, config.server_type.value)
             
-    def _setup_default_servers(self) -> None:
-        """设置默认的 MCP 服务器配置（已弃用，使用配置文件）"""
-        # 此方法已被 _load_servers_from_config 替代
-        pass
-        pass
+    def _build_server_params(self, config: MCPServerConfig) -> StdioServerParameters:
+        """根据服务器配置创建 stdio 连接参数
+        
+        参数按服务器缓存，只有命令、参数或环境变量发生变化时才重新创建，
+        重连风暴期间不必为每个服务器反复构建。
+        """
+        command = config.command
+        key = (
+            tuple(command) if isinstance(command, list) else command,
+            tuple(config.args),
+            tuple(sorted(config.env.items())) if config.env else ()
+        )
+        cached = self._server_params_cache.get(config.name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+            
+        params = StdioServerParameters(
+            command=config.command,
+            args=config.args,
+            env=config.env or {}
+        )
+        self._server_params_cache[config.name] = (key, params)
+        return params
         
     async def _connect_all_servers(self) -> None:
-        """连接所有启用的 MCP 服务器"""
-        enabled_servers = {name: config for name, config in self._servers.items() if config.enabled}
+        """连接所有启用的 MCP 服务器
+        
+        重建 MultiMCPTools 批量连接。已有的批量连接和单独连接的会话
+        会先被关闭，由新的批量连接统一接管。
+        """
+        await self._teardown_connections()
+        
+        enabled_servers = self._enabled_servers()
         
         if not enabled_servers:
             self.logger.warning("No enabled MCP servers found")
             return
             
+        await self._connect_bundle(enabled_servers)
+        
+    async def _connect_bundle(self, enabled_servers: Dict[str, MCPServerConfig]) -> None:
+        """为给定服务器建立 MultiMCPTools 批量连接（调用方负责先关闭旧的批量连接）"""
         # 创建服务器参数
-        server_params = {}
-        for name, config in enabled_servers.items():
-            server_params[name] = StdioServerParameters(
-                command=config.command,
-                args=config.args,
-                env=config.env or {}
-            )
-            self._connection_states[name] = ConnectionState.CONNECTING
+        server_params = {
+            name: self._build_server_params(config)
+            for name, config in enabled_servers.items()
+        }
+        for name in enabled_servers:
+            self._set_state(name, ConnectionState.CONNECTING)
             
         # 创建 MultiMCPTools 实例
         self._multi_mcp = MultiMCPTools(server_params)
+        self._multi_mcp_members = set(enabled_servers)
+        connect_timeout = max(config.timeout for config in enabled_servers.values())
         
         # 连接服务器（使用错误处理）
         async def connect_operation():
-            await self._multi_mcp.connect()
+            await asyncio.wait_for(self._multi_mcp.connect(), connect_timeout)
             return self._multi_mcp
             
         try:
@@ -241,45 +429,150 @@ class MCPManager:
             
             # 更新连接状态和连接池
             for name in enabled_servers:
-                self._connection_states[name] = ConnectionState.CONNECTED
-                self._connection_pool.add_connection(name, self._multi_mcp)
                 self._health_check_failures[name] = 0
+                self._set_state(name, ConnectionState.CONNECTED)
+                self._connection_pool.add_connection(name, self._multi_mcp)
                 
-            self.logger.info(f"Connected to {len(enabled_servers)} MCP servers")
+            self.logger.info("Connected to %s MCP servers", len(enabled_servers))
             
         except Exception as e:
             # 更新失败状态
             for name in enabled_servers:
-                self._connection_states[name] = ConnectionState.FAILED
                 self._health_check_failures[name] = self._health_check_failures.get(name, 0) + 1
+                self._set_state(name, ConnectionState.FAILED)
                 
-            self.logger.error(f"Failed to connect MCP servers: {e}")
+            self.logger.error("Failed to connect MCP servers: %s", e)
             raise
             
+    async def _teardown_connections(self) -> None:
+        """并发关闭现有的批量连接和所有单独连接的会话"""
+        async with asyncio.TaskGroup() as tg:
+            for name in list(self._connections):
+                tg.create_task(self._disconnect_server(name))
+            if self._multi_mcp:
+                tg.create_task(self._disconnect_multi_mcp(self._multi_mcp))
+                
+        self._multi_mcp = None
+        self._multi_mcp_members = set()
+        self._tools_cache.clear()
+        
+    async def _rebuild_bundle_without(self, name: str) -> None:
+        """从批量连接中移除一个服务器
+        
+        MultiMCPTools 不支持移除单个成员，只能用剩余成员重建批量连接；
+        单独连接的会话不受影响，无需像 `_connect_all_servers` 那样全部重连。
+        """
+        remaining = {
+            member: self._servers[member]
+            for member in self._multi_mcp_members
+            if member != name and member in self._enabled_names
+        }
+        if self._multi_mcp:
+            self._tools_cache.pop(self._multi_mcp, None)
+            await self._disconnect_multi_mcp(self._multi_mcp)
+        self._multi_mcp = None
+        self._multi_mcp_members = set()
+        
+        if remaining:
+            await self._connect_bundle(remaining)
+            
+    async def _disconnect_multi_mcp(self, multi_mcp: MultiMCPTools) -> None:
+        """断开 MultiMCPTools 批量连接，错误只记录不抛出"""
+        try:
+            await multi_mcp.disconnect()
+        except Exception as e:
+            self.logger.error("Error disconnecting MultiMCPTools: %s", e)
+        
+    async def _connect_server(self, name: str) -> None:
+        """单独连接指定服务器
+        
+        为该服务器建立独立的 MCPTools 会话，其他已建立的连接保持不变。
+        
+        Args:
+            name: 服务器名称
+            
+        Raises:
+            Exception: 重试耗尽后连接仍失败时抛出
+        """
+        config = self._servers[name]
+        self._set_state(name, ConnectionState.CONNECTING)
+        tools = MCPTools(server_params=self._build_server_params(config))
+        
+        async def connect_operation():
+            await asyncio.wait_for(tools.connect(), config.timeout)
+            return tools
+            
+        try:
+            await self._error_handler.retry_handler.execute_with_retry(
+                connect_operation,
+                error_classifier=self._error_handler.classify_error
+            )
+        except Exception as e:
+            self._set_state(name, ConnectionState.FAILED)
+            self._health_check_failures[name] = self._health_check_failures.get(name, 0) + 1
+            self.logger.error("Failed to connect MCP server %s: %s", name, e)
+            raise
+            
+        self._connections[name] = tools
+        self._connection_pool.add_connection(name, tools)
+        self._health_check_failures[name] = 0
+        self._set_state(name, ConnectionState.CONNECTED)
+        self.logger.info("Connected to MCP server: %s", name)
+        
+    def _is_server_connected(self, name: str) -> bool:
+        """检查服务器是否已有可用连接（单独会话或批量连接）"""
+        if name in self._connections:
+            return True
+        return (name in self._multi_mcp_members
+                and self._connection_states.get(name) is ConnectionState.CONNECTED)
+        
+    def _agent_toolkits(self) -> List[Any]:
+        """获取 Agent 应持有的全部工具集"""
+        toolkits: List[Any] = [self._multi_mcp] if self._multi_mcp else []
+        toolkits.extend(self._connections.values())
+        return toolkits
+        
     async def _create_agent(self) -> None:
         """创建 Agno Agent 实例"""
-        if not self._multi_mcp:
+        if not self._multi_mcp and not self._connections:
             raise RuntimeError("MCP tools not initialized")
             
         self._agent = Agent(
             name="AuraAgent",
-            tools=[self._multi_mcp],
+            tools=self._agent_toolkits(),
             show_tool_calls=True,
             markdown=True
         )
         
         self.logger.info("Agno Agent created successfully")
         
+    async def _sync_agent_tools(self) -> None:
+        """同步 Agent 的工具集
+        
+        Agent 已存在时仅替换其工具列表，避免重建 Agent；否则创建新 Agent。
+        工具集对象与 Agent 当前持有的完全相同时不做任何修改。
+        """
+        if self._agent is None:
+            await self._create_agent()
+            return
+            
+        toolkits = self._agent_toolkits()
+        current = self._agent.tools or []
+        if len(current) == len(toolkits) and all(a is b for a, b in zip(current, toolkits)):
+            return
+        self._agent.tools = toolkits
+        
     async def _disconnect_server(self, name: str) -> None:
         """断开指定服务器连接"""
         if name in self._connections:
             try:
                 connection = self._connections[name]
+                self._tools_cache.pop(connection, None)
                 await connection.disconnect()
                 del self._connections[name]
-                self.logger.info(f"Disconnected from MCP server: {name}")
+                self.logger.info("Disconnected from MCP server: %s", name)
             except Exception as e:
-                self.logger.error(f"Error disconnecting from {name}: {e}")
+                self.logger.error("Error disconnecting from %s: %s", name, e)
                 
     async def execute_command(self, command: str, context: Optional[Dict[str, Any]] = None) -> str:
         """执行命令通过 MCP Agent
@@ -324,15 +617,20 @@ class MCPManager:
         if not self._is_initialized or not self._agent:
             raise RuntimeError("MCP Manager not initialized")
             
-        # 构建完整的提示
-        prompt = command
+        # 构建完整的提示（上下文为空时直接使用命令）
         if context:
-            context_str = "\n".join([f"{k}: {v}" for k, v in context.items()])
-            prompt = f"Context:\n{context_str}\n\nTask: {command}"
+            # 一次 join 拼出完整提示，避免先拼上下文再整体复制一遍
+            lines = ["Context:"]
+            lines.extend(f"{k}: {v}" for k, v in context.items())
+            lines.append("")
+            lines.append(f"Task: {command}")
+            prompt = "\n".join(lines)
+        else:
+            prompt = command
             
         # 使用错误处理执行命令
         async def execute_operation():
-            response = await self._agent.arun(prompt)
+            response = await asyncio.wait_for(self._agent.arun(prompt), self._command_timeout)
             return response.content
             
         # 简单的降级处理
@@ -347,9 +645,25 @@ class MCPManager:
                 fallback=fallback_operation
             )
         except Exception as e:
-            self.logger.error(f"Error executing command '{command}': {e}")
+            self.logger.error("Error executing command '%s': %s", command, e)
             raise
             
+    async def execute_commands(self, commands: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> List[str]:
+        """并发执行多条相互独立的命令
+        
+        每条命令仍是一次独立的 Agent 执行（各自的重试、熔断和降级处理），
+        但同时提交，总耗时取决于最慢的一条而不是各条耗时之和。
+        
+        Args:
+            commands: (command, context) 序列
+            
+        Returns:
+            List[str]: 按输入顺序排列的执行结果
+        """
+        return list(await asyncio.gather(
+            *(self.execute_command(command, context) for command, context in commands)
+        ))
+            
     async def get_available_tools(self) -> List[str]:
         """获取所有可用的MCP工具列表
         
@@ -367,16 +681,52 @@ class MCPManager:
             for tool in tools:
                 print(f"可用工具: {tool}")
         """
-        if not self._multi_mcp:
+        if not self._multi_mcp and not self._connections:
             return []
             
         try:
-            tools = await self._multi_mcp.list_tools()
+            tools = await self._list_all_tools()
             return [tool.name for tool in tools]
         except Exception as e:
-            self.logger.error(f"Error getting available tools: {e}")
+            self.logger.error("Error getting available tools: %s", e)
             return []
             
+    async def _list_all_tools(self) -> List[Any]:
+        """汇总批量连接和所有单独会话提供的工具"""
+        tools: List[Any] = []
+        for toolkit in self._agent_toolkits():
+            tools.extend(await self._list_tools(toolkit))
+        return tools
+        
+    async def _list_tools(self, toolkit: Any, timeout: Optional[float] = None) -> List[Any]:
+        """获取单个工具集的工具列表
+        
+        结果在 `tools_cache_ttl` 秒内（默认5秒）复用；缓存过期时并发调用方
+        共享同一次 list_tools() 请求，不会重复发起 RPC。获取本身受
+        rpc_timeout 限制，`timeout` 只限制当前调用方的等待时间，
+        超时抛出 TimeoutError。
+        """
+        cached = self._tools_cache.get(toolkit)
+        if cached is not None and time.monotonic() - cached[0] < self._tools_cache_ttl:
+            return cached[1]
+            
+        fetch = self._tools_inflight.get(toolkit)
+        if fetch is None:
+            fetch = self._tools_inflight[toolkit] = self._spawn_background(
+                self._fetch_tools(toolkit)
+            )
+        # shield：某个调用方超时或被取消时不影响其他等待同一请求的调用方
+        return await asyncio.wait_for(asyncio.shield(fetch), timeout or self._rpc_timeout)
+        
+    async def _fetch_tools(self, toolkit: Any) -> List[Any]:
+        """发起 list_tools() 请求并写入缓存"""
+        try:
+            tools = await asyncio.wait_for(toolkit.list_tools(), self._rpc_timeout)
+            self._tools_cache[toolkit] = (time.monotonic(), tools)
+            return tools
+        finally:
+            self._tools_inflight.pop(toolkit, None)
+        
     async def get_server_status(self) -> Dict[str, Dict[str, Any]]:
         """获取所有MCP服务器的详细状态信息
         
@@ -446,6 +796,8 @@ class MCPManager:
         - 重连过程中该服务器的工具将暂时不可用
         - 如果重连失败，服务器状态会被标记为失败
         - 重连成功后会自动恢复健康检查
+        - 拥有独立会话的服务器只重建自身会话；其他服务器受 MultiMCPTools
+          限制需要重建整个批量连接
         
         使用示例:
             success = await manager.reconnect_server("playwright")
@@ -455,24 +807,21 @@ class MCPManager:
                 print("Playwright服务器重连失败")
         """
         if name not in self._servers:
-            self.logger.error(f"Server {name} not found in configuration")
+            self.logger.error("Server %s not found in configuration", name)
             return False
             
         config = self._servers[name]
+        if not config.enabled:
+            self.logger.warning("Server %s is disabled, skipping reconnect", name)
+            return False
         
         try:
-            # 先断开现有连接
-            if name in self._connections:
-                await self._disconnect_server(name)
-                
-            # 重新连接
-            await self._connect_all_servers()
-            
-            self.logger.info(f"Successfully reconnected to server: {name}")
+            await self._reconnect_one(name)
+            self.logger.info("Successfully reconnected to server: %s", name)
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to reconnect to server {name}: {e}")
+            self.logger.error("Failed to reconnect to server %s: %s", name, e)
             return False
             
     async def _start_health_check(self) -> None:
@@ -498,10 +847,10 @@ class MCPManager:
         - 会在shutdown()时自动停止
         - 检查过程中的错误会被记录但不会中断任务
         """
-        health_check_interval = self._config.get_global_setting("health_check_interval", 60)
+        health_check_interval = self._health_check_interval
         if health_check_interval > 0:
             self._health_check_task = asyncio.create_task(self._health_check_loop(health_check_interval))
-            self.logger.info(f"Started health check with {health_check_interval}s interval")
+            self.logger.info("Started health check with %ss interval", health_check_interval)
             
     async def _health_check_loop(self, interval: int) -> None:
         """健康检查循环"""
@@ -512,7 +861,7 @@ class MCPManager:
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                self.logger.error(f"Health check error: {e}")
+                self.logger.error("Health check error: %s", e)
                 
     async def _perform_health_check(self) -> None:
         """执行一轮完整的健康检查
@@ -528,8 +877,9 @@ class MCPManager:
         5. **状态更新**: 更新服务器连接状态
         
         故障处理:
-        - 连续失败3次后标记服务器为失败状态
-        - 失败2次后触发自动重连
+        - 连续失败3次，或最近20次检查中失败3次后标记服务器为失败状态
+        - 连续失败2次后触发自动重连
+        - 断路器打开期间不探测该服务器，状态标记为 circuit_open
         - 记录详细的错误信息用于诊断
         
         性能考虑:
@@ -542,182 +892,298 @@ class MCPManager:
         - 检查结果会影响工具路由决策
         - 所有异常都会被捕获和记录
         """
-        if not self._multi_mcp:
+        if not self._multi_mcp and not self._connections:
             return
             
-        current_time = asyncio.get_event_loop().time()
+        current_time = time.monotonic()
         self._last_health_check = current_time
-        
-        # 检查每个连接的健康状态
-        for server_name in self._servers:
-            if not self._servers[server_name].enabled:
+        self._last_health_check_wall = time.time()
+        
+        # 并发探测每个启用的服务器（名称快照，避免重连过程中集合被修改），
+        # 总耗时取决于最慢的探测而不是所有探测之和
+        server_names = tuple(self._enabled_names)
+        semaphore = asyncio.Semaphore(self._health_check_concurrency)
+        async with asyncio.TaskGroup() as tg:
+            probes = [tg.create_task(self._probe_server(name, semaphore)) for name in server_names]
+            
+        # 按顺序处理探测结果并更新状态；失败次数和运行时数据都在对应的
+        # _set_state 之前写入，由它统一使健康缓存失效
+        runtime_table = self._runtime
+        failures = self._health_check_failures
+        set_state = self._set_state
+        reconnect_candidates: List[str] = []
+        for server_name, probe in zip(server_names, probes):
+            result = probe.result()
+            if result is None:
+                # 没有可用的会话，不计为健康检查失败
+                set_state(server_name, ConnectionState.DISCONNECTED)
                 continue
-                
-            try:
-                # 使用错误处理执行健康检查
-                async def health_check_operation():
-                    tools = await self._multi_mcp.list_tools()
-                    return len(tools)
-                    
-                tool_count = await self._error_handler.execute_with_error_handling(
-                    server_name,
-                    health_check_operation
-                )
+            tool_count, error, latency = result
+            # 每个服务器只查找一次运行时状态
+            runtime = runtime_table.get(server_name)
+            if runtime is None:
+                runtime = runtime_table[server_name] = ServerRuntimeState()
+            
+            if error is None:
+                runtime.last_latency = latency
+                runtime.health_outcomes.append(True)
                 
                 # 重置失败计数
-                self._health_check_failures[server_name] = 0
-                self._connection_states[server_name] = ConnectionState.CONNECTED
+                failures[server_name] = 0
+                set_state(server_name, ConnectionState.CONNECTED)
                 
-                self.logger.debug(f"Health check for {server_name}: {tool_count} tools available")
+                self.logger.debug("Health check for %s: %s tools available", server_name, tool_count)
                 
-            except Exception as e:
-                # 增加失败计数
-                self._health_check_failures[server_name] = self._health_check_failures.get(server_name, 0) + 1
-                failure_count = self._health_check_failures[server_name]
+            elif isinstance(error, CircuitOpenError):
+                # 断路器打开期间探测未执行，不计为失败也不触发重连，
+                # 等断路器进入半开状态后再探测
+                set_state(server_name, ConnectionState.CIRCUIT_OPEN)
+                
+            else:
+                # 增加连续失败计数，并记入滑动窗口
+                failure_count = failures[server_name] = failures.get(server_name, 0) + 1
+                runtime.health_outcomes.append(False)
                 
-                self.logger.warning(f"Health check failed for {server_name} (attempt {failure_count}): {e}")
+                self.logger.warning("Health check failed for %s (attempt %s): %s", server_name, failure_count, error)
                 
-                # 更新连接状态
-                if failure_count >= 3:
-                    self._connection_states[server_name] = ConnectionState.FAILED
+                # 更新连接状态：窗口内失败次数过多时标记为失败，
+                # 时好时坏的服务器即使没有连续失败也会被识别出来
+                if (failure_count >= _HEALTH_WINDOW_FAILURE_LIMIT
+                        or runtime.health_outcomes.count(False) >= _HEALTH_WINDOW_FAILURE_LIMIT):
+                    set_state(server_name, ConnectionState.FAILED)
                 else:
-                    self._connection_states[server_name] = ConnectionState.RECONNECTING
+                    set_state(server_name, ConnectionState.RECONNECTING)
                     
-                # 尝试重连
-                if self._config.get_global_setting("auto_reconnect", True) and failure_count >= 2:
-                    await self._attempt_reconnect_single_server(server_name)
+                # 记录待重连的服务器，检查完成后统一重连
+                if self._auto_reconnect and failure_count >= 2:
+                    reconnect_candidates.append(server_name)
                     
+        if reconnect_candidates:
+            await self._reconnect_servers(reconnect_candidates)
+            
         # 记录整体健康状态
-        healthy_count = sum(1 for state in self._connection_states.values() 
-                          if state == ConnectionState.CONNECTED)
-        total_count = len([s for s in self._servers.values() if s.enabled])
+        healthy_count = self._state_counts[ConnectionState.CONNECTED]
+        total_count = len(self._enabled_names)
         
-        self.logger.info(f"Health check complete: {healthy_count}/{total_count} servers healthy")
+        self.logger.info("Health check complete: %s/%s servers healthy", healthy_count, total_count)
                 
     async def _attempt_reconnect(self) -> None:
         """尝试重新连接"""
-        max_attempts = self._config.get_global_setting("max_reconnect_attempts", 5)
-        delay = self._config.get_global_setting("reconnect_delay", 2)
+        max_attempts = self._max_reconnect_attempts
+        delay = self._reconnect_delay
         
         for attempt in range(max_attempts):
             try:
-                self.logger.info(f"Reconnection attempt {attempt + 1}/{max_attempts}")
+                self.logger.info("Reconnection attempt %s/%s", attempt + 1, max_attempts)
                 await self._connect_all_servers()
-                await self._create_agent()
+                await self._sync_agent_tools()
                 self.logger.info("Reconnection successful")
                 return
             except Exception as e:
-                self.logger.error(f"Reconnection attempt {attempt + 1} failed: {e}")
+                self.logger.error("Reconnection attempt %s failed: %s", attempt + 1, e)
                 if attempt < max_attempts - 1:
                     await asyncio.sleep(delay)
                     
         self.logger.error("All reconnection attempts failed")
         
+    async def _reconnect_one(self, name: str) -> None:
+        """重连单个服务器
+        
+        拥有独立会话的服务器只重建自身会话，其余连接保持不变；
+        其他服务器受 MultiMCPTools 限制需要重建整个批量连接。
+        """
+        if name in self._connections:
+            await self._disconnect_server(name)
+            await self._connect_server(name)
+        else:
+            await self._connect_all_servers()
+        await self._sync_agent_tools()
+        
+    async def _probe_server(self, server_name: str,
+                            semaphore: asyncio.Semaphore) -> Optional[Tuple[Optional[int], Optional[Exception], float]]:
+        """探测单个服务器，返回 (工具数量, 异常, 耗时)
+        
+        异常作为结果返回而不是抛出，一个服务器失败不会取消其他并发探测。
+        信号量限制同时进行的探测数量，避免同时压垮大量 stdio 子进程。
+        服务器既没有独立会话也没有批量连接时不探测，返回 None。
+        """
+        session = self._connections.get(server_name) or self._multi_mcp
+        if session is None:
+            return None
+        
+        async def health_check_operation():
+            # 批量连接的成员共享同一次探测结果
+            tools = await self._list_tools(session, self._health_check_timeout)
+            return len(tools)
+            
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                # 使用错误处理执行健康检查
+                tool_count = await self._error_handler.execute_with_error_handling(
+                    server_name,
+                    health_check_operation
+                )
+            except Exception as e:
+                return None, e, time.monotonic() - started
+            return tool_count, None, time.monotonic() - started
+            
+    async def _reconnect_servers(self, names: List[str]) -> None:
+        """并发重连多个服务器
+        
+        只要有一个服务器需要重建批量连接，就只重建一次：新的批量连接会
+        接管所有启用的服务器，其余候选无需再逐个重连。全部为独立会话时
+        并发重连，总耗时取决于最慢的一个而不是所有重连之和。
+        """
+        connections = self._connections
+        bundled = [name for name in names if name not in connections]
+        if bundled:
+            await self._attempt_reconnect_single_server(bundled[0])
+            return
+            
+        results = await asyncio.gather(
+            *(self._attempt_reconnect_single_server(name) for name in names),
+            return_exceptions=True
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                self.logger.error("Unexpected error reconnecting %s: %s", name, result)
+                
     async def _attempt_reconnect_single_server(self, server_name: str) -> bool:
         """尝试重连单个服务器"""
         if server_name not in self._servers:
             return False
             
         config = self._servers[server_name]
-        max_attempts = self._config.get_global_setting("max_reconnect_attempts", 3)
-        delay = self._config.get_global_setting("reconnect_delay", 2)
+        max_attempts = self._max_single_reconnect_attempts
+        delay = self._reconnect_delay
         
         for attempt in range(max_attempts):
             try:
-                self.logger.info(f"Reconnecting {server_name} (attempt {attempt + 1}/{max_attempts})")
+                self.logger.info("Reconnecting %s (attempt %s/%s)", server_name, attempt + 1, max_attempts)
                 
                 # 标记为重连状态
-                self._connection_states[server_name] = ConnectionState.RECONNECTING
+                self._set_state(server_name, ConnectionState.RECONNECTING)
                 
-                # 重新连接所有服务器（因为 MultiMCPTools 的限制）
-                await self._connect_all_servers()
-                await self._create_agent()
+                await self._reconnect_one(server_name)
                 
-                self.logger.info(f"Successfully reconnected {server_name}")
+                self.logger.info("Successfully reconnected %s", server_name)
                 return True
                 
             except Exception as e:
-                self.logger.error(f"Reconnection attempt {attempt + 1} failed for {server_name}: {e}")
+                self.logger.error("Reconnection attempt %s failed for %s: %s", attempt + 1, server_name, e)
                 if attempt < max_attempts - 1:
                     await asyncio.sleep(delay)
                     
-        self._connection_states[server_name] = ConnectionState.FAILED
-        self.logger.error(f"All reconnection attempts failed for {server_name}")
+        self._set_state(server_name, ConnectionState.FAILED)
+        self.logger.error("All reconnection attempts failed for %s", server_name)
         return False
         
     async def enable_server(self, name: str) -> bool:
         """启用指定服务器"""
         if name not in self._servers:
-            self.logger.error(f"Server {name} not found")
+            self.logger.error("Server %s not found", name)
             return False
             
         self._servers[name].enabled = True
+        self._track_enabled(name, True)
         self._config.enable_server(name)
         
-        # 如果已初始化，重新连接
+        # 如果已初始化，只为该服务器建立连接，其他连接保持不变
         if self._is_initialized:
             try:
-                await self._connect_all_servers()
-                await self._create_agent()
-                self.logger.info(f"Server {name} enabled and connected")
+                if not self._is_server_connected(name):
+                    await self._connect_server(name)
+                    await self._sync_agent_tools()
+                self.logger.info("Server %s enabled and connected", name)
                 return True
             except Exception as e:
-                self.logger.error(f"Failed to connect enabled server {name}: {e}")
+                self.logger.error("Failed to connect enabled server %s: %s", name, e)
                 return False
         return True
         
     async def disable_server(self, name: str) -> bool:
         """禁用指定服务器"""
         if name not in self._servers:
-            self.logger.error(f"Server {name} not found")
+            self.logger.error("Server %s not found", name)
             return False
             
         self._servers[name].enabled = False
+        self._track_enabled(name, False)
         self._config.disable_server(name)
         
-        # 如果已初始化，重新连接
+        # 如果已初始化，只断开该服务器；批量连接的成员只重建批量连接，单独会话保持不变
         if self._is_initialized:
             try:
-                await self._connect_all_servers()
-                await self._create_agent()
-                self.logger.info(f"Server {name} disabled")
+                if name in self._connections:
+                    await self._disconnect_server(name)
+                    await self._sync_agent_tools()
+                elif name in self._multi_mcp_members:
+                    await self._rebuild_bundle_without(name)
+                    await self._sync_agent_tools()
+                self._set_state(name, ConnectionState.DISCONNECTED)
+                self.logger.info("Server %s disabled", name)
                 return True
             except Exception as e:
-                self.logger.error(f"Failed to reconnect after disabling {name}: {e}")
+                self.logger.error("Failed to reconnect after disabling %s: %s", name, e)
                 return False
         return True
         
     async def get_server_tools(self, server_name: str = None) -> Dict[str, List[str]]:
-        """获取服务器工具列表"""
-        if not self._multi_mcp:
+        """获取服务器工具列表
+        
+        拥有独立会话的服务器直接按会话归属工具；批量连接的工具按
+        `{server}_{tool}` 命名前缀单次遍历完成分组，服务器名本身含下划线时
+        取最长匹配的服务器名。
+        """
+        if not self._multi_mcp and not self._connections:
             return {}
             
         try:
-            tools = await self._multi_mcp.list_tools()
+            if server_name and server_name in self._connections:
+                # 独立会话的工具直接归属该服务器，无需扫描全部工具
+                tools = await self._list_tools(self._connections[server_name])
+                return {server_name: [tool.name for tool in tools]}
+                
             if server_name:
-                # 过滤特定服务器的工具（如果工具名包含服务器前缀）
-                server_tools = [tool.name for tool in tools if tool.name.startswith(f"{server_name}_")]
-                return {server_name: server_tools}
-            else:
-                # 按服务器分组工具
-                server_tools = {}
-                for tool in tools:
-                    # 尝试从工具名推断服务器
-                    parts = tool.name.split("_", 1)
-                    if len(parts) > 1 and parts[0] in self._servers:
-                        server = parts[0]
-                    else:
-                        server = "unknown"
-                        
-                    if server not in server_tools:
-                        server_tools[server] = []
-                    server_tools[server].append(tool.name)
+                # 过滤特定服务器的工具（工具名前缀归属该服务器）
+                tools = await self._list_tools(self._multi_mcp) if self._multi_mcp else []
+                servers = self._servers
+                return {server_name: [tool.name for tool in tools
+                                      if self._tool_owner(tool.name, servers) == server_name]}
+                
+            # 按服务器分组工具
+            server_tools: Dict[str, List[str]] = defaultdict(list)
+            if self._multi_mcp:
+                servers = self._servers
+                for tool in await self._list_tools(self._multi_mcp):
+                    # 从工具名前缀推断服务器
+                    server_tools[self._tool_owner(tool.name, servers) or "unknown"].append(tool.name)
                     
-                return server_tools
+            for name, session in self._connections.items():
+                server_tools[name].extend(tool.name for tool in await self._list_tools(session))
+                
+            return dict(server_tools)
         except Exception as e:
-            self.logger.error(f"Error getting server tools: {e}")
+            self.logger.error("Error getting server tools: %s", e)
             return {}
             
+    @staticmethod
+    def _tool_owner(tool_name: str, servers: Dict[str, Any]) -> Optional[str]:
+        """按 `{server}_{tool}` 命名约定推断工具所属服务器
+        
+        依次尝试工具名中每个下划线之前的前缀，返回最长的已注册服务器名；
+        无匹配时返回 None。
+        """
+        owner = None
+        sep = tool_name.find("_")
+        while sep > 0:
+            prefix = tool_name[:sep]
+            if prefix in servers:
+                owner = prefix
+            sep = tool_name.find("_", sep + 1)
+        return owner
+        
     async def shutdown(self) -> None:
         """优雅关闭MCP管理器并清理所有资源
         
@@ -749,32 +1215,58 @@ class MCPManager:
         - 重复调用是安全的
         - 关闭过程可能需要几秒钟时间
         """
-        self.logger.info("Shutting down MCP Manager...")
-        
-        # 停止健康检查
-        if self._health_check_task:
-            self._health_check_task.cancel()
-            try:
-                await self._health_check_task
-            except asyncio.CancelledError:
-                pass
+        if not self._has_resources():
+            return
+            
+        async with self._lifecycle_lock:
+            if not self._has_resources():
+                return
                 
-        # 断开所有连接
-        if self._multi_mcp:
-            try:
-                await self._multi_mcp.disconnect()
-            except Exception as e:
-                self.logger.error(f"Error during MCP shutdown: {e}")
+            self.logger.info("Shutting down MCP Manager...")
+            
+            # 先请求停止健康检查，使其在连接关闭前退出
+            health_check_task = self._health_check_task
+            if health_check_task:
+                health_check_task.cancel()
                 
-        # 清理状态
-        self._connections.clear()
-        self._multi_mcp = None
-        self._agent = None
-        self._is_initialized = False
-        self._health_check_task = None
-        
-        self.logger.info("MCP Manager shutdown complete")
+            # 等待尚未完成的后台任务（如 remove_server 触发的断开操作）
+            if self._background_tasks:
+                await asyncio.gather(*self._background_tasks, return_exceptions=True)
+                
+            # 并发等待健康检查退出并断开所有连接
+            async with asyncio.TaskGroup() as tg:
+                if health_check_task:
+                    tg.create_task(self._wait_cancelled(health_check_task))
+                tg.create_task(self._teardown_connections())
+                
+            # 清理状态
+            self._connections.clear()
+            self._multi_mcp = None
+            self._multi_mcp_members = set()
+            self._agent = None
+            self._is_initialized = False
+            self._health_check_task = None
+            
+            self.logger.info("MCP Manager shutdown complete")
+            
+    def _has_resources(self) -> bool:
+        """检查是否存在需要在关闭时释放的资源"""
+        return bool(
+            self._is_initialized
+            or self._multi_mcp
+            or self._connections
+            or self._health_check_task
+            or self._background_tasks
+        )
         
+    @staticmethod
+    async def _wait_cancelled(task: asyncio.Task) -> None:
+        """等待已请求取消的任务结束"""
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+            
     @property
     def is_initialized(self) -> bool:
         """检查是否已初始化"""
@@ -811,7 +1303,8 @@ class MCPManager:
                 - healthy_servers: 健康服务器数量
                 - failed_servers: 失败服务器数量
                 - reconnecting_servers: 重连中服务器数量
-                - health_check_failures: 各服务器的失败次数
+                - health_check_failures: 各服务器的连续失败次数
+                - health_check_error_rates: 各服务器最近健康检查的失败率
                 - last_health_check: 最后一次健康检查时间
                 - server_states: 各服务器的详细状态
                 - healthy_server_list: 健康服务器列表
@@ -835,27 +1328,54 @@ class MCPManager:
         - 健康率低于80%时需要关注
         - 连续失败超过5次的服务器需要人工干预
         - 重连频率过高可能表示网络问题
+        
+        缓存：
+        - 结果在 `health_metrics_ttl` 秒内（默认2秒）复用，状态变更时立即失效
+        - 缓存的是不可变的 HealthMetrics 快照，每次返回由快照生成的新字典，
+          调用方修改返回值不会影响缓存
         """
-        healthy_servers = [name for name, state in self._connection_states.items() 
-                          if state == ConnectionState.CONNECTED]
-        failed_servers = [name for name, state in self._connection_states.items() 
-                         if state == ConnectionState.FAILED]
-        reconnecting_servers = [name for name, state in self._connection_states.items() 
-                               if state == ConnectionState.RECONNECTING]
-                               
-        return {
-            "total_servers": len(self._servers),
-            "enabled_servers": len([s for s in self._servers.values() if s.enabled]),
-            "healthy_servers": len(healthy_servers),
-            "failed_servers": len(failed_servers),
-            "reconnecting_servers": len(reconnecting_servers),
-            "health_check_failures": dict(self._health_check_failures),
-            "last_health_check": self._last_health_check,
-            "server_states": self.get_connection_states(),
-            "healthy_server_list": healthy_servers,
-            "failed_server_list": failed_servers,
-            "reconnecting_server_list": reconnecting_servers
+        return self._health_snapshot().to_dict()
+        
+    def _health_snapshot(self) -> HealthMetrics:
+        """获取（必要时重新计算）健康指标快照"""
+        cached = self._cached_health
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < self._health_metrics_ttl:
+            return cached[1]
+            
+        # 一次遍历连接状态，同时按状态分组
+        server_states = {}
+        servers_by_state: Dict[ConnectionState, List[str]] = defaultdict(list)
+        for name, state in self._connection_states.items():
+            server_states[name] = state.value
+            servers_by_state[state].append(name)
+        healthy_servers = sorted(servers_by_state[ConnectionState.CONNECTED])
+        failed_servers = sorted(servers_by_state[ConnectionState.FAILED])
+        reconnecting_servers = sorted(servers_by_state[ConnectionState.RECONNECTING])
+        
+        error_rates = {
+            name: runtime.health_error_rate()
+            for name, runtime in self._runtime.items()
+            if runtime.health_outcomes
         }
+                               
+        counts = self._state_counts
+        metrics = HealthMetrics(
+            total_servers=len(self._servers),
+            enabled_servers=len(self._enabled_names),
+            healthy_servers=counts[ConnectionState.CONNECTED],
+            failed_servers=counts[ConnectionState.FAILED],
+            reconnecting_servers=counts[ConnectionState.RECONNECTING],
+            health_check_failures=dict(self._health_check_failures),
+            health_check_error_rates=error_rates,
+            last_health_check=self._last_health_check,
+            server_states=server_states,
+            healthy_server_list=tuple(healthy_servers),
+            failed_server_list=tuple(failed_servers),
+            reconnecting_server_list=tuple(reconnecting_servers)
+        )
+        self._cached_health = (now, metrics)
+        return metrics
         
     async def diagnose_connection_issues(self) -> Dict[str, Any]:
         """全面诊断MCP连接问题并提供解决建议
@@ -873,7 +1393,7 @@ class MCPManager:
         Returns:
             Dict[str, Any]: 诊断报告，包含：
                 - timestamp: 诊断时间戳
-                - overall_health: 整体健康状态 ("healthy"|"degraded"|"unhealthy")
+                - overall_health: 整体健康状态 ("healthy"|"recovering"|"degraded"|"unhealthy")
                 - issues: 发现的问题列表
                 - recommendations: 解决建议列表
                 - detailed_analysis: 详细分析结果
@@ -881,6 +1401,7 @@ class MCPManager:
         
         健康状态定义：
         - **healthy**: 所有服务器正常运行，错误率<5%
+        - **recovering**: 部分服务器正在重连，暂无失败的服务器
         - **degraded**: 部分服务器有问题，但系统仍可用
         - **unhealthy**: 多数服务器失败，系统功能受限
         
@@ -902,43 +1423,121 @@ class MCPManager:
         2. 按优先级处理发现的问题
         3. 重新运行诊断验证修复效果
         4. 监控系统稳定性
+        
+        缓存：
+        - 结果在 `diagnosis_ttl` 秒内（默认10秒）复用，缓存命中时不做任何计算
+        - 连接状态变更时缓存立即失效
+        - 计算过程中没有 await，并发调用方在同一事件循环中天然共享同一份结果，无需加锁
         """
-        diagnosis = {
-            "timestamp": asyncio.get_event_loop().time(),
-            "overall_health": "healthy",
-            "issues": [],
-            "recommendations": []
-        }
+        return self._diagnosis_snapshot().to_dict()
+        
+    def _diagnosis_snapshot(self) -> ConnectionDiagnosis:
+        """获取（必要时重新计算）连接诊断结果"""
+        cached = self._cached_diagnosis
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < self._diagnosis_ttl:
+            return cached[1]
+            
+        # 整体健康状态取所有检查结果中最严重的一项，与检查顺序无关
+        overall_health = "healthy"
+        issues: List[str] = []
+        recommendations: List[str] = []
         
-        health_metrics = self.get_health_metrics()
+        health_metrics = self._health_snapshot()
         error_stats = self.get_error_statistics()
         
         # 检查整体健康状况
-        if health_metrics["failed_servers"] > 0:
-            diagnosis["overall_health"] = "degraded"
-            diagnosis["issues"].append(f"{health_metrics['failed_servers']} servers are in failed state")
-            diagnosis["recommendations"].append("Check server configurations and network connectivity")
+        if health_metrics.failed_servers > 0:
+            overall_health = self._worse_health(overall_health, "degraded")
+            issues.append(f"{health_metrics.failed_servers} servers are in failed state")
+            recommendations.append("Check server configurations and network connectivity")
             
-        if health_metrics["reconnecting_servers"] > 0:
-            diagnosis["overall_health"] = "recovering"
-            diagnosis["issues"].append(f"{health_metrics['reconnecting_servers']} servers are reconnecting")
+        if health_metrics.reconnecting_servers > 0:
+            overall_health = self._worse_health(overall_health, "recovering")
+            issues.append(f"{health_metrics.reconnecting_servers} servers are reconnecting")
             
         # 检查错误率
         if error_stats["overall_error_rate"] > 0.1:  # 10% 错误率阈值
-            diagnosis["overall_health"] = "unhealthy"
-            diagnosis["issues"].append(f"High error rate: {error_stats['overall_error_rate']:.2%}")
-            diagnosis["recommendations"].append("Investigate most common errors and consider increasing retry limits")
+            overall_health = self._worse_health(overall_health, "unhealthy")
+            issues.append(f"High error rate: {error_stats['overall_error_rate']:.2%}")
+            recommendations.append("Investigate most common errors and consider increasing retry limits")
             
         # 检查最常见的错误
-        if error_stats["most_common_errors"]:
-            most_common = max(error_stats["most_common_errors"].items(), key=lambda x: x[1])
-            diagnosis["issues"].append(f"Most common error: {most_common[0]} ({most_common[1]} occurrences)")
+        top_error = error_stats.get("top_error")
+        if top_error:
+            issues.append(f"Most common error: {top_error[0]} ({top_error[1]} occurrences)")
             
         # 提供具体建议
-        if not diagnosis["issues"]:
-            diagnosis["recommendations"].append("All systems operating normally")
+        if not issues:
+            recommendations.append("All systems operating normally")
         else:
-            diagnosis["recommendations"].append("Monitor logs for detailed error information")
-            diagnosis["recommendations"].append("Consider adjusting health check intervals if issues persist")
+            recommendations.append("Monitor logs for detailed error information")
+            recommendations.append("Consider adjusting health check intervals if issues persist")
             
-        return diagnosis
\ No newline at end of file
+        diagnosis = ConnectionDiagnosis(
+            timestamp=now,
+            overall_health=overall_health,
+            issues=tuple(issues),
+            recommendations=tuple(recommendations)
+        )
+        self._cached_diagnosis = (now, diagnosis)
+        return diagnosis
+        
+    def write_metrics(self, buf: bytearray) -> None:
+        """以 OpenMetrics 文本格式将健康指标追加到 buf
+        
+        面向 Prometheus 等监控系统的抓取接口，直接读取增量维护的计数和运行时数据，
+        不经过 get_health_metrics 的字典构建和 JSON 序列化。调用方可以复用同一个
+        缓冲区（抓取前 `buf.clear()`），HTTP 处理器直接以 METRICS_CONTENT_TYPE 返回 buf。
+        
+        输出的指标：
+        - mcp_servers_configured / mcp_servers_enabled: 配置和启用的服务器数量
+        - mcp_servers{state="..."}: 各连接状态下的服务器数量
+        - mcp_server_health_check_failures{server="..."}: 连续健康检查失败次数
+        - mcp_server_health_check_error_rate{server="..."}: 滑动窗口内的失败率
+        - mcp_server_health_check_latency_seconds{server="..."}: 最近一次成功探测的耗时
+        - mcp_last_health_check_timestamp_seconds: 最后一次健康检查的 Unix 时间戳
+        
+        Args:
+            buf: 输出缓冲区，内容追加在末尾
+        """
+        state_counts = self._state_counts
+        buf += b"# TYPE mcp_servers_configured gauge\n"
+        buf += b"mcp_servers_configured %d\n" % len(self._servers)
+        buf += b"# TYPE mcp_servers_enabled gauge\n"
+        buf += b"mcp_servers_enabled %d\n" % len(self._enabled_names)
+        buf += b"# TYPE mcp_servers gauge\n"
+        for state in ConnectionState:
+            buf += b'mcp_servers{state="%s"} %d\n' % (
+                state.value.encode(), state_counts[state]
+            )
+            
+        failures = bytearray(b"# TYPE mcp_server_health_check_failures gauge\n")
+        error_rates = bytearray(b"# TYPE mcp_server_health_check_error_rate gauge\n")
+        latencies = bytearray(b"# TYPE mcp_server_health_check_latency_seconds gauge\n")
+        for name, count in self._health_check_failures.items():
+            failures += b'mcp_server_health_check_failures{server="%s"} %d\n' % (
+                _metric_label(name).encode(), count
+            )
+        for name, runtime in self._runtime.items():
+            label = _metric_label(name).encode()
+            if runtime.health_outcomes:
+                error_rates += b'mcp_server_health_check_error_rate{server="%s"} %r\n' % (
+                    label, runtime.health_error_rate()
+                )
+                latencies += b'mcp_server_health_check_latency_seconds{server="%s"} %r\n' % (
+                    label, runtime.last_latency
+                )
+        buf += failures
+        buf += error_rates
+        buf += latencies
+        buf += b"# TYPE mcp_last_health_check_timestamp_seconds gauge\n"
+        buf += b"mcp_last_health_check_timestamp_seconds %r\n" % self._last_health_check_wall
+        buf += b"# EOF\n"
+        
+    @staticmethod
+    def _worse_health(current: str, candidate: str) -> str:
+        """返回两个健康状态中更严重的一个"""
+        if _HEALTH_SEVERITY[candidate] > _HEALTH_SEVERITY[current]:
+            return candidate
+        return current
\ No newline at end of file
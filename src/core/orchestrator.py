@@ -34,9 +34,9 @@
     ```
 
 性能考虑:
-- 支持异步并发执行多个任务
+- 固定数量的工作协程并发执行任务，突发请求在队列中排队等待
 - 智能缓存站点模型，减少重复探索
-- 内存中维护任务状态，支持快速查询
+- 内存中维护任务状态，支持快速查询，已结束任务按LRU淘汰以限制内存占用
 - 统计信息实时计算，支持性能监控
 
 扩展性:
@@ -46,23 +46,31 @@
 """
 
 import asyncio
+import copy
+import random
 import time
 import uuid
+from collections import OrderedDict, deque
 from datetime import datetime
+from itertools import count, islice
 from enum import Enum
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Set, Tuple
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
 
 from ..utils.logger import get_logger
-from ..utils.exceptions import AuraException, TaskExecutionError
-from .policy_engine import PolicyEngine
-from .risk_engine import RiskEngine
-from .action_graph import ActionGraphEngine, ActionGraph, ActionNode, ActionEdge, NodeType
-from .mcp_manager import MCPManager
-from ..modules.command_parser import CommandParser
-from ..modules.skill_library import SkillLibrary
-from ..modules.site_explorer import SiteExplorer
-from ..config.mcp_config import MCPConfig
+from ..utils.exceptions import AuraException, TaskExecutionError, ValidationError
+from .action_graph import ActionGraphEngine, ActionGraph, ActionNode, ActionEdge, NodeType, ExecutionResult
+
+if TYPE_CHECKING:
+    from .policy_engine import PolicyEngine
+    from .risk_engine import RiskEngine
+    from .mcp_manager import MCPManager
+    from ..modules.command_parser import CommandParser
+    from ..modules.skill_library import SkillLibrary
+    from ..modules.site_explorer import SiteExplorer
+    from ..config.mcp_config import MCPConfig
+    from .task_store import TaskStore
 
 logger = get_logger(__name__)
 
@@ -76,6 +84,22 @@ class TaskStatus(Enum):
     CANCELLED = "cancelled"
 
 
+# 已结束的任务状态，此类任务不会再变化，可从任务历史中淘汰
+_TERMINAL_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED})
+# 内存中保留的任务历史上限（运行中的任务不受限制）
+_MAX_TASK_HISTORY = 10_000
+# 同时执行的任务数上限（工作协程数量）
+_MAX_CONCURRENT_TASKS = 4
+# 任务执行失败重试的基础退避时间（秒），每次重试翻倍，并乘以 0.5~1.5 的随机抖动
+_RETRY_BASE_DELAY = 0.25
+# 指令解析结果缓存的容量
+_PARSE_CACHE_SIZE = 512
+# 执行成功的 Action Graph 缓存的容量
+_GRAPH_CACHE_SIZE = 256
+# 每个任务保留的执行日志条数，超出后丢弃最早的记录
+_EXECUTION_LOG_SIZE = 256
+
+
 class ExecutionMode(Enum):
     """执行模式枚举"""
     AI_AGENT = "ai_agent"  # AI动态规划模式
@@ -91,7 +115,7 @@ class RiskLevel(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskRequest:
     """任务请求数据结构"""
     goal: str
@@ -105,19 +129,109 @@ class TaskRequest:
     session_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
+class ParsedCommandView:
+    """执行策略决策所需的解析结果字段
+    
+    在指令解析后提取一次，后续的策略决策直接读取属性，
+    不再对解析结果做 hasattr/getattr 探测。
+    """
+    intent: str
+    context: Dict[str, Any]
+    reasoning: str
+    
+    @classmethod
+    def from_parsed(cls, parsed_command: Any) -> "ParsedCommandView":
+        """从解析结果中提取字段，缺失的字段取空值"""
+        primary_intent = getattr(parsed_command, 'primary_intent', None)
+        intent = getattr(getattr(primary_intent, 'intent', None), 'value', '') if primary_intent else ''
+        strategy = getattr(parsed_command, 'execution_strategy', None)
+        return cls(
+            intent=intent,
+            context=getattr(parsed_command, 'context', {}),
+            reasoning=getattr(strategy, 'reasoning', '') if strategy else ''
+        )
+
+
+@dataclass(slots=True)
+class StrategyDecision:
+    """编排器选定的执行策略（与指令解析器的 ExecutionStrategy 无关）
+    
+    SCRIPT 模式使用 skill_id 和 parameters，AI_AGENT 模式使用 plan。
+    """
+    mode: ExecutionMode
+    confidence: float = 0.0
+    skill_id: Optional[str] = None
+    parameters: Optional[Dict[str, Any]] = None
+    plan: Optional[str] = None
+
+
+@dataclass(slots=True)
 class TaskResult:
     """任务结果数据结构"""
     task_id: str
     status: TaskStatus
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
-    execution_log: List[Dict[str, Any]] = field(default_factory=list)
+    # 执行日志，每条为 (step, timestamp, data)，timestamp 为 time.time() 时间戳，
+    # 只保留最近 _EXECUTION_LOG_SIZE 条
+    execution_log: "deque[Tuple[str, float, Any]]" = field(default_factory=lambda: deque(maxlen=_EXECUTION_LOG_SIZE))
     screenshots: List[str] = field(default_factory=list)
     tokens_used: int = 0
     execution_time: float = 0.0
     created_at: datetime = field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
+    # 原始请求和选定的执行策略，用于重放
+    request: Optional[TaskRequest] = None
+    strategy: Optional[StrategyDecision] = None
+    
+    def execution_log_entries(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """以字典形式返回执行日志（时间戳转换为ISO格式）
+        
+        Args:
+            limit: 只返回最近的若干条，None 表示全部
+        """
+        entries = self.execution_log
+        if limit is not None:
+            entries = islice(entries, max(len(entries) - limit, 0), None)
+        return [
+            {"step": step, "timestamp": datetime.fromtimestamp(ts).isoformat(), "data": data}
+            for step, ts, data in entries
+        ]
+
+
+@dataclass(slots=True)
+class OrchestratorStats:
+    """执行统计计数器
+    
+    计数器在任务创建和进入终态时增量更新，成功率和平均执行时间按需计算，
+    无需遍历任务历史。
+    """
+    total_tasks: int = 0         # 总任务数
+    completed: int = 0           # 成功完成的任务数
+    failed: int = 0              # 最终失败的任务数
+    sum_exec_time: float = 0.0   # 成功任务的累计执行时间(秒)
+    token_usage: int = 0         # Token使用量
+    
+    @property
+    def success_rate(self) -> float:
+        """成功率 (0.0-1.0)"""
+        total_processed = self.completed + self.failed
+        return self.completed / total_processed if total_processed else 0.0
+    
+    @property
+    def avg_execution_time(self) -> float:
+        """平均执行时间(秒)"""
+        return self.sum_exec_time / self.completed if self.completed else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为对外暴露的统计字典"""
+        return {
+            "total_tasks": self.total_tasks,
+            "success_rate": self.success_rate,
+            "avg_execution_time": self.avg_execution_time,
+            "token_usage": self.token_usage
+        }
 
 
 class Orchestrator:
@@ -131,13 +245,19 @@ class Orchestrator:
     5. 学习和优化
     """
     
-    def __init__(self):
+    def __init__(self, task_store: Optional["TaskStore"] = None,
+                 max_concurrency: int = _MAX_CONCURRENT_TASKS):
         """初始化 Aura 核心编排器
         
         设置所有必要的组件和配置，建立系统的基础架构。
         
+        Args:
+            task_store: 可选的外部任务存储，已结束的任务写入其中，
+                从内存淘汰后仍可通过 get_task_status 查询
+            max_concurrency: 同时执行的任务数上限（工作协程数量）
+        
         初始化流程:
-        1. **核心组件初始化**: 创建命令解析、技能库、站点探索等核心组件
+        1. **核心组件初始化**: 命令解析、技能库、站点探索等核心组件在首次访问时创建
         2. **策略引擎配置**: 设置安全策略和风险评估机制
         3. **MCP连接准备**: 配置Model Context Protocol管理器
         4. **任务管理设置**: 初始化任务队列和状态跟踪
@@ -157,30 +277,89 @@ class Orchestrator:
         - 任务队列支持并发处理，但需要合理控制并发数
         - 统计信息实时更新，可用于监控和优化
         """
-        # 核心组件 - 按依赖顺序初始化
-        self.tasks: Dict[str, TaskResult] = {}  # 任务状态存储 {task_id: TaskResult}
-        self.command_parser = CommandParser()  # 指令解析器
-        self.skill_library = SkillLibrary()    # 技能库管理
-        self.site_explorer = SiteExplorer()    # 站点探索器
-        self.policy_engine = PolicyEngine()    # 策略引擎
-        self.risk_engine = RiskEngine()        # 风险引擎
-        self.action_graph_executor = ActionGraphEngine()  # Action Graph执行器
-        
-        # MCP (Model Context Protocol) 相关组件
-        self.mcp_config = MCPConfig()          # MCP配置管理
-        self.mcp_manager = MCPManager()        # MCP连接管理
+        # 任务状态存储 {task_id: TaskResult}，按最近访问排序，超出上限时淘汰最久未访问的已结束任务
+        self.tasks: "OrderedDict[str, TaskResult]" = OrderedDict()
+        self._max_history = _MAX_TASK_HISTORY
+        # 任务ID = 实例前缀 + 递增序号，每个编排器实例只生成一次随机前缀
+        self._id_prefix = uuid.uuid4().hex[:8]
+        self._task_counter = count(1)
+        # 状态索引 {status: {task_id}}，状态变更统一经过 _set_status 维护
+        self._tasks_by_status: Dict[TaskStatus, Set[str]] = {status: set() for status in TaskStatus}
+        self._task_store = task_store
+        
+        # 任务调度：create_task 只负责入队，由固定数量的工作协程取出执行
+        if max_concurrency < 1:
+            raise ValidationError("max_concurrency must be at least 1",
+                                  field="max_concurrency", value=max_concurrency)
+        self.max_concurrency = max_concurrency
+        self._task_queue: "asyncio.Queue[Tuple[str, TaskRequest]]" = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}  # 执行中的任务 {task_id: asyncio.Task}
+        
+        # 指令解析缓存 {goal: (ParsedCommand, ParsedCommandView)}，按LRU淘汰；同一指令的并发解析共享一次调用
+        self._parse_cache: "OrderedDict[str, Tuple[Any, ParsedCommandView]]" = OrderedDict()
+        self._parse_inflight: Dict[str, asyncio.Task] = {}
+        # Action Graph 缓存 {(goal, site_scope): ActionGraph}，保存执行成功的图在执行前的副本
+        self._graph_cache: "OrderedDict[Tuple[str, str], ActionGraph]" = OrderedDict()
+        
+        # 核心组件和 MCP 组件在首次访问时创建（见下方的属性定义）
         self._mcp_initialized = False          # MCP初始化状态标记
+        self._mcp_init_lock = asyncio.Lock()   # 串行化MCP的初始化和重新初始化
         
-        # 执行统计和监控
-        self.stats = {
-            "total_tasks": 0,           # 总任务数
-            "success_rate": 0.0,        # 成功率 (0.0-1.0)
-            "avg_execution_time": 0.0,  # 平均执行时间(秒)
-            "token_usage": 0            # Token使用量
-        }
+        # 执行统计和监控，在任务进入终态时增量更新，get_stats 无需遍历任务历史
+        self.stats = OrchestratorStats()
         
         logger.info("Orchestrator initialized")
     
+    # 核心组件按需创建：只查询状态或统计的调用方无需导入浏览器/MCP相关依赖
+    
+    @cached_property
+    def command_parser(self) -> "CommandParser":
+        """指令解析器"""
+        from ..modules.command_parser import CommandParser
+        return CommandParser()
+    
+    @cached_property
+    def skill_library(self) -> "SkillLibrary":
+        """技能库管理"""
+        from ..modules.skill_library import SkillLibrary
+        return SkillLibrary()
+    
+    @cached_property
+    def site_explorer(self) -> "SiteExplorer":
+        """站点探索器"""
+        from ..modules.site_explorer import SiteExplorer
+        return SiteExplorer()
+    
+    @cached_property
+    def policy_engine(self) -> "PolicyEngine":
+        """策略引擎"""
+        from .policy_engine import PolicyEngine
+        return PolicyEngine()
+    
+    @cached_property
+    def risk_engine(self) -> "RiskEngine":
+        """风险引擎"""
+        from .risk_engine import RiskEngine
+        return RiskEngine()
+    
+    @cached_property
+    def action_graph_executor(self) -> ActionGraphEngine:
+        """Action Graph执行器"""
+        return ActionGraphEngine()
+    
+    @cached_property
+    def mcp_config(self) -> "MCPConfig":
+        """MCP配置管理"""
+        from ..config.mcp_config import MCPConfig
+        return MCPConfig()
+    
+    @cached_property
+    def mcp_manager(self) -> "MCPManager":
+        """MCP连接管理"""
+        from .mcp_manager import MCPManager
+        return MCPManager()
+    
     async def create_task(self, request: TaskRequest) -> str:
         """创建新任务
         
@@ -190,24 +369,77 @@ class Orchestrator:
         Returns:
             任务ID
         """
-        task_id = str(uuid.uuid4())
+        task_id = self._enqueue_task(request)
+        logger.info("Task created: %s, goal: %s", task_id, request.goal)
+        return task_id
+    
+    def _enqueue_task(self, request: TaskRequest,
+                      strategy: Optional[StrategyDecision] = None) -> str:
+        """登记新任务并入队等待工作协程执行
+        
+        Args:
+            request: 任务请求
+            strategy: 预先确定的执行策略（重放时使用），None 表示执行时再决策
+            
+        Returns:
+            任务ID
+        """
+        task_id = f"{self._id_prefix}-{next(self._task_counter)}"
         
         # 创建任务结果对象
         task_result = TaskResult(
             task_id=task_id,
-            status=TaskStatus.PENDING
+            status=TaskStatus.PENDING,
+            request=request,
+            strategy=strategy
         )
         
         self.tasks[task_id] = task_result
-        self.stats["total_tasks"] += 1
-        
-        logger.info(f"Task created: {task_id}, goal: {request.goal}")
+        self._tasks_by_status[TaskStatus.PENDING].add(task_id)
+        self.stats.total_tasks += 1
+        self._evict_finished_tasks()
         
-        # 异步执行任务
-        asyncio.create_task(self._execute_task(task_id, request))
+        self._ensure_workers()
+        self._task_queue.put_nowait((task_id, request))
         
         return task_id
     
+    def _ensure_workers(self) -> None:
+        """按需启动工作协程，数量由 max_concurrency 决定"""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker_loop())
+            for _ in range(self.max_concurrency)
+        ]
+    
+    async def _worker_loop(self) -> None:
+        """工作协程：依次取出排队的任务并执行
+        
+        每个任务在独立的 asyncio.Task 中执行并登记到 _running，
+        cancel_task 可以直接中断它而不影响工作协程本身。
+        """
+        while True:
+            task_id, request = await self._task_queue.get()
+            try:
+                task = self.tasks.get(task_id)
+                if task is None or task.status is not TaskStatus.PENDING:
+                    # 排队期间已被取消
+                    continue
+                    
+                execution = asyncio.create_task(self._execute_task(task_id, request))
+                self._running[task_id] = execution
+                try:
+                    await execution
+                except asyncio.CancelledError:
+                    # 工作协程自身被取消时继续向上传播，任务被取消则处理下一个
+                    if asyncio.current_task().cancelling():
+                        raise
+                finally:
+                    self._running.pop(task_id, None)
+            finally:
+                self._task_queue.task_done()
+    
     async def get_task_status(self, task_id: str) -> Optional[TaskResult]:
         """获取任务状态
         
@@ -216,8 +448,49 @@ class Orchestrator:
             
         Returns:
             任务结果，如果任务不存在返回None
+            
+        内存中找不到时（已被淘汰），从外部任务存储中读取。
+        """
+        task = self.tasks.get(task_id)
+        if task is not None:
+            self.tasks.move_to_end(task_id)
+            return task
+        if self._task_store is not None:
+            return await self._task_store.load(task_id)
+        return None
+    
+    async def _archive_task(self, task: TaskResult) -> None:
+        """将已结束的任务写入外部任务存储（未配置时不做任何事）"""
+        if self._task_store is None:
+            return
+        try:
+            await self._task_store.save(task)
+        except Exception as e:
+            # 存储失败不影响任务本身，任务仍保留在内存中直到被淘汰
+            logger.warning("Failed to archive task %s: %s", task.task_id, e)
+    
+    def _evict_finished_tasks(self) -> None:
+        """淘汰最久未访问的已结束任务，使任务历史不超过上限
+        
+        从最久未访问的一端开始查找，运行中和等待中的任务始终保留。
         """
-        return self.tasks.get(task_id)
+        excess = len(self.tasks) - self._max_history
+        if excess <= 0:
+            return
+        evicted = list(islice(
+            (task_id for task_id, task in self.tasks.items()
+             if task.status in _TERMINAL_STATUSES),
+            excess
+        ))
+        for task_id in evicted:
+            task = self.tasks.pop(task_id)
+            self._tasks_by_status[task.status].discard(task_id)
+    
+    def _set_status(self, task: TaskResult, status: TaskStatus) -> None:
+        """更新任务状态并同步状态索引"""
+        self._tasks_by_status[task.status].discard(task.task_id)
+        task.status = status
+        self._tasks_by_status[status].add(task.task_id)
     
     async def cancel_task(self, task_id: str) -> bool:
         """取消任务
@@ -227,42 +500,51 @@ class Orchestrator:
             
         Returns:
             是否成功取消
+            
+        正在执行的任务会被中断，返回前等待其协程退出，占用的资源随之释放。
         """
         if task_id not in self.tasks:
             return False
         
         task = self.tasks[task_id]
-        if task.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
+        if task.status in _TERMINAL_STATUSES:
             return False
         
-        task.status = TaskStatus.CANCELLED
+        self._set_status(task, TaskStatus.CANCELLED)
         task.completed_at = datetime.now()
         
-        logger.info(f"Task cancelled: {task_id}")
+        # 中断正在执行的协程，并等待其完成清理（任务自身调用取消时无需等待）
+        execution = self._running.get(task_id)
+        if execution is not None:
+            execution.cancel()
+            if execution is not asyncio.current_task():
+                await asyncio.wait((execution,))
+        await self._archive_task(task)
+        
+        logger.info("Task cancelled: %s", task_id)
         return True
     
     async def replay_task(self, task_id: str) -> str:
         """重放任务
         
+        使用原任务的请求，并沿用原任务选定的执行策略，跳过技能匹配和策略决策；
+        风险评估和策略检查仍会重新执行。
+        
         Args:
             task_id: 原任务ID
             
         Returns:
             新任务ID
         """
-        original_task = self.tasks.get(task_id)
+        original_task = await self.get_task_status(task_id)
         if not original_task:
             raise AuraException(f"Task {task_id} not found")
+        if original_task.request is None:
+            raise AuraException(f"Task {task_id} cannot be replayed: original request not recorded")
         
-        # 基于原任务创建新的重放任务
-        # 这里需要从执行日志中重建TaskRequest
-        # 简化实现，实际需要更复杂的逻辑
-        replay_request = TaskRequest(
-            goal=f"Replay of task {task_id}",
-            budget_tokens=3000
-        )
-        
-        return await self.create_task(replay_request)
+        new_task_id = self._enqueue_task(original_task.request, original_task.strategy)
+        logger.info("Task replayed: %s -> %s", task_id, new_task_id)
+        return new_task_id
     
     async def _execute_task(self, task_id: str, request: TaskRequest):
         """执行任务的核心编排逻辑
@@ -271,7 +553,7 @@ class Orchestrator:
         
         执行流程:
         1. **指令解析**: 将自然语言转换为结构化命令对象
-        2. **风险评估**: 分析操作风险，生成风险报告和建议
+        2. **风险评估**: 分析操作风险，生成风险报告和建议（与技能匹配并发执行）
         3. **策略检查**: 根据安全策略决定是否允许执行
         4. **人工审批**: 高风险操作需要人工确认
         5. **策略选择**: 智能选择脚本模式或AI代理模式
@@ -283,9 +565,9 @@ class Orchestrator:
             request: 包含目标、约束、风险级别等的任务请求
             
         异常处理:
-        - 策略拒绝: 抛出 TaskExecutionError
+        - 策略拒绝: 抛出 TaskExecutionError，不重试
         - 审批拒绝: 抛出 TaskExecutionError  
-        - 执行失败: 捕获异常并返回失败状态
+        - 执行失败: 按 retry_count 在本次调用内带随机抖动的指数退避重试，耗尽后标记为失败状态
         
         性能考虑:
         - 异步执行，支持并发处理
@@ -293,26 +575,29 @@ class Orchestrator:
         - 错误恢复机制，提高鲁棒性
         """
         task = self.tasks[task_id]
-        task.status = TaskStatus.RUNNING
-        start_time = datetime.now()
+        self._set_status(task, TaskStatus.RUNNING)
+        start_time = time.monotonic()  # 单调时钟计时，不受系统时间调整影响
         
         try:
-            logger.info(f"Starting task execution: {task_id}")
+            logger.info("Starting task execution: %s", task_id)
             
             # 1. 指令解析 - 将自然语言转换为结构化命令
-            parsed_command = await self.command_parser.parse_command(request.goal)
-            task.execution_log.append({
-                "step": "command_parsing",
-                "timestamp": datetime.now().isoformat(),
-                "data": parsed_command
-            })
-            logger.info(f"Task {task_id}: Command parsed successfully")
+            parsed_command, command_view = await self._get_parsed_command(request.goal)
+            task.execution_log.append(("command_parsing", time.time(), parsed_command))
+            logger.info("Task %s: Command parsed successfully", task_id)
             
             # 2. 风险评估 - 分析潜在风险和安全隐患
-            risk_assessment = await self.risk_engine.assess_risk(
-                parsed_command, request.risk_level
-            )
-            logger.info(f"Task {task_id}: Risk assessment completed")
+            # 技能匹配与风险评估相互独立，并发执行；匹配结果供后续策略决策使用
+            # 重放任务已有执行策略，无需技能匹配
+            if task.strategy is None:
+                risk_assessment, skill_match = await asyncio.gather(
+                    self.risk_engine.assess_risk(parsed_command, request.risk_level),
+                    self.skill_library.find_matching_skill(command_view.intent, command_view.context)
+                )
+            else:
+                risk_assessment = await self.risk_engine.assess_risk(parsed_command, request.risk_level)
+                skill_match = None
+            logger.info("Task %s: Risk assessment completed", task_id)
             
             # 3. 策略检查 - 根据安全策略决定执行权限
             policy_check = await self.policy_engine.check_policy(
@@ -322,79 +607,140 @@ class Orchestrator:
             if not policy_check.allowed:
                 raise TaskExecutionError(f"Policy violation: {policy_check.reason}")
             
-            # 4. 执行策略决策 - 选择最优执行模式
-            execution_strategy = await self._decide_execution_strategy(
-                parsed_command, risk_assessment
-            )
-            
-            task.execution_log.append({
-                "step": "strategy_selection",
-                "timestamp": datetime.now().isoformat(),
-                "data": {
-                    "mode": execution_strategy["mode"].value,
-                    "confidence": execution_strategy.get("confidence", 0.0)
-                }
-            })
-            logger.info(f"Task {task_id}: Execution mode - {execution_strategy['mode'].value}")
-            
-            # 5. 任务执行 - 调用相应的执行引擎
-            result = await self._execute_strategy(task_id, execution_strategy, request)
+            # 4~5. 策略决策和执行，失败时按指数退避重试
+            # 解析、风险评估、技能匹配和策略检查的结果是确定的，重试时直接复用
+            # 退避时间带随机抖动，避免依赖故障时大量任务同时醒来重试
+            jitter = None
+            for attempt in range(request.retry_count + 1):
+                try:
+                    result = await self._run_strategy(task_id, task, command_view,
+                                                      skill_match, request)
+                    break
+                except Exception as e:
+                    if attempt == request.retry_count:
+                        raise
+                    logger.warning("Task %s: attempt %s failed, retrying: %s", task_id, attempt + 1, e)
+                    if jitter is None:
+                        jitter = random.Random(task_id)  # 按任务ID播种，同一任务的退避序列可复现
+                    await asyncio.sleep(_RETRY_BASE_DELAY * 2 ** attempt * (0.5 + jitter.random()))
             
             # 6. 结果处理和统计更新
             task.result = result
-            task.status = TaskStatus.COMPLETED
+            self._set_status(task, TaskStatus.COMPLETED)
             task.completed_at = datetime.now()
-            task.execution_time = (task.completed_at - start_time).total_seconds()
+            task.execution_time = time.monotonic() - start_time
+            self.stats.completed += 1
+            self.stats.sum_exec_time += task.execution_time
+            self.stats.token_usage += task.tokens_used
             
-            logger.info(f"Task completed successfully: {task_id} in {task.execution_time:.2f}s")
+            logger.info("Task completed successfully: %s in %.2fs", task_id, task.execution_time)
             
         except Exception as e:
-            # 异常处理和错误记录
-            logger.error(f"Task execution failed: {task_id}, error: {str(e)}")
-            task.status = TaskStatus.FAILED
+            # 异常处理和错误记录（重试已耗尽或不可重试）
+            logger.error("Task execution failed: %s, error: %s", task_id, e)
+            self._set_status(task, TaskStatus.FAILED)
             task.error = str(e)
             task.completed_at = datetime.now()
-            task.execution_time = (task.completed_at - start_time).total_seconds()
+            task.execution_time = time.monotonic() - start_time
+            self.stats.failed += 1
+            self.stats.token_usage += task.tokens_used
             
-            # 降级重试机制
-            if request.retry_count > 0:
-                logger.info(f"Attempting fallback execution for task: {task_id}")
-                request.retry_count -= 1
-                await asyncio.sleep(1)  # 短暂延迟避免资源竞争
-                await self._execute_task(task_id, request)
+        await self._archive_task(task)
     
-    async def _decide_execution_strategy(self, parsed_command: Dict[str, Any], 
-                                       risk_assessment: Dict[str, Any]) -> Dict[str, Any]:
+    async def _get_parsed_command(self, goal: str) -> Tuple[Any, ParsedCommandView]:
+        """获取指令解析结果
+        
+        解析器基于规则，相同指令文本的解析结果相同，因此按指令文本缓存。
+        并发请求同一条未缓存的指令时只调用一次解析器，其余调用方等待同一结果。
+        策略决策所需的字段随解析结果一起缓存，每条指令只提取一次。
+        
+        Args:
+            goal: 任务目标（自然语言指令）
+            
+        Returns:
+            (解析后的命令, 策略决策所需的字段)
+        """
+        cached = self._parse_cache.get(goal)
+        if cached is not None:
+            self._parse_cache.move_to_end(goal)
+            return cached
+            
+        inflight = self._parse_inflight.get(goal)
+        if inflight is None:
+            inflight = asyncio.create_task(self._parse_and_cache(goal))
+            self._parse_inflight[goal] = inflight
+        # shield 保证某个调用方被取消时不会中断其他调用方共享的解析
+        return await asyncio.shield(inflight)
+    
+    async def _parse_and_cache(self, goal: str) -> Tuple[Any, ParsedCommandView]:
+        """调用解析器并写入缓存"""
+        try:
+            parsed_command = await self.command_parser.parse_command(goal)
+            entry = (parsed_command, ParsedCommandView.from_parsed(parsed_command))
+            self._parse_cache[goal] = entry
+            if len(self._parse_cache) > _PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+            return entry
+        finally:
+            self._parse_inflight.pop(goal, None)
+    
+    async def _run_strategy(self, task_id: str, task: TaskResult, command: ParsedCommandView,
+                            skill_match: Optional[Dict[str, Any]],
+                            request: TaskRequest) -> Dict[str, Any]:
+        """选择执行策略并执行一次
+        
+        Args:
+            task_id: 任务ID
+            task: 任务结果对象，用于记录执行日志
+            command: 解析结果中策略决策所需的字段
+            skill_match: 技能匹配结果，没有匹配时为 None
+            request: 任务请求
+            
+        Returns:
+            执行结果
+        """
+        # 4. 执行策略决策 - 选择最优执行模式（重放任务沿用原策略）
+        execution_strategy = task.strategy
+        if execution_strategy is None:
+            execution_strategy = self._decide_execution_strategy(command, skill_match)
+            task.strategy = execution_strategy
+        
+        task.execution_log.append(("strategy_selection", time.time(), {
+            "mode": execution_strategy.mode.value,
+            "confidence": execution_strategy.confidence
+        }))
+        logger.info("Task %s: Execution mode - %s", task_id, execution_strategy.mode.value)
+        
+        # 5. 任务执行 - 调用相应的执行引擎
+        return await self._execute_strategy(task_id, execution_strategy, request)
+    
+    def _decide_execution_strategy(self, command: ParsedCommandView, 
+                                   skill_match: Optional[Dict[str, Any]]) -> StrategyDecision:
         """决定执行策略
         
         Args:
-            parsed_command: 解析后的命令
-            risk_assessment: 风险评估结果
+            command: 解析结果中策略决策所需的字段
+            skill_match: 技能匹配结果，没有匹配时为 None
             
         Returns:
             执行策略
         """
-        # 检查是否有高置信度的技能匹配
-        skill_match = await self.skill_library.find_matching_skill(
-              getattr(parsed_command.primary_intent, 'intent', '').value if hasattr(parsed_command, 'primary_intent') and parsed_command.primary_intent and hasattr(getattr(parsed_command.primary_intent, 'intent', ''), 'value') else '', 
-              getattr(parsed_command, 'context', {})
-          )
-        
+        # 有高置信度的技能匹配时使用固定脚本
         if skill_match and skill_match["confidence"] > 0.85:
-            return {
-                "mode": ExecutionMode.SCRIPT,
-                "skill_id": skill_match["skill_id"],
-                "parameters": skill_match["parameters"],
-                "confidence": skill_match["confidence"]
-            }
+            return StrategyDecision(
+                mode=ExecutionMode.SCRIPT,
+                confidence=skill_match["confidence"],
+                skill_id=skill_match["skill_id"],
+                parameters=skill_match["parameters"]
+            )
         else:
-            return {
-                "mode": ExecutionMode.AI_AGENT,
-                "plan": getattr(parsed_command.execution_strategy, 'reasoning', '') if parsed_command.execution_strategy else '',
-                "confidence": 0.7
-            }
+            return StrategyDecision(
+                mode=ExecutionMode.AI_AGENT,
+                confidence=0.7,
+                plan=command.reasoning
+            )
     
-    async def _execute_strategy(self, task_id: str, strategy: Dict[str, Any], 
+    async def _execute_strategy(self, task_id: str, strategy: StrategyDecision, 
                               request: TaskRequest) -> Dict[str, Any]:
         """执行具体策略
         
@@ -406,17 +752,17 @@ class Orchestrator:
         Returns:
             执行结果
         """
-        if strategy["mode"] == ExecutionMode.SCRIPT:
+        if strategy.mode is ExecutionMode.SCRIPT:
             # 使用固定脚本执行
             return await self.skill_library.execute_skill(
-                strategy["skill_id"],
-                strategy["parameters"]
+                strategy.skill_id,
+                strategy.parameters
             )
         else:
             # 使用AI动态规划执行
             return await self._execute_ai_agent_mode(task_id, strategy, request)
     
-    async def _execute_ai_agent_mode(self, task_id: str, strategy: Dict[str, Any], 
+    async def _execute_ai_agent_mode(self, task_id: str, strategy: StrategyDecision, 
                                    request: TaskRequest) -> Dict[str, Any]:
         """AI代理模式执行
         
@@ -427,47 +773,59 @@ class Orchestrator:
             
         Returns:
             执行结果
+            
+        相同目标和站点范围的图执行成功后会被缓存，再次执行时跳过站点探索和图生成；
+        缓存的图执行失败时从缓存中移除。
         """
-        # 1. 站点探索和建模
-        site_model = await self.site_explorer.explore_and_model(
-            request.site_scope
-        )
-        
-        # 2. 生成Action Graph
-        action_graph = await self._generate_action_graph(
-            request.goal, site_model, strategy["plan"]
-        )
+        cache_key = (request.goal, request.site_scope)
+        template = self._graph_cache.get(cache_key)
+        if template is not None:
+            # 执行会修改图和节点的状态，每次使用缓存图的副本
+            action_graph = copy.deepcopy(template)
+            action_graph.id = f"graph_{int(time.time())}"
+        else:
+            # 1. 站点探索和建模
+            site_model = await self.site_explorer.explore_and_model(
+                request.site_scope
+            )
+            
+            # 2. 生成Action Graph
+            action_graph = await self._generate_action_graph(
+                request.goal, site_model, strategy.plan
+            )
+            template = copy.deepcopy(action_graph)
         
         # 3. 执行Action Graph
         result = await self.action_graph_executor.execute_graph(action_graph)
         
-        # 4. 如果执行成功，考虑将其转化为技能包
-        if result["success"]:
+        # 4. 如果执行成功，缓存图并考虑将其转化为技能包
+        if result.success:
+            self._graph_cache[cache_key] = template
+            self._graph_cache.move_to_end(cache_key)
+            if len(self._graph_cache) > _GRAPH_CACHE_SIZE:
+                self._graph_cache.popitem(last=False)
             await self._consider_skill_generation(task_id, action_graph, result)
+        else:
+            self._graph_cache.pop(cache_key, None)
         
-        return result
+        return asdict(result)
     
     async def _generate_action_graph(self, goal: str, site_model: Dict[str, Any], 
-                                   plan: List[str]) -> ActionGraph:
+                                   plan: Optional[str]) -> ActionGraph:
         """生成Action Graph
         
         Args:
             goal: 任务目标
             site_model: 站点模型
-            plan: 执行计划
+            plan: 执行计划（StrategyDecision.plan，指令解析器给出的策略说明）
             
         Returns:
             Action Graph
         """
         # 这里应该调用LLM来生成Action Graph
         # 简化实现，返回一个示例图
-        # 获取首页URL
-        homepage_url = "/"
-        if site_model and hasattr(site_model, 'pages'):
-            for url, page_info in site_model.pages.items():
-                if hasattr(page_info, 'type') and page_info.type.value == 'homepage':
-                    homepage_url = url
-                    break
+        # 获取首页URL（站点模型在添加页面时维护首页索引）
+        homepage_url = getattr(site_model, 'homepage_url', None) or "/"
         
         # 创建ActionGraph对象
         nodes = [
@@ -490,7 +848,7 @@ class Orchestrator:
         )
     
     async def _consider_skill_generation(self, task_id: str, action_graph: ActionGraph, 
-                                       result: Dict[str, Any]):
+                                       result: ExecutionResult):
         """考虑生成技能包
         
         Args:
@@ -499,11 +857,11 @@ class Orchestrator:
             result: 执行结果
         """
         # 如果任务执行成功且具有可复用性，生成技能包
-        if (result["success"] and 
-            result.get("execution_time", 0) < 30 and  # 执行时间合理
-            len(action_graph["nodes"]) > 2):  # 有一定复杂度
+        if (result.success and 
+            result.execution_time < 30 and  # 执行时间合理
+            len(action_graph.nodes) > 2):  # 有一定复杂度
             
-            logger.info(f"Considering skill generation for task: {task_id}")
+            logger.info("Considering skill generation for task: %s", task_id)
             # 这里应该调用技能生成逻辑
             # await self.skill_library.generate_skill_from_graph(action_graph, result)
     
@@ -538,32 +896,10 @@ class Orchestrator:
         - 支持A/B测试和优化决策
         
         性能考虑:
-        - 实时计算，无缓存延迟
-        - O(n)时间复杂度，n为任务数量
-        - 内存占用与任务历史成正比
+        - 由任务完成/最终失败时更新的增量计数器计算，O(1)时间复杂度
+        - 不遍历任务历史，调用开销与任务数量无关
         """
-        completed_tasks = [t for t in self.tasks.values() 
-                          if t.status == TaskStatus.COMPLETED]
-        failed_tasks = [t for t in self.tasks.values() 
-                       if t.status == TaskStatus.FAILED]
-        
-        total_completed = len(completed_tasks)
-        total_failed = len(failed_tasks)
-        total_processed = total_completed + total_failed
-        
-        if total_processed > 0:
-            self.stats["success_rate"] = total_completed / total_processed
-        
-        if completed_tasks:
-            self.stats["avg_execution_time"] = sum(
-                t.execution_time for t in completed_tasks
-            ) / len(completed_tasks)
-        
-        self.stats["token_usage"] = sum(
-            t.tokens_used for t in self.tasks.values()
-        )
-        
-        return self.stats
+        return self.stats.to_dict()
     
     async def initialize_mcp(self) -> bool:
         """初始化 Model Context Protocol (MCP) 管理器
@@ -588,6 +924,7 @@ class Orchestrator:
         - 此方法是异步的，需要await调用
         - 初始化失败不会抛出异常，而是返回False
         - 可以多次调用，已初始化时直接返回True
+        - 并发调用时只有一个调用方执行初始化，其余调用方等待其结果
         - 网络异常时会自动重试连接
         
         使用示例:
@@ -600,6 +937,14 @@ class Orchestrator:
         if self._mcp_initialized:
             return True
             
+        async with self._mcp_init_lock:
+            # 等待锁期间可能已由其他调用方完成初始化
+            if self._mcp_initialized:
+                return True
+            return await self._initialize_mcp_locked()
+    
+    async def _initialize_mcp_locked(self) -> bool:
+        """执行 MCP 初始化（调用方需持有 _mcp_init_lock）"""
         try:
             # 加载服务器配置
             server_configs = self.mcp_config.get_server_configs()
@@ -617,7 +962,7 @@ class Orchestrator:
             return success
             
         except Exception as e:
-            logger.error(f"Error initializing MCP: {e}")
+            logger.error("Error initializing MCP: %s", e)
             return False
     
     async def execute_mcp_command(self, command: str, context: Optional[Dict[str, Any]] = None) -> str:
@@ -630,17 +975,34 @@ class Orchestrator:
         Returns:
             执行结果
         """
-        if not self._mcp_initialized:
-            await self.initialize_mcp()
-            
-        if not self._mcp_initialized:
+        # 已初始化时短路，不再创建 initialize_mcp 协程
+        if not (self._mcp_initialized or await self.initialize_mcp()):
             raise AuraException("MCP not initialized")
             
         try:
             result = await self.mcp_manager.execute_command(command, context)
             return result
         except Exception as e:
-            logger.error(f"MCP command execution failed: {e}")
+            logger.error("MCP command execution failed: %s", e)
+            raise TaskExecutionError(f"MCP execution error: {e}")
+    
+    async def execute_mcp_commands(self, commands: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[str]:
+        """通过 MCP 批量执行多条相互独立的命令
+        
+        Args:
+            commands: (command, context) 列表
+            
+        Returns:
+            按输入顺序排列的执行结果
+        """
+        # 已初始化时短路，不再创建 initialize_mcp 协程
+        if not (self._mcp_initialized or await self.initialize_mcp()):
+            raise AuraException("MCP not initialized")
+            
+        try:
+            return await self.mcp_manager.execute_commands(commands)
+        except Exception as e:
+            logger.error("MCP batch execution failed: %s", e)
             raise TaskExecutionError(f"MCP execution error: {e}")
     
     async def get_mcp_tools(self) -> List[str]:
@@ -649,10 +1011,7 @@ class Orchestrator:
         Returns:
             工具名称列表
         """
-        if not self._mcp_initialized:
-            await self.initialize_mcp()
-            
-        if not self._mcp_initialized:
+        if not (self._mcp_initialized or await self.initialize_mcp()):
             return []
             
         return await self.mcp_manager.get_available_tools()
@@ -684,15 +1043,10 @@ class Orchestrator:
             if not success:
                 return False
                 
-            # 重新初始化 MCP
-            if self._mcp_initialized:
-                await self.mcp_manager.shutdown()
-                self._mcp_initialized = False
-                
-            return await self.initialize_mcp()
+            return await self._reinitialize_mcp()
             
         except Exception as e:
-            logger.error(f"Failed to enable browser extension mode: {e}")
+            logger.error("Failed to enable browser extension mode: %s", e)
             return False
     
     async def disable_browser_extension_mode(self) -> bool:
@@ -707,17 +1061,23 @@ class Orchestrator:
             if not success:
                 return False
                 
-            # 重新初始化 MCP
-            if self._mcp_initialized:
-                await self.mcp_manager.shutdown()
-                self._mcp_initialized = False
-                
-            return await self.initialize_mcp()
+            return await self._reinitialize_mcp()
             
         except Exception as e:
-            logger.error(f"Failed to disable browser extension mode: {e}")
+            logger.error("Failed to disable browser extension mode: %s", e)
             return False
     
+    async def _reinitialize_mcp(self) -> bool:
+        """关闭现有 MCP 连接并按当前配置重新初始化
+        
+        整个过程持有初始化锁，避免与并发的 initialize_mcp 交错执行。
+        """
+        async with self._mcp_init_lock:
+            if self._mcp_initialized:
+                await self.mcp_manager.shutdown()
+                self._mcp_initialized = False
+            return await self._initialize_mcp_locked()
+    
     async def shutdown(self) -> None:
         """优雅关闭 Orchestrator 系统
         
@@ -730,7 +1090,7 @@ class Orchestrator:
         关闭流程:
         1. **日志记录**: 记录关闭开始时间和原因
         2. **MCP清理**: 关闭所有MCP服务器连接
-        3. **任务取消**: 取消所有运行中的任务
+        3. **任务取消**: 取消所有运行中和排队中的任务并停止工作协程
         4. **资源释放**: 清理内存中的任务状态
         5. **状态重置**: 重置初始化标记
         6. **完成确认**: 记录关闭完成状态
@@ -759,12 +1119,26 @@ class Orchestrator:
             await self.mcp_manager.shutdown()
             self._mcp_initialized = False
             
-        # 取消所有运行中的任务
-        running_tasks = [task_id for task_id, task in self.tasks.items() 
-                        if task.status == TaskStatus.RUNNING]
-        
-        for task_id in running_tasks:
-            await self.cancel_task(task_id)
+        # 清空任务队列，避免之后重新启动的工作协程执行关闭前排队的任务
+        queued = []
+        while not self._task_queue.empty():
+            task_id, _ = self._task_queue.get_nowait()
+            self._task_queue.task_done()
+            queued.append(task_id)
+            
+        # 并发取消所有运行中和排队中的任务
+        pending = list(self._tasks_by_status[TaskStatus.RUNNING]) + queued
+        results = await asyncio.gather(*(self.cancel_task(task_id) for task_id in pending),
+                                       return_exceptions=True)
+        for task_id, result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.error("Error cancelling task %s during shutdown: %s", task_id, result)
+            
+        # 停止工作协程
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
             
         logger.info("Orchestrator shutdown complete")
     
@@ -29,15 +29,26 @@
 - 审批流程需要与外部系统集成（如企业IM、邮件等）
 """
 
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import bisect
+import re
+from collections import Counter, OrderedDict
+from operator import attrgetter
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field, fields, replace
 from enum import Enum
 
 from ..utils.logger import get_logger
-from ..utils.exceptions import PolicyViolationError
+from ..utils.exceptions import PolicyViolationError, ValidationError
 
 logger = get_logger(__name__)
 
+# 规则排序键，优先级数值小的规则先匹配
+_rule_priority = attrgetter("priority")
+# 策略检查结果缓存的容量
+_DECISION_CACHE_SIZE = 4096
+# 风险级别 -> 序号，序号越大风险越高
+_RISK_ORDINAL = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
 
 class PolicyAction(Enum):
     """策略动作枚举"""
@@ -56,7 +67,41 @@ class PermissionLevel(Enum):
     ADMIN = "admin"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class _MatchContext:
+    """规则匹配用到的命令和风险评估字段
+
+    每次策略检查只提取一次，字段值均可哈希时同时作为策略检查结果缓存的键。
+    """
+    target_url: Any = ''
+    target_domain: Any = ''
+    action_type: Optional[str] = None
+    element_types: Tuple[Any, ...] = ()
+    is_external: bool = False
+    # 风险级别的序号（见 _RISK_ORDINAL），未知级别为 -1
+    risk_rank: int = 0
+
+
+_Predicate = Callable[[_MatchContext], bool]
+
+
+def _contains(values: frozenset, item: Any) -> bool:
+    """集合成员判断，无法哈希的值视为不在集合中"""
+    try:
+        return item in values
+    except TypeError:
+        return False
+
+
+def _intersects(values: frozenset, items: Tuple[Any, ...]) -> bool:
+    """判断两组值是否有交集，items 中无法哈希的值视为不匹配"""
+    try:
+        return not values.isdisjoint(items)
+    except TypeError:
+        return any(_contains(values, item) for item in items)
+
+
+@dataclass(slots=True)
 class PolicyRule:
     """策略规则数据结构"""
     id: str
@@ -66,11 +111,62 @@ class PolicyRule:
     action: PolicyAction
     priority: int = 100
     enabled: bool = True
+    # 由 url_patterns 编译出的正则，任一模式匹配即匹配
+    _url_regex: Optional[re.Pattern] = field(default=None, init=False, repr=False, compare=False)
+    # 由 conditions 编译出的匹配函数，任一返回 True 即规则匹配
+    _predicates: Tuple[_Predicate, ...] = field(default=(), init=False, repr=False, compare=False)
+    # 规则只有操作类型条件时为其操作类型集合，用于按操作类型索引规则；否则为 None
+    _action_types: Optional[frozenset] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._compile_conditions()
+    
+    def _compile_conditions(self) -> None:
+        """预编译匹配条件，conditions 变更后需重新调用"""
+        patterns = self.conditions.get("url_patterns")
+        if patterns:
+            # 将所有模式合并为一个正则，匹配时只需扫描一次
+            # 只有*是通配符，其余字符按字面匹配；从开头匹配，模式之后可以有任意后缀
+            regex = "|".join(
+                "(?:" + ".*".join(re.escape(part) for part in pattern.split("*")) + ")"
+                for pattern in patterns
+            )
+            self._url_regex = re.compile(regex, re.IGNORECASE)
+        else:
+            self._url_regex = None
+        
+        conditions = self.conditions
+        predicates: List[_Predicate] = []
+        # 集合类条件转换为 frozenset，成员判断为哈希查找；conditions 本身保持不变
+        if self._url_regex is not None:
+            url_regex = self._url_regex
+            predicates.append(lambda ctx: url_regex.match(ctx.target_url) is not None)
+        if "domains" in conditions:
+            domains = frozenset(conditions["domains"])
+            predicates.append(lambda ctx: _contains(domains, ctx.target_domain))
+        action_types = None
+        if "action_types" in conditions:
+            action_types = frozenset(conditions["action_types"])
+            predicates.append(lambda ctx: ctx.action_type is not None and ctx.action_type in action_types)
+        if "element_types" in conditions:
+            element_types = frozenset(conditions["element_types"])
+            predicates.append(lambda ctx: _intersects(element_types, ctx.element_types))
+        if "min_risk_level" in conditions:
+            min_risk = conditions["min_risk_level"]
+            if min_risk not in _RISK_ORDINAL:
+                raise ValidationError(f"Unknown min_risk_level: {min_risk}",
+                                      field="min_risk_level", value=min_risk)
+            min_rank = _RISK_ORDINAL[min_risk]
+            predicates.append(lambda ctx: ctx.risk_rank >= min_rank)
+        if conditions.get("external_domains"):
+            predicates.append(lambda ctx: ctx.is_external)
+        self._predicates = tuple(predicates)
+        self._action_types = action_types if len(predicates) == 1 else None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PolicyCheckResult:
-    """策略检查结果"""
+    """策略检查结果（不可变，缓存的结果在多次检查间共享）"""
     allowed: bool
     action: PolicyAction
     reason: Optional[str] = None
@@ -79,6 +175,18 @@ class PolicyCheckResult:
     mfa_required: bool = False
 
 
+# PolicyRule 可由 update_rule 修改的字段，以及更新时需要整体替换的全部字段
+_RULE_FIELDS = frozenset(f.name for f in fields(PolicyRule) if f.init)
+_RULE_SLOTS = tuple(f.name for f in fields(PolicyRule))
+
+# 没有规则匹配时的默认拒绝结果，结果不可变，所有检查共用同一实例
+_DEFAULT_DENY = PolicyCheckResult(
+    allowed=False,
+    action=PolicyAction.DENY,
+    reason="No matching policy rule found, default deny"
+)
+
+
 class PolicyEngine:
     """策略引擎
     
@@ -105,8 +213,22 @@ class PolicyEngine:
         - 用户权限采用字典存储，支持快速查找
         - 默认规则确保系统启动后即具备基本安全保护
         """
-        # 策略规则存储 - 按优先级排序执行
+        # 策略规则存储 - 插入时即按优先级排序，优先级相同的按添加顺序
         self.rules: List[PolicyRule] = []
+        # 规则ID -> 规则，用于去重和按ID查找
+        self._rules_by_id: Dict[str, PolicyRule] = {}
+        # 启用的规则快照，规则变更时重建
+        self._enabled_rules: Tuple[PolicyRule, ...] = ()
+        # 操作类型 -> 需要检查的启用规则（按优先级排序）；只有操作类型条件且不包含
+        # 该操作类型的规则不可能匹配，不放入对应列表
+        self._rules_by_action_type: Dict[Optional[str], Tuple[PolicyRule, ...]] = {}
+        # 操作类型不在索引中时需要检查的规则，即不只按操作类型匹配的规则
+        self._unindexed_rules: Tuple[PolicyRule, ...] = ()
+        # 按策略动作统计的规则数，规则变更时重建，供 get_policy_stats 直接读取
+        self._action_counts: Counter = Counter()
+        # 策略检查结果缓存（LRU），键为规则匹配所用的全部输入，规则变更时清空
+        # 值为 (匹配的规则, 检查结果)，命中缓存时同样记录匹配的规则
+        self._decision_cache: "OrderedDict[_MatchContext, Tuple[Optional[PolicyRule], PolicyCheckResult]]" = OrderedDict()
         
         # 用户权限管理 - 用户ID到权限级别的映射
         self.user_permissions: Dict[str, List[PermissionLevel]] = {}
@@ -164,8 +286,27 @@ class PolicyEngine:
             )
         ]
         
-        self.rules.extend(default_rules)
-        logger.info(f"Loaded {len(default_rules)} default policy rules")
+        for rule in default_rules:
+            bisect.insort(self.rules, rule, key=_rule_priority)
+            self._rules_by_id[rule.id] = rule
+        self._refresh_rules()
+        logger.info("Loaded %d default policy rules", len(default_rules))
+    
+    def _refresh_rules(self) -> None:
+        """规则变更后重建启用规则快照和统计"""
+        self._enabled_rules = tuple(rule for rule in self.rules if rule.enabled)
+        # 没有任何条件的规则永远不会匹配，不参与检查
+        candidates = [rule for rule in self._enabled_rules if rule._predicates]
+        self._unindexed_rules = tuple(rule for rule in candidates if rule._action_types is None)
+        indexed_types = {action_type for rule in candidates if rule._action_types is not None
+                         for action_type in rule._action_types}
+        self._rules_by_action_type = {
+            action_type: tuple(rule for rule in candidates
+                               if rule._action_types is None or action_type in rule._action_types)
+            for action_type in indexed_types
+        }
+        self._action_counts = Counter(rule.action for rule in self.rules)
+        self._decision_cache.clear()
     
     async def check_policy(self, parsed_command: Dict[str, Any], 
                           risk_assessment: Dict[str, Any]) -> PolicyCheckResult:
@@ -194,148 +335,137 @@ class PolicyEngine:
                 - mfa_required: 是否需要多因子认证
         
         执行流程：
-        1. 按优先级排序所有启用的策略规则
+        1. 按优先级顺序遍历所有启用的策略规则
         2. 逐一检查规则条件是否匹配当前命令和风险评估
         3. 返回第一个匹配规则的策略动作
         4. 如无匹配规则，默认拒绝执行
         
         性能考虑：
         - 规则按优先级预排序，避免每次检查时排序
+        - 相同输入的检查结果按LRU缓存，命中时不再遍历规则
         - 短路评估，找到匹配规则即返回
-        - 异步设计，支持复杂条件的异步验证
+        - 规则匹配是纯计算，同步执行；check_policy 保持异步接口，便于接入异步审批等流程
         """
-        logger.debug(f"Checking policy for command: {getattr(parsed_command.primary_intent, 'intent', 'unknown').value if hasattr(parsed_command, 'primary_intent') and parsed_command.primary_intent and hasattr(getattr(parsed_command.primary_intent, 'intent', ''), 'value') else 'unknown'}")
-        
-        # 按优先级排序规则
-        sorted_rules = sorted(self.rules, key=lambda r: r.priority)
+        ctx = self._match_context(parsed_command, risk_assessment)
+        logger.debug("Checking policy for command: %s", ctx.action_type or "unknown")
+        
+        try:
+            decision = self._decision_cache.get(ctx)
+        except TypeError:
+            # 上下文中包含无法哈希的值（如列表），不缓存
+            decision = self._evaluate_rules(ctx)
+        else:
+            if decision is not None:
+                self._decision_cache.move_to_end(ctx)
+            else:
+                decision = self._evaluate_rules(ctx)
+                self._decision_cache[ctx] = decision
+                if len(self._decision_cache) > _DECISION_CACHE_SIZE:
+                    self._decision_cache.popitem(last=False)
+        
+        rule, result = decision
+        if rule is not None:
+            # 审计日志：无论是否命中缓存都记录匹配的规则
+            logger.info("Policy rule matched: %s", rule.name)
+        return result
+    
+    @staticmethod
+    def _match_context(parsed_command: Dict[str, Any], risk_assessment: Dict[str, Any]) -> _MatchContext:
+        """提取规则匹配用到的字段
         
-        for rule in sorted_rules:
-            if not rule.enabled:
-                continue
-            
-            if await self._match_rule(rule, parsed_command, risk_assessment):
-                logger.info(f"Policy rule matched: {rule.name}")
-                
+        parsed_command 可以是 ParsedCommand 对象或包含 action_type 的字典，
+        risk_assessment 可以是 RiskAssessment 对象或包含 level 的字典。
+        """
+        context = getattr(parsed_command, 'context', {})
+        primary_intent = getattr(parsed_command, 'primary_intent', None)
+        if primary_intent:
+            action_type = primary_intent.intent.value.lower()
+        elif isinstance(parsed_command, dict):
+            action_type = parsed_command.get("action_type", "")
+            action_type = action_type.lower() if isinstance(action_type, str) else ""
+        else:
+            action_type = None
+        if isinstance(risk_assessment, dict):
+            risk_level = risk_assessment.get("level", "low")
+        else:
+            risk_level = getattr(risk_assessment, "level", "low")
+        # RiskLevel 枚举统一转换为字符串
+        risk_level = getattr(risk_level, "value", risk_level)
+        return _MatchContext(
+            target_url=context.get('target_url', ''),
+            target_domain=context.get('target_domain', ''),
+            action_type=action_type,
+            element_types=tuple(context.get('element_types', ())),
+            is_external=bool(context.get('is_external_domain', False)),
+            risk_rank=_RISK_ORDINAL.get(risk_level, -1)
+        )
+    
+    def _evaluate_rules(self, ctx: _MatchContext) -> Tuple[Optional[PolicyRule], PolicyCheckResult]:
+        """按优先级遍历启用的规则，返回第一个匹配的规则及其决策（无匹配时规则为 None）"""
+        # 只检查可能匹配当前操作类型的启用规则，规则已按优先级排序
+        rules = self._rules_by_action_type.get(ctx.action_type, self._unindexed_rules)
+        for rule in rules:
+            if self._match_rule(rule, ctx):
                 if rule.action == PolicyAction.DENY:
-                    return PolicyCheckResult(
+                    return rule, PolicyCheckResult(
                         allowed=False,
                         action=rule.action,
                         reason=f"Denied by policy rule: {rule.name}"
                     )
                 elif rule.action == PolicyAction.REQUIRE_APPROVAL:
-                    return PolicyCheckResult(
+                    return rule, PolicyCheckResult(
                         allowed=True,
                         action=rule.action,
                         reason=f"Approval required by policy rule: {rule.name}",
                         approval_required=True
                     )
                 elif rule.action == PolicyAction.REQUIRE_MFA:
-                    return PolicyCheckResult(
+                    return rule, PolicyCheckResult(
                         allowed=True,
                         action=rule.action,
                         reason=f"MFA required by policy rule: {rule.name}",
                         mfa_required=True
                     )
                 elif rule.action == PolicyAction.ALLOW:
-                    return PolicyCheckResult(
+                    return rule, PolicyCheckResult(
                         allowed=True,
                         action=rule.action,
                         reason=f"Allowed by policy rule: {rule.name}"
                     )
         
         # 默认拒绝
-        return PolicyCheckResult(
-            allowed=False,
-            action=PolicyAction.DENY,
-            reason="No matching policy rule found, default deny"
-        )
+        return None, _DEFAULT_DENY
     
-    async def _match_rule(self, rule: PolicyRule, parsed_command: Dict[str, Any], 
-                         risk_assessment: Dict[str, Any]) -> bool:
+    def _match_rule(self, rule: PolicyRule, ctx: _MatchContext) -> bool:
         """检查规则是否匹配
         
         Args:
             rule: 策略规则
-            parsed_command: 解析后的命令
-            risk_assessment: 风险评估结果
+            ctx: 本次检查的匹配上下文
             
         Returns:
-            是否匹配
+            是否匹配（任一条件满足即匹配）
         """
-        conditions = rule.conditions
-        
-        # 检查URL模式
-        if "url_patterns" in conditions:
-            target_url = getattr(parsed_command, 'context', {}).get('target_url', '')
-            for pattern in conditions["url_patterns"]:
-                if self._match_pattern(pattern, target_url):
-                    return True
-        
-        # 检查域名
-        if "domains" in conditions:
-            target_domain = getattr(parsed_command, 'context', {}).get('target_domain', '')
-            if target_domain in conditions["domains"]:
-                return True
-        
-        # 检查操作类型
-        if "action_types" in conditions:
-            # 处理ParsedCommand对象
-            if hasattr(parsed_command, 'primary_intent') and parsed_command.primary_intent:
-                intent_type = parsed_command.primary_intent.intent.value.lower()
-                if intent_type in conditions["action_types"]:
-                    return True
-            # 处理字典格式
-            elif isinstance(parsed_command, dict):
-                action_type = parsed_command.get("action_type", "").lower() if isinstance(parsed_command.get("action_type", ""), str) else ""
-                if action_type in conditions["action_types"]:
-                    return True
-        
-        # 检查元素类型
-        if "element_types" in conditions:
-            element_types = getattr(parsed_command, 'context', {}).get('element_types', [])
-            for elem_type in element_types:
-                if elem_type in conditions["element_types"]:
-                    return True
-        
-        # 检查风险级别
-        if "min_risk_level" in conditions:
-            risk_level = risk_assessment.get("level", "low")
-            min_risk = conditions["min_risk_level"]
-            risk_levels = ["low", "medium", "high", "critical"]
-            if risk_levels.index(risk_level) >= risk_levels.index(min_risk):
-                return True
-        
-        # 检查外部域名
-        if "external_domains" in conditions and conditions["external_domains"]:
-            is_external = getattr(parsed_command, 'context', {}).get('is_external_domain', False)
-            if is_external:
+        for predicate in rule._predicates:
+            if predicate(ctx):
                 return True
-        
         return False
     
-    def _match_pattern(self, pattern: str, text: str) -> bool:
-        """匹配模式
-        
-        Args:
-            pattern: 模式字符串（支持*通配符）
-            text: 待匹配文本
-            
-        Returns:
-            是否匹配
-        """
-        import re
-        # 将*转换为正则表达式
-        regex_pattern = pattern.replace("*", ".*")
-        return bool(re.match(regex_pattern, text, re.IGNORECASE))
-    
     def add_rule(self, rule: PolicyRule):
         """添加策略规则
         
         Args:
             rule: 策略规则
+            
+        Raises:
+            ValidationError: 已存在相同ID的规则
         """
-        self.rules.append(rule)
-        logger.info(f"Added policy rule: {rule.name}")
+        if rule.id in self._rules_by_id:
+            raise ValidationError(f"Policy rule already exists: {rule.id}", field="id", value=rule.id)
+        bisect.insort(self.rules, rule, key=_rule_priority)
+        self._rules_by_id[rule.id] = rule
+        self._refresh_rules()
+        logger.info("Added policy rule: %s", rule.name)
     
     def remove_rule(self, rule_id: str) -> bool:
         """移除策略规则
@@ -346,31 +476,53 @@ class PolicyEngine:
         Returns:
             是否成功移除
         """
-        for i, rule in enumerate(self.rules):
-            if rule.id == rule_id:
-                del self.rules[i]
-                logger.info(f"Removed policy rule: {rule_id}")
-                return True
-        return False
+        rule = self._rules_by_id.pop(rule_id, None)
+        if rule is None:
+            return False
+        self.rules.remove(rule)
+        self._refresh_rules()
+        logger.info("Removed policy rule: %s", rule_id)
+        return True
     
     def update_rule(self, rule_id: str, updates: Dict[str, Any]) -> bool:
         """更新策略规则
         
+        规则的修改需要通过此方法进行，以便同步排序和启用规则快照。
+        
         Args:
             rule_id: 规则ID
             updates: 更新内容
             
         Returns:
             是否成功更新
+            
+        Raises:
+            ValidationError: 试图修改规则ID、包含未知字段或更新后的条件无效，
+                此时规则保持不变
         """
-        for rule in self.rules:
-            if rule.id == rule_id:
-                for key, value in updates.items():
-                    if hasattr(rule, key):
-                        setattr(rule, key, value)
-                logger.info(f"Updated policy rule: {rule_id}")
-                return True
-        return False
+        rule = self._rules_by_id.get(rule_id)
+        if rule is None:
+            return False
+        # 规则ID是索引的键，不允许修改；编译结果等内部字段也不接受外部更新
+        new_id = updates.get("id", rule_id)
+        if new_id != rule_id:
+            raise ValidationError(f"Policy rule id cannot be changed: {rule_id}",
+                                  field="id", value=new_id)
+        unknown = sorted(updates.keys() - _RULE_FIELDS)
+        if unknown:
+            raise ValidationError(f"Unknown policy rule fields: {', '.join(unknown)}",
+                                  field=unknown[0], value=updates[unknown[0]])
+        changes = {key: value for key, value in updates.items() if key != "id"}
+        # 先在副本上编译校验，失败时原规则不受影响
+        updated = replace(rule, **changes)
+        for name in _RULE_SLOTS:
+            setattr(rule, name, getattr(updated, name))
+        if "priority" in changes:
+            # sort 是稳定的，优先级相同的规则保持原有顺序
+            self.rules.sort(key=_rule_priority)
+        self._refresh_rules()
+        logger.info("Updated policy rule: %s", rule_id)
+        return True
     
     def get_rules(self) -> List[PolicyRule]:
         """获取所有策略规则
@@ -479,10 +631,7 @@ class PolicyEngine:
         """
         return {
             "total_rules": len(self.rules),
-            "enabled_rules": len([r for r in self.rules if r.enabled]),
-            "rule_types": {
-                action.value: len([r for r in self.rules if r.action == action])
-                for action in PolicyAction
-            },
+            "enabled_rules": len(self._enabled_rules),
+            "rule_types": {action.value: self._action_counts[action] for action in PolicyAction},
             "total_users": len(self.user_permissions)
         }
\ No newline at end of file
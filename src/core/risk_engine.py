@@ -39,6 +39,7 @@
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
+import logging
 import re
 from urllib.parse import urlparse
 
@@ -290,17 +291,19 @@ class RiskEngine:
         5. 综合风险分数计算和级别映射
         6. 生成针对性的安全建议
         
-        性能优化：
-        - 异步并发执行各维度评估
-        - 短路评估，高风险因子优先
-        - 缓存常用评估结果
+        性能考虑：
+        - 各维度评估均为内存中的规则匹配，依次执行即可；并发调度只会增加事件循环开销，
+          与技能匹配等外部调用的并发由 Orchestrator 负责
+        - 调试日志仅在启用 DEBUG 级别时才提取意图名称
         
         扩展性：
         - 支持插件式风险评估模块
         - 支持机器学习模型集成
         - 支持外部威胁情报接入
         """
-        logger.debug(f"Assessing risk for command: {getattr(parsed_command.primary_intent, 'intent', 'unknown').value if hasattr(parsed_command, 'primary_intent') and parsed_command.primary_intent and hasattr(getattr(parsed_command.primary_intent, 'intent', ''), 'value') else 'unknown'}")
+        if logger.isEnabledFor(logging.DEBUG):
+            intent = getattr(getattr(parsed_command, 'primary_intent', None), 'intent', None)
+            logger.debug("Assessing risk for command: %s", getattr(intent, 'value', 'unknown'))
         
         risk_score = 0.0
         triggered_factors = []
@@ -0,0 +1,148 @@
+"""任务结果外部存储 - Task Store
+
+Orchestrator 在内存中只保留活跃任务和最近访问的任务，已结束的任务可以写入外部存储，
+从内存中淘汰后仍可通过 get_task_status 查询。
+
+存储后端只需实现 TaskStore 协议中的两个异步方法，例如：
+- RedisTaskStore: 基于 Redis 的实现，按 TTL 自动过期
+- FileTaskStore: 基于本地目录的实现，适合单机部署
+
+任务以 JSON 保存，读取时只重建 TaskResult 及其字段类型，不会执行存储中的任何代码；
+结果和执行日志中无法用 JSON 表示的值保存为字符串。
+
+使用示例：
+    from redis.asyncio import Redis
+
+    store = RedisTaskStore(Redis.from_url("redis://localhost:6379/0"), ttl=86400)
+    orchestrator = Orchestrator(task_store=store)
+"""
+
+import asyncio
+import json
+from collections import deque
+from dataclasses import asdict
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Optional, Protocol
+
+from .orchestrator import ExecutionMode, RiskLevel, StrategyDecision, TaskRequest, TaskResult, TaskStatus
+
+
+def _json_default(value: Any) -> Any:
+    """json.dumps 的 default：枚举取值，时间转 ISO 格式，其余无法表示的值转为字符串"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (deque, set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def _dump_task(task: TaskResult) -> bytes:
+    """将任务序列化为 JSON"""
+    return json.dumps(asdict(task), default=_json_default, ensure_ascii=False).encode()
+
+
+def _load_task(data: bytes) -> TaskResult:
+    """从 JSON 重建任务"""
+    raw: Dict[str, Any] = json.loads(data)
+    request = raw.get("request")
+    strategy = raw.get("strategy")
+    completed_at = raw.get("completed_at")
+    task = TaskResult(
+        task_id=raw["task_id"],
+        status=TaskStatus(raw["status"]),
+        result=raw.get("result"),
+        error=raw.get("error"),
+        screenshots=raw.get("screenshots", []),
+        tokens_used=raw.get("tokens_used", 0),
+        execution_time=raw.get("execution_time", 0.0),
+        created_at=datetime.fromisoformat(raw["created_at"]),
+        completed_at=datetime.fromisoformat(completed_at) if completed_at else None,
+        request=TaskRequest(**{**request, "risk_level": RiskLevel(request["risk_level"])}) if request else None,
+        strategy=StrategyDecision(**{**strategy, "mode": ExecutionMode(strategy["mode"])}) if strategy else None,
+    )
+    # 执行日志沿用 TaskResult 默认的有界队列
+    task.execution_log.extend(tuple(entry) for entry in raw.get("execution_log", ()))
+    return task
+
+
+class TaskStore(Protocol):
+    """已结束任务的外部存储接口"""
+
+    async def save(self, task: TaskResult) -> None:
+        """保存已结束的任务"""
+        ...
+
+    async def load(self, task_id: str) -> Optional[TaskResult]:
+        """读取任务，不存在或已过期时返回 None"""
+        ...
+
+
+class RedisTaskStore:
+    """基于 Redis 的任务存储
+
+    每个任务以 JSON 格式的 TaskResult 保存在独立的键中，并设置过期时间。
+    读取时只解析 JSON，能写入该 Redis 的一方也无法借此在编排器中执行代码。
+    客户端由调用方创建和管理（如 redis.asyncio.Redis），本类不负责连接的生命周期。
+
+    Args:
+        client: 异步 Redis 客户端，需支持 set(key, value, ex=...) 和 get(key)
+        ttl: 任务保存时间（秒）
+        key_prefix: 键前缀
+    """
+
+    def __init__(self, client: Any, ttl: int = 7 * 24 * 3600, key_prefix: str = "aura:task:"):
+        self._client = client
+        self._ttl = ttl
+        self._key_prefix = key_prefix
+
+    def _key(self, task_id: str) -> str:
+        return f"{self._key_prefix}{task_id}"
+
+    async def save(self, task: TaskResult) -> None:
+        """保存任务并设置过期时间"""
+        await self._client.set(self._key(task.task_id), _dump_task(task), ex=self._ttl)
+
+    async def load(self, task_id: str) -> Optional[TaskResult]:
+        """读取任务"""
+        data = await self._client.get(self._key(task_id))
+        if data is None:
+            return None
+        return _load_task(data)
+
+
+class FileTaskStore:
+    """基于本地目录的任务存储
+
+    每个任务以 JSON 格式保存为目录下的一个文件，文件读写在线程池中执行，不阻塞事件循环。
+    不会自动清理，过期文件需要由部署方定期删除。
+
+    Args:
+        directory: 存储目录，不存在时自动创建
+    """
+
+    def __init__(self, directory: str = "./data/tasks"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, task_id: str) -> Path:
+        return self.directory / f"{task_id}.json"
+
+    async def save(self, task: TaskResult) -> None:
+        """保存任务"""
+        await asyncio.to_thread(self._path(task.task_id).write_bytes, _dump_task(task))
+
+    async def load(self, task_id: str) -> Optional[TaskResult]:
+        """读取任务"""
+        if Path(task_id).name != task_id:
+            # 任务ID来自外部请求，拒绝包含路径分隔符的ID
+            return None
+        path = self._path(task_id)
+        try:
+            data = await asyncio.to_thread(path.read_bytes)
+        except FileNotFoundError:
+            return None
+        return _load_task(data)
@@ -9,9 +9,11 @@
 - 导航图的构建和优化
 """
 
+import asyncio
 import json
 import time
 import hashlib
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Optional, Any, Set, Tuple
@@ -105,6 +107,19 @@ class SiteModel:
     created_at: datetime = field(default_factory=datetime.now)
     last_updated: datetime = field(default_factory=datetime.now)
     ttl: timedelta = field(default_factory=lambda: timedelta(days=7))  # 生存时间
+    homepage_url: Optional[str] = None  # 首页URL索引，由 add_page 维护
+    
+    def add_page(self, url: str, page: PageInfo) -> None:
+        """添加或更新页面，同时维护首页URL索引"""
+        self.pages[url] = page
+        if page.type == PageType.HOMEPAGE:
+            if self.homepage_url is None:
+                self.homepage_url = url
+        elif url == self.homepage_url:
+            # 原首页被更新为其他类型，重新查找
+            self.homepage_url = next(
+                (u for u, p in self.pages.items() if p.type == PageType.HOMEPAGE), None
+            )
 
 
 @dataclass
@@ -262,10 +277,10 @@ class SiteExplorer:
     async def _explore_breadth_first(self, task: ExplorationTask, model: SiteModel, page_context):
         """广度优先探索"""
         visited_urls = set()
-        url_queue = [(task.start_url, 0)]  # (url, depth)
+        url_queue = deque([(task.start_url, 0)])  # (url, depth)
         
         while url_queue and len(visited_urls) < task.max_pages:
-            current_url, depth = url_queue.pop(0)
+            current_url, depth = url_queue.popleft()
             
             if depth > task.max_depth or current_url in visited_urls:
                 continue
@@ -276,7 +291,7 @@ class SiteExplorer:
             # 访问页面
             page_info = await self._explore_page(current_url, page_context)
             if page_info:
-                model.pages[current_url] = page_info
+                model.add_page(current_url, page_info)
                 visited_urls.add(current_url)
                 task.explored_pages += 1
                 
@@ -303,7 +318,7 @@ class SiteExplorer:
             # 访问页面
             page_info = await self._explore_page(url, page_context)
             if page_info:
-                model.pages[url] = page_info
+                model.add_page(url, page_info)
                 visited_urls.add(url)
                 task.explored_pages += 1
                 task.progress = min(task.explored_pages / task.max_pages, 1.0)
@@ -320,7 +335,7 @@ class SiteExplorer:
         # 实现交互式探索逻辑
         page_info = await self._explore_page(task.start_url, page_context)
         if page_info:
-            model.pages[task.start_url] = page_info
+            model.add_page(task.start_url, page_info)
             
             # 尝试交互操作
             await self._perform_interactions(page_info, page_context)
@@ -330,7 +345,7 @@ class SiteExplorer:
         # 根据目标元素类型进行有针对性的探索
         page_info = await self._explore_page(task.start_url, page_context)
         if page_info:
-            model.pages[task.start_url] = page_info
+            model.add_page(task.start_url, page_info)
             
             # 查找目标元素
             for element_type in task.target_elements:
@@ -338,6 +353,9 @@ class SiteExplorer:
     
     async def _explore_page(self, url: str, page_context) -> Optional[PageInfo]:
         """探索单个页面"""
+        # 每个页面让出一次事件循环：没有浏览器上下文时页面信息在本地生成，
+        # 整个探索过程不会挂起，会阻塞同一事件循环上的其他任务
+        await asyncio.sleep(0)
         try:
             if not page_context:
                 # 模拟页面探索（实际需要Playwright MCP）
@@ -663,7 +681,7 @@ class SiteExplorer:
                     description=page_data.get("description"),
                     elements=elements
                 )
-                model.pages[url] = page
+                model.add_page(url, page)
             
             # 重建导航图
             for edge_data in model_data["navigation_graph"]:
@@ -686,8 +704,6 @@ class SiteExplorer:
 
 # 示例使用
 if __name__ == "__main__":
-    import asyncio
-    
     async def main():
         explorer = SiteExplorer()
         
@@ -798,13 +814,13 @@ if __name__ == "__main__":
             
             # 添加页面信息到模型
             if page_info:
-                model.pages[page_info["url"]] = PageInfo(
+                model.add_page(page_info["url"], PageInfo(
                     url=page_info["url"],
                     title=page_info.get("title", ""),
                     type=self._classify_page_type(page_info["url"], page_info.get("title", "")),
                     elements=page_info.get("elements", {}),
                     metadata=page_info.get("metadata", {})
-                )
+                ))
                 
                 model.last_updated = datetime.now()
             
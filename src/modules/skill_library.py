@@ -14,8 +14,10 @@ import json
 import hashlib
 import os
 import shutil
+import time
 import zipfile
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Optional, Any, Callable, Union
@@ -26,6 +28,9 @@ import semver
 # MCP 相关导入
 from ..core.mcp_manager import MCPManager
 
+# 意图 -> 技能匹配结果缓存的容量
+_MATCH_CACHE_SIZE = 1024
+
 
 class SkillStatus(Enum):
     """技能状态"""
@@ -214,6 +219,8 @@ class SkillLibrary:
         self.domain_index: Dict[str, List[str]] = {}  # domain -> skill_ids
         self.category_index: Dict[str, List[str]] = {}  # category -> skill_ids
         self.tag_index: Dict[str, List[str]] = {}  # tag -> skill_ids
+        # 意图匹配缓存 {intent: skill_id | None}，按LRU淘汰，注册技能时清空
+        self._match_cache: "OrderedDict[str, Optional[str]]" = OrderedDict()
         
         # 加载已有技能
         self._load_existing_skills()
@@ -320,6 +327,7 @@ class SkillLibrary:
             
             # 更新索引
             self._update_indexes(manifest)
+            self._match_cache.clear()
             
             print(f"Successfully registered skill: {manifest.id} v{manifest.version}")
             return True
@@ -440,19 +448,32 @@ class SkillLibrary:
             
         intent_lower = intent.lower()
         
-        # 查找所有技能
+        # 匹配结果只取决于意图和已注册的技能，命中缓存时无需遍历技能表
+        if intent_lower in self._match_cache:
+            skill_id = self._match_cache[intent_lower]
+            self._match_cache.move_to_end(intent_lower)
+        else:
+            skill_id = self._match_skill_id(intent_lower)
+            self._match_cache[intent_lower] = skill_id
+            if len(self._match_cache) > _MATCH_CACHE_SIZE:
+                self._match_cache.popitem(last=False)
+        
+        if skill_id is None:
+            return None
+        return {
+            "skill_id": skill_id,
+            "confidence": 0.9,  # 简单的置信度
+            "parameters": parameters
+        }
+    
+    def _match_skill_id(self, intent_lower: str) -> Optional[str]:
+        """遍历技能表，返回第一个名称、描述或标签包含意图的技能ID"""
         for skill_id, skill in self.skills.items():
             # 检查技能名称和描述是否匹配
             if (intent_lower in skill.name.lower() or 
                 intent_lower in skill.description.lower() or
                 any(intent_lower in tag.lower() for tag in skill.tags)):
-                
-                return {
-                    "skill_id": skill_id,
-                    "confidence": 0.9,  # 简单的置信度
-                    "parameters": parameters
-                }
-        
+                return skill_id
         return None
     
     async def execute_skill(self, skill_id: str, inputs: Dict[str, Any], 
@@ -486,7 +507,7 @@ class SkillLibrary:
                 error_message="Insufficient permissions"
             )
         
-        start_time = datetime.now()
+        start_time = time.monotonic()  # 单调时钟计时，不受系统时间调整影响
         
         try:
             # 执行技能脚本
@@ -499,7 +520,7 @@ class SkillLibrary:
                 outputs = await self._execute_skill_script(skill, inputs, context)
                 result = ExecutionResult.SUCCESS
             
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.monotonic() - start_time
             
             execution_result = SkillExecutionResult(
                 execution_id=context.execution_id,
@@ -516,7 +537,7 @@ class SkillLibrary:
             return execution_result
             
         except Exception as e:
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.monotonic() - start_time
             
             return SkillExecutionResult(
                 execution_id=context.execution_id,
@@ -699,7 +720,7 @@ const executionContext = {json.dumps(context)};
     async def execute_skill_via_mcp(self, skill_id: str, inputs: Dict[str, Any], 
                                    browser_context: Optional[Dict[str, Any]] = None) -> SkillExecutionResult:
         """通过 MCP 执行技能（简化接口）"""
-        execution_id = str(uuid.uuid4())
+        execution_id = uuid.uuid4().hex
         
         context = SkillExecutionContext(
             skill_id=skill_id,
@@ -7,6 +7,7 @@ from pathlib import Path
 from unittest.mock import Mock, AsyncMock
 
 from src.core.orchestrator import Orchestrator
+from src.core.policy_engine import PolicyEngine
 from src.core.action_graph import ActionGraphEngine
 from src.modules.site_explorer import SiteExplorer
 from src.modules.skill_library import SkillLibrary, SkillManifest, SkillInput, SkillOutput, SkillAssertion
@@ -130,6 +131,12 @@ def orchestrator():
     return Orchestrator()
 
 
+@pytest.fixture
+def policy_engine():
+    """创建策略引擎实例（包含默认规则）"""
+    return PolicyEngine()
+
+
 @pytest.fixture
 def sample_action_graph():
     """示例Action Graph"""
@@ -7,12 +7,13 @@ and auto-reconnection mechanisms implemented in MCPManager.
 """
 
 import asyncio
+import dataclasses
 import pytest
 import time
 from unittest.mock import Mock, patch, AsyncMock
-from src.core.mcp_manager import MCPManager
+from src.core.mcp_manager import MCPManager, ServerRuntimeState
 from src.core.mcp_error_handler import (
-    MCPErrorHandler, ConnectionState, ErrorType, 
+    MCPErrorHandler, CircuitBreaker, ConnectionPool, ConnectionState, ErrorMetrics, ErrorType, 
     CircuitBreakerConfig, RetryConfig, ExponentialBackoff
 )
 from src.config.mcp_types import MCPServerConfig, MCPServerType
@@ -77,12 +78,12 @@ class TestMCPErrorHandling:
         assert states.get(server_name, "disconnected") == "disconnected"
         
         # Simulate connection
-        mcp_manager._connection_states[server_name] = ConnectionState.CONNECTED
+        mcp_manager._set_state(server_name, ConnectionState.CONNECTED)
         states = mcp_manager.get_connection_states()
         assert states[server_name] == "connected"
         
         # Simulate disconnection
-        mcp_manager._connection_states[server_name] = ConnectionState.RECONNECTING
+        mcp_manager._set_state(server_name, ConnectionState.RECONNECTING)
         states = mcp_manager.get_connection_states()
         assert states[server_name] == "reconnecting"
     
@@ -132,6 +133,67 @@ class TestMCPErrorHandling:
         with patch('time.time', return_value=time.time() + 10):
             assert circuit_breaker.can_attempt()
     
+    async def test_recent_error_rate_uses_sliding_window(self):
+        """Test that the recent error rate only counts recent operations"""
+        metrics = ErrorMetrics()
+        metrics.record_error(ErrorType.NETWORK_ERROR)
+        metrics.record_success()
+        assert metrics.recent_error_rate() == 0.5
+        
+        with patch('src.core.mcp_error_handler.time.monotonic', return_value=time.monotonic() + 600):
+            metrics.record_success()
+            assert metrics.recent_error_rate() == 0.0
+        assert metrics.total_errors == 1
+        
+        # Failures pushed out of a full window no longer count
+        for _ in range(metrics.recent_results.maxlen):
+            metrics.record_error(ErrorType.NETWORK_ERROR)
+        for _ in range(metrics.recent_results.maxlen // 2):
+            metrics.record_success()
+        assert metrics.recent_error_rate() == 0.5
+    
+    async def test_error_rate_covers_lifetime(self):
+        """Test that calculate_error_rate keeps counting every operation"""
+        metrics = ErrorMetrics()
+        metrics.record_error(ErrorType.NETWORK_ERROR)
+        with patch('src.core.mcp_error_handler.time.monotonic', return_value=time.monotonic() + 600):
+            for _ in range(3):
+                metrics.record_success()
+            assert metrics.recent_error_rate() == 0.0
+        assert metrics.calculate_error_rate() == 0.25
+    
+    async def test_health_check_skips_open_circuit(self, mcp_manager):
+        """Test that servers with an open circuit breaker are not probed"""
+        mcp_manager.add_server(MCPServerConfig(
+            name="server1",
+            server_type=MCPServerType.PLAYWRIGHT,
+            command="npx",
+            args=["@playwright/mcp@latest"],
+            enabled=True
+        ))
+        mcp_manager._multi_mcp = AsyncMock()
+        pool = mcp_manager._error_handler.connection_pool
+        pool.add_connection("server1", mcp_manager._multi_mcp)
+        for _ in range(pool.circuit_breakers["server1"].config.failure_threshold):
+            pool.record_operation_result("server1", False, ErrorType.NETWORK_ERROR)
+        
+        await mcp_manager._perform_health_check()
+        
+        mcp_manager._multi_mcp.list_tools.assert_not_awaited()
+        assert mcp_manager._connection_states["server1"] == ConnectionState.CIRCUIT_OPEN
+        assert mcp_manager._health_check_failures.get("server1", 0) == 0
+    
+    async def test_circuit_breaker_recovery_uses_monotonic_clock(self):
+        """Test that circuit recovery is unaffected by wall-clock jumps"""
+        breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=1, recovery_timeout=5))
+        breaker.record_failure()
+        assert not breaker.can_execute()
+        
+        with patch('src.core.mcp_error_handler.time.time', return_value=time.time() + 3600):
+            assert not breaker.can_execute()
+        with patch('src.core.mcp_error_handler.time.monotonic', return_value=time.monotonic() + 10):
+            assert breaker.can_execute()
+    
     async def test_exponential_backoff(self, error_handler):
         """Test exponential backoff retry mechanism"""
         call_count = 0
@@ -169,10 +231,10 @@ class TestMCPErrorHandling:
         mcp_manager.add_server(config2)
         
         # Initialize server connections and states properly
-        mcp_manager._servers["server1"] = config1
-        mcp_manager._servers["server2"] = config2
-        mcp_manager._connection_states["server1"] = ConnectionState.CONNECTED
-        mcp_manager._connection_states["server2"] = ConnectionState.CONNECTED
+        mcp_manager.add_server(config1)
+        mcp_manager.add_server(config2)
+        mcp_manager._set_state("server1", ConnectionState.CONNECTED)
+        mcp_manager._set_state("server2", ConnectionState.CONNECTED)
         mcp_manager._health_check_failures["server1"] = 0
         mcp_manager._health_check_failures["server2"] = 0
         
@@ -200,6 +262,125 @@ class TestMCPErrorHandling:
         assert mcp_manager._connection_states["server2"] == ConnectionState.CONNECTED
         assert mcp_manager._health_check_failures["server2"] == 0
     
+    async def test_health_check_rebuilds_bundle_once(self, mcp_manager):
+        """Test that several failing bundled servers share one reconnect"""
+        for name in ("server1", "server2"):
+            mcp_manager.add_server(MCPServerConfig(
+                name=name,
+                server_type=MCPServerType.PLAYWRIGHT,
+                command="npx",
+                args=["@playwright/mcp@latest"],
+                enabled=True
+            ))
+            mcp_manager._health_check_failures[name] = 1
+        mcp_manager._multi_mcp = AsyncMock()
+        
+        async def failing_health_check(server_name, operation):
+            raise ConnectionError("Health check failed")
+        
+        mcp_manager._error_handler.execute_with_error_handling = failing_health_check
+        with patch.object(mcp_manager, '_connect_all_servers', new_callable=AsyncMock) as connect_all, \
+             patch.object(mcp_manager, '_sync_agent_tools', new_callable=AsyncMock):
+            await mcp_manager._perform_health_check()
+        
+        assert connect_all.await_count == 1
+    
+    async def test_health_check_probes_concurrently(self, mcp_manager):
+        """Test that servers are probed concurrently, bounded by the concurrency limit"""
+        for i in range(4):
+            mcp_manager.add_server(MCPServerConfig(
+                name=f"server{i}",
+                server_type=MCPServerType.PLAYWRIGHT,
+                command="npx",
+                args=["@playwright/mcp@latest"],
+                enabled=True
+            ))
+        mcp_manager._multi_mcp = AsyncMock()
+        mcp_manager._health_check_concurrency = 2
+        in_flight = 0
+        peak = 0
+        
+        async def slow_health_check(server_name, operation):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return 5
+        
+        mcp_manager._error_handler.execute_with_error_handling = slow_health_check
+        await mcp_manager._perform_health_check()
+        
+        assert peak == 2
+        assert mcp_manager._state_counts[ConnectionState.CONNECTED] == 4
+    
+    async def test_health_check_skips_server_without_session(self, mcp_manager):
+        """Test that a server with no session is marked disconnected instead of probed"""
+        for name in ("server1", "server2"):
+            mcp_manager.add_server(MCPServerConfig(
+                name=name,
+                server_type=MCPServerType.PLAYWRIGHT,
+                command="npx",
+                args=["@playwright/mcp@latest"],
+                enabled=True
+            ))
+        mcp_manager._multi_mcp = None
+        mcp_manager._connections["server1"] = AsyncMock()
+        probed = []
+        
+        async def health_check(server_name, operation):
+            probed.append(server_name)
+            return 5
+        
+        mcp_manager._error_handler.execute_with_error_handling = health_check
+        await mcp_manager._perform_health_check()
+        
+        assert probed == ["server1"]
+        assert mcp_manager._connection_states["server1"] == ConnectionState.CONNECTED
+        assert mcp_manager._connection_states["server2"] == ConnectionState.DISCONNECTED
+        assert "server2" not in mcp_manager._health_check_failures
+    
+    async def test_reconnect_attempt_limits_are_independent(self, mcp_manager):
+        """Test that single-server reconnects have their own attempt limit"""
+        settings = {"max_reconnect_attempts": 7}
+        with patch.object(mcp_manager._config, "get_global_setting",
+                          side_effect=lambda key, default=None: settings.get(key, default)):
+            mcp_manager.reload_config()
+            assert mcp_manager._max_reconnect_attempts == 7
+            assert mcp_manager._max_single_reconnect_attempts == 3
+            
+            settings["max_single_reconnect_attempts"] = 1
+            mcp_manager.reload_config()
+            assert mcp_manager._max_single_reconnect_attempts == 1
+    
+    async def test_flapping_server_marked_failed(self, mcp_manager):
+        """Test that intermittent failures escalate without being consecutive"""
+        mcp_manager.add_server(MCPServerConfig(
+            name="server1",
+            server_type=MCPServerType.PLAYWRIGHT,
+            command="npx",
+            args=["@playwright/mcp@latest"],
+            enabled=True
+        ))
+        mcp_manager._multi_mcp = AsyncMock()
+        mcp_manager._auto_reconnect = False
+        outcomes = iter([False, True, False, True, False])
+        
+        async def flapping_health_check(server_name, operation):
+            if not next(outcomes):
+                raise ConnectionError("Health check failed")
+            return 5
+        
+        mcp_manager._error_handler.execute_with_error_handling = flapping_health_check
+        for _ in range(4):
+            await mcp_manager._perform_health_check()
+        assert mcp_manager._connection_states["server1"] == ConnectionState.CONNECTED
+        
+        await mcp_manager._perform_health_check()
+        assert mcp_manager._health_check_failures["server1"] == 1
+        assert mcp_manager._connection_states["server1"] == ConnectionState.FAILED
+        assert mcp_manager.get_health_metrics()["health_check_error_rates"] == {"server1": 0.6}
+    
     async def test_auto_reconnection(self, mcp_manager):
         """Test automatic reconnection functionality"""
         server_name = "test_server"
@@ -213,8 +394,8 @@ class TestMCPErrorHandling:
         mcp_manager.add_server(config)
         
         # Initialize server in servers dict and set initial state
-        mcp_manager._servers[server_name] = config
-        mcp_manager._connection_states[server_name] = ConnectionState.DISCONNECTED
+        mcp_manager.add_server(config)
+        mcp_manager._set_state(server_name, ConnectionState.DISCONNECTED)
         mcp_manager._health_check_failures[server_name] = 5
         
         # Mock successful reconnection
@@ -266,6 +447,22 @@ class TestMCPErrorHandling:
         # The stats might be structured differently, so check for presence of error data
         assert len(stats) > 0
     
+    async def test_error_summary_reports_top_error(self):
+        """Test that the error summary precomputes the most frequent error"""
+        pool = ConnectionPool()
+        error_handler = MCPErrorHandler(pool)
+        assert error_handler.get_error_summary()["top_error"] is None
+        
+        pool.add_connection("server1", Mock())
+        pool.add_connection("server2", Mock())
+        pool.record_operation_result("server1", False, ErrorType.NETWORK_ERROR)
+        pool.record_operation_result("server1", False, ErrorType.CONNECTION_TIMEOUT)
+        pool.record_operation_result("server2", False, ErrorType.NETWORK_ERROR)
+        
+        summary = error_handler.get_error_summary()
+        assert summary["top_error"] == ("network_error", 2)
+        assert isinstance(summary["most_common_errors"], dict)
+    
     async def test_connection_diagnostics(self, mcp_manager):
         """Test connection diagnostics functionality"""
         # Add servers with different states
@@ -287,8 +484,8 @@ class TestMCPErrorHandling:
         mcp_manager.add_server(failing_config)
         
         # Set different connection states
-        mcp_manager._connection_states["healthy_server"] = ConnectionState.CONNECTED
-        mcp_manager._connection_states["failing_server"] = ConnectionState.DISCONNECTED
+        mcp_manager._set_state("healthy_server", ConnectionState.CONNECTED)
+        mcp_manager._set_state("failing_server", ConnectionState.DISCONNECTED)
         mcp_manager._health_check_failures["failing_server"] = 3
         
         # Initialize error handler if not present
@@ -309,32 +506,33 @@ class TestMCPErrorHandling:
         assert isinstance(diagnostics["issues"], list)
         assert isinstance(diagnostics["recommendations"], list)
     
+    async def test_diagnosis_reports_most_severe_health(self, mcp_manager):
+        """Test that overall health does not depend on the order of the checks"""
+        mcp_manager._set_state("server1", ConnectionState.FAILED)
+        mcp_manager._set_state("server2", ConnectionState.RECONNECTING)
+        
+        diagnosis = await mcp_manager.diagnose_connection_issues()
+        assert diagnosis["overall_health"] == "degraded"
+        assert len(diagnosis["issues"]) == 2
+    
     async def test_health_metrics_reporting(self, mcp_manager):
         """Test health metrics collection and reporting"""
         # Set up some test data
-        mcp_manager._connection_states["server1"] = ConnectionState.CONNECTED
-        mcp_manager._connection_states["server2"] = ConnectionState.RECONNECTING
+        mcp_manager._set_state("server1", ConnectionState.CONNECTED)
+        mcp_manager._set_state("server2", ConnectionState.RECONNECTING)
         mcp_manager._health_check_failures["server1"] = 0
         mcp_manager._health_check_failures["server2"] = 2
         mcp_manager._last_health_check = time.time() - 30  # 30 seconds ago
         
         # Initialize servers dict to match connection states
-        mcp_manager._servers = {
-            "server1": MCPServerConfig(
-                name="server1",
+        for name in ("server1", "server2"):
+            mcp_manager.add_server(MCPServerConfig(
+                name=name,
                 server_type=MCPServerType.PLAYWRIGHT,
                 command="npx",
                 args=["@playwright/mcp@latest"],
                 enabled=True
-            ),
-            "server2": MCPServerConfig(
-                name="server2",
-                server_type=MCPServerType.PLAYWRIGHT,
-                command="npx",
-                args=["@playwright/mcp@latest"],
-                enabled=True
-            )
-        }
+            ))
         
         # Get health metrics
         metrics = mcp_manager.get_health_metrics()
@@ -349,6 +547,306 @@ class TestMCPErrorHandling:
         assert metrics["total_servers"] == 2  # Two servers in connection states
         assert metrics["healthy_servers"] == 1
         assert metrics["reconnecting_servers"] == 1
+
+    async def test_write_metrics_openmetrics_format(self, mcp_manager):
+        """Test that health metrics are written to a buffer in OpenMetrics text format"""
+        mcp_manager.add_server(MCPServerConfig(
+            name="server1",
+            server_type=MCPServerType.PLAYWRIGHT,
+            command="npx",
+            args=["@playwright/mcp@latest"],
+            enabled=True
+        ))
+        mcp_manager._set_state("server1", ConnectionState.CONNECTED)
+        mcp_manager._set_state('odd"name', ConnectionState.FAILED)
+        mcp_manager._health_check_failures['odd"name'] = 3
+        mcp_manager._runtime["server1"] = ServerRuntimeState()
+        mcp_manager._runtime["server1"].health_outcomes.extend([True, False])
+
+        buf = bytearray(b"stale")
+        buf.clear()
+        mcp_manager.write_metrics(buf)
+        lines = buf.decode().splitlines()
+
+        assert "mcp_servers_configured 1" in lines
+        assert "mcp_servers_enabled 1" in lines
+        assert 'mcp_servers{state="connected"} 1' in lines
+        assert 'mcp_servers{state="failed"} 1' in lines
+        assert 'mcp_servers{state="reconnecting"} 0' in lines
+        assert 'mcp_server_health_check_failures{server="odd\\"name"} 3' in lines
+        assert 'mcp_server_health_check_error_rate{server="server1"} 0.5' in lines
+        assert lines[-1] == "# EOF"
+
+        # Appending again keeps the earlier scrape intact
+        size = len(buf)
+        mcp_manager.write_metrics(buf)
+        assert len(buf) == 2 * size
+
+    async def test_write_metrics_exports_wall_clock_timestamp(self, mcp_manager):
+        """Test that the last health check is exported as a Unix timestamp"""
+        mcp_manager.add_server(MCPServerConfig(
+            name="server1",
+            server_type=MCPServerType.PLAYWRIGHT,
+            command="npx",
+            args=["@playwright/mcp@latest"],
+            enabled=True
+        ))
+        mcp_manager._multi_mcp = AsyncMock()
+        
+        async def health_check(server_name, operation):
+            return 5
+        
+        mcp_manager._error_handler.execute_with_error_handling = health_check
+        before = time.time()
+        await mcp_manager._perform_health_check()
+        
+        buf = bytearray()
+        mcp_manager.write_metrics(buf)
+        line = next(l for l in buf.decode().splitlines()
+                    if l.startswith("mcp_last_health_check_timestamp_seconds "))
+        assert before <= float(line.split()[1]) <= time.time()
+    
+    async def test_enabled_index_follows_server_changes(self, mcp_manager):
+        """Test that the enabled-server index tracks add/enable/disable/remove"""
+        for name, enabled in (("server1", True), ("server2", False)):
+            mcp_manager.add_server(MCPServerConfig(
+                name=name,
+                server_type=MCPServerType.PLAYWRIGHT,
+                command="npx",
+                args=["@playwright/mcp@latest"],
+                enabled=enabled
+            ))
+        assert mcp_manager._enabled_names == {"server1"}
+        
+        with patch.object(mcp_manager._config, "enable_server"), \
+             patch.object(mcp_manager._config, "disable_server"):
+            await mcp_manager.enable_server("server2")
+            assert mcp_manager._enabled_names == {"server1", "server2"}
+            await mcp_manager.disable_server("server1")
+            assert mcp_manager._enabled_names == {"server2"}
+        
+        mcp_manager.remove_server("server2")
+        assert not mcp_manager._enabled_names
+        assert mcp_manager.get_health_metrics()["enabled_servers"] == 0
+    
+    async def test_state_counts_follow_transitions(self, mcp_manager):
+        """Test that the maintained state counts follow state transitions"""
+        config = MCPServerConfig(
+            name="server1",
+            server_type=MCPServerType.PLAYWRIGHT,
+            command="npx",
+            args=["@playwright/mcp@latest"],
+            enabled=True
+        )
+        mcp_manager.add_server(config)
+        assert list(mcp_manager._enabled_servers()) == ["server1"]
+        
+        mcp_manager._set_state("server1", ConnectionState.CONNECTED)
+        assert mcp_manager._state_counts[ConnectionState.CONNECTED] == 1
+        
+        mcp_manager._set_state("server1", ConnectionState.FAILED)
+        assert mcp_manager._state_counts[ConnectionState.CONNECTED] == 0
+        assert mcp_manager._state_counts[ConnectionState.FAILED] == 1
+        
+        await mcp_manager.disable_server("server1")
+        metrics = mcp_manager.get_health_metrics()
+        assert metrics["enabled_servers"] == 0
+        assert metrics["failed_server_list"] == ["server1"]
+    
+    async def test_health_metrics_cache_invalidation(self, mcp_manager):
+        """Test that cached health metrics are reused until a state changes"""
+        mcp_manager._set_state("server1", ConnectionState.CONNECTED)
+        first = mcp_manager.get_health_metrics()
+        cached = mcp_manager._cached_health
+        assert mcp_manager.get_health_metrics() == first
+        assert mcp_manager._cached_health is cached
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            cached[1].healthy_servers = 0
+        
+        # Callers get a copy, so mutating it must not leak into the cache
+        first["healthy_server_list"].append("bogus")
+        first["server_states"].clear()
+        assert mcp_manager.get_health_metrics()["healthy_server_list"] == ["server1"]
+        assert mcp_manager.get_health_metrics()["server_states"] == {"server1": "connected"}
+        
+        mcp_manager._set_state("server1", ConnectionState.FAILED)
+        second = mcp_manager.get_health_metrics()
+        assert mcp_manager._cached_health is not cached
+        assert second["failed_servers"] == 1
+        assert second["healthy_servers"] == 0
+        
+        # Direct dict writes bypass invalidation, so the cached snapshot is served
+        mcp_manager._health_check_failures["server1"] = 2
+        assert mcp_manager.get_health_metrics()["health_check_failures"] == {}
+        mcp_manager._invalidate_health_cache()
+        assert mcp_manager.get_health_metrics()["health_check_failures"] == {"server1": 2}
+    
+    async def test_enable_server_connects_single_session(self, mcp_manager):
+        """Test that enabling a server does not rebuild the other connections"""
+        config = MCPServerConfig(
+            name="server1",
+            server_type=MCPServerType.MEMORY,
+            command="npx",
+            args=["-y", "@modelcontextprotocol/server-memory"],
+            enabled=False
+        )
+        mcp_manager.add_server(config)
+        mcp_manager._is_initialized = True
+        mcp_manager._connection_pool = Mock()
+        mcp_manager._multi_mcp = AsyncMock()
+        session = AsyncMock()
+        
+        with patch('src.core.mcp_manager.MCPTools', return_value=session):
+            with patch.object(mcp_manager, '_connect_all_servers') as connect_all:
+                assert await mcp_manager.enable_server("server1")
+                connect_all.assert_not_called()
+        
+        session.connect.assert_awaited_once()
+        assert mcp_manager._connections["server1"] is session
+        assert mcp_manager._connection_states["server1"] == ConnectionState.CONNECTED
+        assert mcp_manager._agent.tools == [mcp_manager._multi_mcp, session]
+        
+        assert await mcp_manager.disable_server("server1")
+        session.disconnect.assert_awaited_once()
+        assert "server1" not in mcp_manager._connections
+        assert mcp_manager._agent.tools == [mcp_manager._multi_mcp]
+    
+    async def test_server_params_reused_until_config_changes(self, mcp_manager):
+        """Test that stdio parameters are rebuilt only when the config changes"""
+        config = MCPServerConfig(
+            name="server1",
+            server_type=MCPServerType.MEMORY,
+            command="npx",
+            args=["-y", "@modelcontextprotocol/server-memory"],
+            enabled=True
+        )
+        mcp_manager.add_server(config)
+        
+        params = mcp_manager._build_server_params(config)
+        assert mcp_manager._build_server_params(config) is params
+        
+        config.env = {"DEBUG": "1"}
+        assert mcp_manager._build_server_params(config) is not params
+        
+        mcp_manager.remove_server("server1")
+        assert "server1" not in mcp_manager._server_params_cache
+    
+    async def test_sync_agent_tools_skips_unchanged_toolkits(self, mcp_manager):
+        """Test that the agent keeps its tool list when the toolkits are unchanged"""
+        bundle = AsyncMock()
+        mcp_manager._multi_mcp = bundle
+        tools = [bundle]
+        mcp_manager._agent.tools = tools
+        
+        await mcp_manager._sync_agent_tools()
+        assert mcp_manager._agent.tools is tools
+        
+        session = AsyncMock()
+        mcp_manager._connections["server1"] = session
+        await mcp_manager._sync_agent_tools()
+        assert mcp_manager._agent.tools == [bundle, session]
+    
+    async def test_disable_bundle_member_keeps_sessions(self, mcp_manager):
+        """Test that disabling a bundled server leaves single sessions connected"""
+        for name in ("server1", "server2", "server3"):
+            mcp_manager.add_server(MCPServerConfig(
+                name=name,
+                server_type=MCPServerType.MEMORY,
+                command="npx",
+                args=["-y", "@modelcontextprotocol/server-memory"],
+                enabled=True
+            ))
+        mcp_manager._is_initialized = True
+        old_bundle = AsyncMock()
+        mcp_manager._multi_mcp = old_bundle
+        mcp_manager._multi_mcp_members = {"server1", "server2"}
+        session = AsyncMock()
+        mcp_manager._connections["server3"] = session
+        mcp_manager._config.disable_server = Mock()
+        
+        new_bundle = AsyncMock()
+        with patch('src.core.mcp_manager.MultiMCPTools', return_value=new_bundle) as bundle_cls, \
+             patch.object(mcp_manager, '_sync_agent_tools', new_callable=AsyncMock):
+            assert await mcp_manager.disable_server("server1")
+        
+        old_bundle.disconnect.assert_awaited_once()
+        assert set(bundle_cls.call_args.args[0]) == {"server2"}
+        assert mcp_manager._multi_mcp is new_bundle
+        session.disconnect.assert_not_awaited()
+        assert mcp_manager._connections["server3"] is session
+    
+    async def test_server_tools_grouped_by_longest_prefix(self, mcp_manager):
+        """Test that bundle tools are attributed to the longest matching server name"""
+        for name in ("fs", "fs_local"):
+            mcp_manager.add_server(MCPServerConfig(
+                name=name,
+                server_type=MCPServerType.FILESYSTEM,
+                command="npx",
+                args=["-y", "@modelcontextprotocol/server-filesystem", "/tmp"],
+                enabled=True
+            ))
+        tools = []
+        for tool_name in ("fs_read", "fs_local_read", "orphan"):
+            tool = Mock()
+            tool.name = tool_name
+            tools.append(tool)
+        mcp_manager._multi_mcp = AsyncMock()
+        mcp_manager._multi_mcp.list_tools.return_value = tools
+        
+        grouped = await mcp_manager.get_server_tools()
+        assert grouped == {"fs": ["fs_read"], "fs_local": ["fs_local_read"], "unknown": ["orphan"]}
+        assert await mcp_manager.get_server_tools("fs") == {"fs": ["fs_read"]}
+    
+    async def test_list_tools_single_flight(self, mcp_manager):
+        """Test that concurrent tool listings share one list_tools() call"""
+        toolkit = AsyncMock()
+        
+        async def slow_list_tools():
+            await asyncio.sleep(0.01)
+            return ["tool"]
+        
+        toolkit.list_tools.side_effect = slow_list_tools
+        results = await asyncio.gather(*(mcp_manager._list_tools(toolkit) for _ in range(5)))
+        assert results == [["tool"]] * 5
+        assert toolkit.list_tools.await_count == 1
+        
+        # Cached until the TTL expires
+        await mcp_manager._list_tools(toolkit)
+        assert toolkit.list_tools.await_count == 1
+        mcp_manager._tools_cache_ttl = 0
+        await mcp_manager._list_tools(toolkit)
+        assert toolkit.list_tools.await_count == 2
+    
+    async def test_background_tasks_are_tracked(self, mcp_manager):
+        """Test that background tasks are referenced until done and failures are consumed"""
+        async def failing():
+            raise ConnectionError("pipe closed")
+        
+        task = mcp_manager._spawn_background(failing())
+        assert task in mcp_manager._background_tasks
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert task not in mcp_manager._background_tasks
+    
+    async def test_concurrent_initialize_runs_once(self):
+        """Test that concurrent initialize calls share a single initialization"""
+        manager = MCPManager()
+        connect_calls = 0
+        
+        async def fake_connect_all():
+            nonlocal connect_calls
+            connect_calls += 1
+            await asyncio.sleep(0.01)
+        
+        with patch.object(manager, '_load_servers_from_config'), \
+             patch.object(manager, '_connect_all_servers', side_effect=fake_connect_all), \
+             patch.object(manager, '_create_agent'), \
+             patch.object(manager, '_start_health_check'):
+            results = await asyncio.gather(*(manager.initialize() for _ in range(5)))
+        
+        assert results == [True] * 5
+        assert connect_calls == 1
+        assert manager.is_initialized
     
     async def test_command_execution_with_error_handling(self, mcp_manager):
         """Test command execution with enhanced error handling"""
@@ -386,6 +884,22 @@ class TestMCPErrorHandling:
         assert "error" in result
         assert "Connection lost" in result["error"]
     
+    async def test_command_prompt_includes_context(self, mcp_manager):
+        """Test that the context is rendered ahead of the task in the prompt"""
+        mcp_manager._is_initialized = True
+        mcp_manager._agent.arun.return_value = Mock(content="done")
+        
+        async def run_operation(name, operation, fallback=None):
+            return await operation()
+        
+        mcp_manager._error_handler.execute_with_error_handling = run_operation
+        result = await mcp_manager.execute_command("open page", {"url": "https://example.com", "tab": 1})
+        
+        assert result == "done"
+        mcp_manager._agent.arun.assert_awaited_once_with(
+            "Context:\nurl: https://example.com\ntab: 1\n\nTask: open page"
+        )
+    
     async def test_connection_pool_management(self, mcp_manager):
         """Test connection pool functionality"""
         server_name = "test_server"
@@ -430,8 +944,8 @@ class TestMCPErrorRecovery:
         manager.add_server(test_server)
         
         # Initialize required attributes
-        manager._servers = {"test_server": test_server}
-        manager._connection_states = {"test_server": ConnectionState.DISCONNECTED}
+        manager.add_server(test_server)
+        manager._set_state("test_server", ConnectionState.DISCONNECTED)
         manager._health_check_failures = {"test_server": 0}
         manager._connection_pool = Mock()
         manager._agent = AsyncMock()
@@ -448,7 +962,7 @@ class TestMCPErrorRecovery:
             with patch.object(manager, '_create_agent', return_value=None):
                 # Manually set initialized state and update connection
                 manager._is_initialized = True
-                manager._connection_states["test_server"] = ConnectionState.CONNECTED
+                manager._set_state("test_server", ConnectionState.CONNECTED)
                 
                 # Verify recovery
                 assert manager.is_initialized
@@ -468,8 +982,8 @@ class TestMCPErrorRecovery:
         manager.add_server(config)
         
         # Initialize required attributes first
-        manager._servers = {"test_server": config}
-        manager._connection_states = {"test_server": ConnectionState.CONNECTED}
+        manager.add_server(config)
+        manager._set_state("test_server", ConnectionState.CONNECTED)
         manager._health_check_failures = {"test_server": 0}
         manager._connection_pool = Mock()
         manager._error_handler = Mock()
@@ -516,7 +1030,7 @@ class TestMCPErrorRecovery:
                 enabled=True
             )
             manager.add_server(config)
-            manager._connection_states[f"server_{i}"] = ConnectionState.CONNECTED
+            manager._set_state(f"server_{i}", ConnectionState.CONNECTED)
         
         # Initialize required attributes
         configs = []
@@ -530,11 +1044,8 @@ class TestMCPErrorRecovery:
             )
             configs.append(config)
         
-        manager._servers = {
-            "server_0": configs[0],
-            "server_1": configs[1],
-            "server_2": configs[2]
-        }
+        for config in configs:
+            manager.add_server(config)
         manager._health_check_failures = {
             "server_0": 0,
             "server_1": 0,
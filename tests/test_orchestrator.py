@@ -1,9 +1,15 @@
 """Orchestrator 核心调度器测试"""
 import pytest
 import asyncio
+import json
 from unittest.mock import Mock, AsyncMock, patch
 
-from src.core.orchestrator import Orchestrator, TaskRequest, TaskResult, TaskStatus, RiskLevel, ExecutionMode
+from src.core.orchestrator import (
+    Orchestrator, TaskRequest, TaskResult, TaskStatus, RiskLevel, ExecutionMode, ParsedCommandView,
+    StrategyDecision, _EXECUTION_LOG_SIZE
+)
+from src.core.action_graph import ExecutionResult
+from src.core.task_store import RedisTaskStore, FileTaskStore
 from src.utils.exceptions import AuraException, ValidationError, TaskExecutionError
 
 
@@ -243,6 +249,40 @@ class TestOrchestrator:
         new_status = await orchestrator.get_task_status(new_job_id)
         assert new_status.task_id == new_job_id
 
+    @pytest.mark.asyncio
+    async def test_replay_reuses_request_and_strategy(self, orchestrator):
+        """测试重放沿用原请求和执行策略，不再做技能匹配和策略决策"""
+        strategy = StrategyDecision(mode=ExecutionMode.SCRIPT, skill_id='x', parameters={})
+        orchestrator.command_parser.parse_command = AsyncMock(return_value={})
+        orchestrator.risk_engine.assess_risk = AsyncMock(return_value={})
+        orchestrator.policy_engine.check_policy = AsyncMock(return_value=Mock(allowed=True))
+        orchestrator.skill_library.find_matching_skill = AsyncMock(return_value=None)
+        orchestrator._decide_execution_strategy = Mock(return_value=strategy)
+        orchestrator._execute_strategy = AsyncMock(return_value={'success': True})
+
+        request = TaskRequest(goal="search kindle", retry_count=0)
+        orchestrator.tasks["orig"] = TaskResult(task_id="orig", status=TaskStatus.PENDING,
+                                                request=request)
+        await orchestrator._execute_task("orig", request)
+        assert orchestrator.tasks["orig"].strategy is strategy
+
+        new_job_id = await orchestrator.replay_task("orig")
+        replay = orchestrator.tasks[new_job_id]
+        assert replay.request is request
+        assert replay.strategy is strategy
+
+        await orchestrator._execute_task(new_job_id, replay.request)
+        assert replay.status == TaskStatus.COMPLETED
+        orchestrator._decide_execution_strategy.assert_called_once()
+        orchestrator.skill_library.find_matching_skill.assert_awaited_once()
+        assert orchestrator.policy_engine.check_policy.await_count == 2
+        orchestrator._execute_strategy.assert_awaited_with(new_job_id, strategy, request)
+
+        # 没有记录原始请求的任务无法重放
+        orchestrator.tasks["legacy"] = TaskResult(task_id="legacy", status=TaskStatus.COMPLETED)
+        with pytest.raises(AuraException):
+            await orchestrator.replay_task("legacy")
+
     @pytest.mark.asyncio
     async def test_list_jobs(self, orchestrator):
         """测试列出任务"""
@@ -291,6 +331,453 @@ class TestOrchestrator:
         assert isinstance(stats['avg_execution_time'], (int, float))
         assert isinstance(stats['token_usage'], int)
 
+    @pytest.mark.asyncio
+    async def test_stats_track_finished_tasks(self, orchestrator):
+        """测试统计信息随任务完成和最终失败增量更新"""
+        orchestrator.command_parser.parse_command = AsyncMock(return_value={})
+        orchestrator.risk_engine.assess_risk = AsyncMock(return_value={})
+        orchestrator.policy_engine.check_policy = AsyncMock(return_value=Mock(allowed=True))
+        orchestrator._decide_execution_strategy = Mock(
+            return_value=StrategyDecision(mode=ExecutionMode.SCRIPT, skill_id='x', parameters={})
+        )
+        orchestrator._execute_strategy = AsyncMock(
+            side_effect=[{'success': True}, TaskExecutionError("boom")]
+        )
+
+        for task_id in ("ok", "bad"):
+            orchestrator.tasks[task_id] = TaskResult(task_id=task_id, status=TaskStatus.PENDING)
+            await orchestrator._execute_task(
+                task_id, TaskRequest(goal="search", retry_count=0)
+            )
+
+        assert orchestrator.tasks["ok"].status == TaskStatus.COMPLETED
+        assert orchestrator.tasks["bad"].status == TaskStatus.FAILED
+        stats = orchestrator.get_stats()
+        assert stats['success_rate'] == 0.5
+        assert stats['avg_execution_time'] == orchestrator.tasks["ok"].execution_time
+        assert stats['token_usage'] == 0
+        assert (orchestrator.stats.completed, orchestrator.stats.failed) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_retry_reuses_parsed_command(self, orchestrator):
+        """测试执行失败后在同一次调用内重试，且不重复解析指令"""
+        orchestrator.command_parser.parse_command = AsyncMock(return_value={})
+        orchestrator.risk_engine.assess_risk = AsyncMock(return_value={})
+        orchestrator.policy_engine.check_policy = AsyncMock(return_value=Mock(allowed=True))
+        orchestrator._decide_execution_strategy = Mock(
+            return_value=StrategyDecision(mode=ExecutionMode.SCRIPT, skill_id='x', parameters={})
+        )
+        orchestrator._execute_strategy = AsyncMock(
+            side_effect=[TaskExecutionError("flaky"), {'success': True}]
+        )
+        orchestrator.skill_library.find_matching_skill = AsyncMock(return_value=None)
+        orchestrator.tasks["t"] = TaskResult(task_id="t", status=TaskStatus.PENDING)
+
+        with patch('src.core.orchestrator._RETRY_BASE_DELAY', 0):
+            await orchestrator._execute_task("t", TaskRequest(goal="search", retry_count=2))
+
+        assert orchestrator.tasks["t"].status == TaskStatus.COMPLETED
+        assert orchestrator._execute_strategy.await_count == 2
+        orchestrator.command_parser.parse_command.assert_awaited_once()
+        orchestrator.skill_library.find_matching_skill.assert_awaited_once()
+
+        # 每次尝试都记录策略选择，字典形式按需生成
+        entries = orchestrator.tasks["t"].execution_log_entries()
+        assert [entry["step"] for entry in entries] == [
+            "command_parsing", "strategy_selection", "strategy_selection"
+        ]
+        assert entries[-1]["data"]["mode"] == "script"
+        assert len(orchestrator.tasks["t"].execution_log_entries(limit=1)) == 1
+        assert orchestrator.get_stats()['success_rate'] == 1.0
+
+    def test_execution_log_is_bounded(self):
+        """测试执行日志只保留最近的记录"""
+        task = TaskResult(task_id="t", status=TaskStatus.RUNNING)
+        for i in range(_EXECUTION_LOG_SIZE + 10):
+            task.execution_log.append(("step", 0.0, i))
+
+        assert len(task.execution_log) == _EXECUTION_LOG_SIZE
+        assert task.execution_log[0][2] == 10
+        assert [entry["data"] for entry in task.execution_log_entries(limit=2)] == [
+            _EXECUTION_LOG_SIZE + 8, _EXECUTION_LOG_SIZE + 9
+        ]
+        assert len(task.execution_log_entries(limit=_EXECUTION_LOG_SIZE * 2)) == _EXECUTION_LOG_SIZE
+
+    @pytest.mark.asyncio
+    async def test_retry_backoff_jitter(self, orchestrator):
+        """测试重试退避按指数增长并带有按任务ID播种的随机抖动"""
+        import random
+        orchestrator.command_parser.parse_command = AsyncMock(return_value={})
+        orchestrator.risk_engine.assess_risk = AsyncMock(return_value={})
+        orchestrator.policy_engine.check_policy = AsyncMock(return_value=Mock(allowed=True))
+        orchestrator.skill_library.find_matching_skill = AsyncMock(return_value=None)
+        orchestrator._decide_execution_strategy = Mock(
+            return_value=StrategyDecision(mode=ExecutionMode.SCRIPT, skill_id='x', parameters={})
+        )
+        orchestrator._execute_strategy = AsyncMock(side_effect=TaskExecutionError("down"))
+        orchestrator.tasks["t"] = TaskResult(task_id="t", status=TaskStatus.PENDING)
+
+        with patch('src.core.orchestrator.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            await orchestrator._execute_task("t", TaskRequest(goal="search", retry_count=3))
+
+        assert orchestrator.tasks["t"].status == TaskStatus.FAILED
+        rng = random.Random("t")
+        expected = [0.25 * 2 ** attempt * (0.5 + rng.random()) for attempt in range(3)]
+        assert [call.args[0] for call in mock_sleep.await_args_list] == expected
+        for attempt, delay in enumerate(expected):
+            assert 0.125 * 2 ** attempt <= delay < 0.375 * 2 ** attempt
+
+    @pytest.mark.asyncio
+    async def test_parse_results_cached_per_goal(self, orchestrator):
+        """测试相同指令只解析一次，并发请求共享同一次解析"""
+        orchestrator.command_parser.parse_command = AsyncMock(return_value={'intent': 'search'})
+
+        first, second = await asyncio.gather(
+            orchestrator._get_parsed_command("search kindle"),
+            orchestrator._get_parsed_command("search kindle"),
+        )
+        third = await orchestrator._get_parsed_command("search kindle")
+
+        assert first is second is third
+        assert first == ({'intent': 'search'}, ParsedCommandView(intent="", context={}, reasoning=""))
+        orchestrator.command_parser.parse_command.assert_awaited_once_with("search kindle")
+        assert orchestrator._parse_inflight == {}
+
+    def test_components_created_on_first_use(self, orchestrator):
+        """测试核心组件在首次访问时才创建"""
+        assert orchestrator.get_stats()['total_tasks'] == 0
+        assert 'mcp_manager' not in vars(orchestrator)
+
+        manager = orchestrator.mcp_manager
+        assert orchestrator.mcp_manager is manager
+
+    @pytest.mark.asyncio
+    async def test_concurrent_mcp_initialization_runs_once(self, orchestrator):
+        """测试并发调用 initialize_mcp 时只初始化一次"""
+        async def slow_initialize():
+            await asyncio.sleep(0.01)
+            return True
+
+        orchestrator.mcp_config = Mock(get_server_configs=Mock(return_value=[]))
+        orchestrator.mcp_manager = Mock(initialize=AsyncMock(side_effect=slow_initialize))
+
+        results = await asyncio.gather(*(orchestrator.initialize_mcp() for _ in range(5)))
+
+        assert results == [True] * 5
+        orchestrator.mcp_manager.initialize.assert_awaited_once()
+
+    def test_decide_execution_strategy(self, orchestrator):
+        """测试高置信度技能匹配使用脚本模式，否则使用AI代理模式"""
+        command = ParsedCommandView(intent="search", context={}, reasoning="search then open")
+
+        strategy = orchestrator._decide_execution_strategy(
+            command, {"skill_id": "s1", "confidence": 0.9, "parameters": {"q": "kindle"}})
+        assert strategy == StrategyDecision(
+            mode=ExecutionMode.SCRIPT, confidence=0.9, skill_id="s1", parameters={"q": "kindle"})
+
+        strategy = orchestrator._decide_execution_strategy(
+            command, {"skill_id": "s1", "confidence": 0.5, "parameters": {}})
+        assert strategy == StrategyDecision(
+            mode=ExecutionMode.AI_AGENT, confidence=0.7, plan="search then open")
+
+    @pytest.mark.asyncio
+    async def test_execute_mcp_commands_concurrently(self, orchestrator):
+        """测试批量 MCP 命令并发提交并按输入顺序返回结果"""
+        in_flight = []
+
+        async def fake_execute(command, context):
+            in_flight.append(command)
+            await asyncio.sleep(0.01)
+            return f"{command}: {len(in_flight)}"
+
+        orchestrator._mcp_initialized = True
+        orchestrator.mcp_manager.execute_command = AsyncMock(side_effect=fake_execute)
+
+        results = await orchestrator.execute_mcp_commands([
+            ("screenshot", None), ("read title", {"url": "https://example.com"})
+        ])
+
+        # 两条命令都在第一条完成之前提交
+        assert results == ["screenshot: 2", "read title: 2"]
+        orchestrator.mcp_manager.execute_command.assert_any_await(
+            "read title", {"url": "https://example.com"})
+
+    @pytest.mark.asyncio
+    async def test_mcp_calls_skip_initialization_when_ready(self, orchestrator):
+        """测试 MCP 已初始化时不再调用 initialize_mcp，初始化失败时按原方式报错"""
+        orchestrator.initialize_mcp = AsyncMock(return_value=False)
+        assert await orchestrator.get_mcp_tools() == []
+        with pytest.raises(AuraException):
+            await orchestrator.execute_mcp_command("screenshot")
+        assert orchestrator.initialize_mcp.await_count == 2
+
+        orchestrator.initialize_mcp.reset_mock()
+        orchestrator._mcp_initialized = True
+        orchestrator.mcp_manager.execute_command = AsyncMock(return_value="ok")
+        assert await orchestrator.execute_mcp_command("screenshot") == "ok"
+        orchestrator.initialize_mcp.assert_not_called()
+
+    def test_parsed_command_view(self):
+        """测试从解析结果中提取策略决策所需字段"""
+        from src.modules.command_parser import ParsedCommand, IntentMatch, IntentType
+        intent = IntentMatch(intent=IntentType.SEARCH, confidence=0.9)
+        parsed = ParsedCommand(
+            original_text="search kindle",
+            normalized_text="search kindle",
+            primary_intent=intent,
+            context={'site': 'amazon.com'}
+        )
+
+        view = ParsedCommandView.from_parsed(parsed)
+        assert view == ParsedCommandView(intent="search", context={'site': 'amazon.com'}, reasoning="")
+
+        # 缺少字段的解析结果取空值
+        assert ParsedCommandView.from_parsed({}) == ParsedCommandView(intent="", context={}, reasoning="")
+
+    @pytest.mark.asyncio
+    async def test_consider_skill_generation_with_action_graph(self, orchestrator):
+        """测试技能生成判断可处理 ActionGraph 和 ExecutionResult 对象"""
+        graph = await orchestrator._generate_action_graph("search", {}, [])
+
+        def execution(success):
+            return ExecutionResult(graph_id=graph.id, success=success, completed_nodes=3,
+                                   total_nodes=3, execution_time=5.0)
+
+        with patch('src.core.orchestrator.logger') as mock_logger:
+            await orchestrator._consider_skill_generation("task", graph, execution(True))
+            mock_logger.info.assert_called_once()
+
+            mock_logger.reset_mock()
+            await orchestrator._consider_skill_generation("task", graph, execution(False))
+            mock_logger.info.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ai_agent_mode_returns_execution_result_dict(self, orchestrator):
+        """测试AI代理模式返回字典形式的执行结果"""
+        orchestrator.site_explorer.explore_and_model = AsyncMock(return_value=None)
+        orchestrator.action_graph_executor.execute_graph = AsyncMock(return_value=ExecutionResult(
+            graph_id="g", success=True, completed_nodes=3, total_nodes=3, execution_time=1.5))
+        orchestrator._consider_skill_generation = AsyncMock()
+
+        strategy = StrategyDecision(mode=ExecutionMode.AI_AGENT, confidence=0.7, plan="")
+        result = await orchestrator._execute_ai_agent_mode("t", strategy, TaskRequest(goal="search"))
+
+        assert result["success"] is True
+        assert result["execution_time"] == 1.5
+        orchestrator._consider_skill_generation.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_ai_agent_mode_reuses_successful_graph(self, orchestrator):
+        """测试执行成功的图被缓存复用，缓存的图执行失败后失效"""
+        def execution(success):
+            return ExecutionResult(graph_id="g", success=success, completed_nodes=0,
+                                   total_nodes=3, execution_time=1.0)
+
+        orchestrator.site_explorer.explore_and_model = AsyncMock(return_value=None)
+        orchestrator.action_graph_executor.execute_graph = AsyncMock(
+            side_effect=[execution(True), execution(False), execution(True)])
+        orchestrator._consider_skill_generation = AsyncMock()
+        strategy = StrategyDecision(mode=ExecutionMode.AI_AGENT, confidence=0.7, plan="")
+        request = TaskRequest(goal="search kindle")
+
+        for task_id in ("t1", "t2", "t3"):
+            await orchestrator._execute_ai_agent_mode(task_id, strategy, request)
+
+        # 第二次命中缓存，执行失败后缓存失效，第三次重新探索
+        assert orchestrator.site_explorer.explore_and_model.await_count == 2
+        first, second, third = (call.args[0] for call in
+                                orchestrator.action_graph_executor.execute_graph.await_args_list)
+        assert second is not first
+        assert [node.id for node in second.nodes] == [node.id for node in first.nodes]
+        assert list(orchestrator._graph_cache) == [("search kindle", "domain")]
+
+    @pytest.mark.asyncio
+    async def test_status_index_follows_transitions(self, orchestrator):
+        """测试状态索引随任务状态变更同步更新"""
+        by_status = orchestrator._tasks_by_status
+        job_id = await orchestrator.create_task(TaskRequest(goal="search"))
+        assert job_id in by_status[TaskStatus.PENDING]
+
+        task = orchestrator.tasks[job_id]
+        orchestrator._set_status(task, TaskStatus.RUNNING)
+        assert job_id not in by_status[TaskStatus.PENDING]
+        assert job_id in by_status[TaskStatus.RUNNING]
+
+        # 关闭时按索引取消运行中的任务
+        await orchestrator.shutdown()
+        assert task.status == TaskStatus.CANCELLED
+        assert by_status[TaskStatus.RUNNING] == set()
+        assert by_status[TaskStatus.CANCELLED] == {job_id}
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_queued_tasks(self):
+        """测试关闭时取消排队中的任务，之后创建的任务不会执行关闭前排队的任务"""
+        orchestrator = Orchestrator(max_concurrency=1)
+        release = asyncio.Event()
+        started = []
+
+        async def fake_execute(task_id, request):
+            started.append(task_id)
+            orchestrator._set_status(orchestrator.tasks[task_id], TaskStatus.RUNNING)
+            await release.wait()
+            orchestrator._set_status(orchestrator.tasks[task_id], TaskStatus.COMPLETED)
+
+        orchestrator._execute_task = fake_execute
+
+        running = await orchestrator.create_task(TaskRequest(goal="running"))
+        queued = await orchestrator.create_task(TaskRequest(goal="queued"))
+        await asyncio.sleep(0.01)
+        assert started == [running]
+
+        await orchestrator.shutdown()
+        assert orchestrator.tasks[running].status == TaskStatus.CANCELLED
+        assert orchestrator.tasks[queued].status == TaskStatus.CANCELLED
+        assert orchestrator._task_queue.empty()
+
+        release.set()
+        new = await orchestrator.create_task(TaskRequest(goal="new"))
+        await asyncio.sleep(0.01)
+        assert started == [running, new]
+        assert orchestrator.tasks[new].status == TaskStatus.COMPLETED
+        await orchestrator.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_running_tasks_concurrently(self, orchestrator):
+        """测试关闭时并发取消运行中的任务，单个任务取消失败不影响其他任务"""
+        for task_id in ("a", "b", "c"):
+            orchestrator.tasks[task_id] = TaskResult(task_id=task_id, status=TaskStatus.RUNNING)
+            orchestrator._tasks_by_status[TaskStatus.RUNNING].add(task_id)
+
+        in_flight = []
+        finished = []
+
+        async def fake_cancel(task_id):
+            in_flight.append(task_id)
+            await asyncio.sleep(0.01)
+            if task_id == "b":
+                raise RuntimeError("archive failed")
+            # 记录完成时已开始取消的任务数
+            finished.append(len(in_flight))
+            return True
+
+        orchestrator.cancel_task = fake_cancel
+        await orchestrator.shutdown()
+
+        assert sorted(in_flight) == ["a", "b", "c"]
+        assert finished == [3, 3]
+
+    @pytest.mark.asyncio
+    async def test_task_history_evicts_least_recent_finished(self, orchestrator):
+        """测试任务历史超出上限时淘汰最久未访问的已结束任务"""
+        orchestrator._max_history = 3
+        for task_id, status in (("old_done", TaskStatus.COMPLETED),
+                                ("running", TaskStatus.RUNNING),
+                                ("recent_done", TaskStatus.FAILED)):
+            orchestrator.tasks[task_id] = TaskResult(task_id=task_id, status=status)
+
+        # 访问后变为最近使用
+        assert await orchestrator.get_task_status("old_done") is not None
+
+        new_id = await orchestrator.create_task(TaskRequest(goal="search"))
+
+        assert list(orchestrator.tasks) == ["running", "old_done", new_id]
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_bounds_concurrency(self):
+        """测试任务由有限的工作协程执行，取消会中断正在执行的任务"""
+        orchestrator = Orchestrator(max_concurrency=1)
+        release = asyncio.Event()
+        started = []
+
+        async def fake_execute(task_id, request):
+            started.append(task_id)
+            orchestrator.tasks[task_id].status = TaskStatus.RUNNING
+            await release.wait()
+
+        orchestrator._execute_task = fake_execute
+
+        first = await orchestrator.create_task(TaskRequest(goal="first"))
+        second = await orchestrator.create_task(TaskRequest(goal="second"))
+        await asyncio.sleep(0.01)
+        assert started == [first]
+
+        # 取消第一个任务后，唯一的工作协程转而执行第二个任务
+        execution = orchestrator._running[first]
+        assert await orchestrator.cancel_task(first) is True
+        assert execution.cancelled()
+        await asyncio.sleep(0.01)
+        assert started == [first, second]
+        assert first not in orchestrator._running
+
+        release.set()
+        await orchestrator.shutdown()
+        assert orchestrator._workers == []
+
+        with pytest.raises(ValidationError):
+            Orchestrator(max_concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_finished_tasks_archived_to_task_store(self):
+        """测试已结束的任务写入外部存储，淘汰后仍可查询"""
+        class FakeRedis:
+            def __init__(self):
+                self.data = {}
+                self.expiry = {}
+
+            async def set(self, key, value, ex=None):
+                self.data[key] = value
+                self.expiry[key] = ex
+
+            async def get(self, key):
+                return self.data.get(key)
+
+        client = FakeRedis()
+        orchestrator = Orchestrator(task_store=RedisTaskStore(client, ttl=60))
+        orchestrator.command_parser.parse_command = AsyncMock(return_value={})
+        orchestrator.risk_engine.assess_risk = AsyncMock(return_value={})
+        orchestrator.policy_engine.check_policy = AsyncMock(return_value=Mock(allowed=True))
+        orchestrator.skill_library.find_matching_skill = AsyncMock(return_value=None)
+        orchestrator._execute_strategy = AsyncMock(return_value={'success': True})
+
+        orchestrator.tasks["done"] = TaskResult(task_id="done", status=TaskStatus.PENDING)
+        await orchestrator._execute_task("done", TaskRequest(goal="search", retry_count=0))
+        assert client.expiry == {"aura:task:done": 60}
+
+        orchestrator._max_history = 0
+        orchestrator._evict_finished_tasks()
+        assert "done" not in orchestrator.tasks
+
+        archived = await orchestrator.get_task_status("done")
+        assert archived.status == TaskStatus.COMPLETED
+        assert archived.result == {'success': True}
+        assert await orchestrator.get_task_status("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_file_task_store_round_trip(self, temp_dir):
+        """测试本地文件任务存储的读写"""
+        store = FileTaskStore(str(temp_dir / "tasks"))
+        task = TaskResult(
+            task_id="abc-1", status=TaskStatus.FAILED, error="boom",
+            request=TaskRequest(goal="search", risk_level=RiskLevel.HIGH),
+            strategy=StrategyDecision(mode=ExecutionMode.AI_AGENT, plan="explore")
+        )
+        task.execution_log.append(("parse", 1700000000.0, {"intent": "search"}))
+
+        await store.save(task)
+        # 以 JSON 保存，读取时不会反序列化任意对象
+        assert json.loads((temp_dir / "tasks" / "abc-1.json").read_text())["status"] == "failed"
+        loaded = await store.load("abc-1")
+        assert loaded.status == TaskStatus.FAILED
+        assert loaded.error == "boom"
+        assert loaded.created_at == task.created_at
+        assert loaded.request == task.request
+        assert loaded.strategy == task.strategy
+        assert list(loaded.execution_log) == list(task.execution_log)
+        assert loaded.execution_log.maxlen == task.execution_log.maxlen
+
+        assert await store.load("abc-2") is None
+        assert await store.load("../abc-1") is None
+
     @pytest.mark.asyncio
     async def test_invalid_job_id(self, orchestrator):
         """测试无效任务ID"""
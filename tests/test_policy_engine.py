@@ -0,0 +1,293 @@
+"""策略引擎测试"""
+import dataclasses
+import pytest
+from unittest.mock import patch
+
+from src.core.policy_engine import PolicyEngine, PolicyRule, PolicyAction
+from src.core.risk_engine import RiskAssessment, RiskLevel
+from src.utils.exceptions import ValidationError
+from src.modules.command_parser import ParsedCommand, IntentMatch, IntentType
+
+
+def make_command(intent: IntentType, **context) -> ParsedCommand:
+    """构造只包含主要意图和上下文的解析结果"""
+    return ParsedCommand(
+        original_text=intent.value,
+        normalized_text=intent.value,
+        primary_intent=IntentMatch(intent=intent, confidence=1.0),
+        context=context
+    )
+
+
+class TestPolicyEngine:
+    """策略引擎测试类"""
+
+    @pytest.mark.asyncio
+    async def test_default_rules(self, policy_engine):
+        """测试默认规则的匹配结果"""
+        result = await policy_engine.check_policy(make_command(IntentType.NAVIGATE), {})
+        assert result.allowed is True
+        assert result.action == PolicyAction.ALLOW
+
+        result = await policy_engine.check_policy(
+            make_command(IntentType.NAVIGATE, target_url="https://example.com/login"), {})
+        assert result.allowed is False
+        assert result.reason == "Denied by policy rule: 禁止访问敏感数据"
+
+        result = await policy_engine.check_policy(
+            make_command(IntentType.CLICK, target_domain="paypal.com"), {})
+        assert result.approval_required is True
+
+        result = await policy_engine.check_policy(make_command(IntentType.CLICK), {})
+        assert result.allowed is False
+        assert result.reason == "No matching policy rule found, default deny"
+        # 默认拒绝结果共用同一实例
+        other = await policy_engine.check_policy(make_command(IntentType.SCROLL), {})
+        assert other is result
+
+    @pytest.mark.asyncio
+    async def test_rules_kept_in_priority_order(self, policy_engine):
+        """测试规则在添加和更新时保持优先级顺序，禁用的规则不参与匹配"""
+        policy_engine.add_rule(PolicyRule(
+            id="deny_navigate", name="禁止导航", description="",
+            conditions={"action_types": ["navigate"]},
+            action=PolicyAction.DENY, priority=50
+        ))
+        priorities = [rule.priority for rule in policy_engine.get_rules()]
+        assert priorities == sorted(priorities)
+
+        command = make_command(IntentType.NAVIGATE)
+        assert (await policy_engine.check_policy(command, {})).allowed is False
+
+        # 调低优先级后由只读规则先匹配
+        assert policy_engine.update_rule("deny_navigate", {"priority": 200}) is True
+        assert policy_engine.get_rules()[-1].id == "deny_navigate"
+        assert (await policy_engine.check_policy(command, {})).allowed is True
+
+        policy_engine.update_rule("deny_navigate", {"priority": 50})
+        policy_engine.update_rule("deny_navigate", {"enabled": False})
+        assert (await policy_engine.check_policy(command, {})).allowed is True
+
+        policy_engine.update_rule("deny_navigate", {"enabled": True})
+        assert (await policy_engine.check_policy(command, {})).allowed is False
+        assert policy_engine.remove_rule("deny_navigate") is True
+        assert (await policy_engine.check_policy(command, {})).allowed is True
+
+    @pytest.mark.asyncio
+    async def test_url_patterns_compiled_per_rule(self, policy_engine):
+        """测试规则的URL模式预编译为一个正则，更新条件后重新编译"""
+        rule = PolicyRule(
+            id="deny_admin", name="禁止后台", description="",
+            conditions={"url_patterns": ["*/admin", "https://internal.*"]},
+            action=PolicyAction.DENY, priority=1
+        )
+        assert rule._url_regex.match("https://example.com/ADMIN")
+        assert rule._url_regex.match("https://internal.example.com/")
+        assert rule._url_regex.match("https://example.com/") is None
+
+        # 除*外的字符按字面匹配，模式之后的路径和查询参数不影响匹配
+        pay_rule = PolicyRule(
+            id="deny_pay", name="禁止支付页", description="",
+            conditions={"url_patterns": ["*.pay.com/*", "*/checkout?step=2"]},
+            action=PolicyAction.DENY
+        )
+        assert pay_rule._url_regex.match("https://www.pay.com/")
+        assert pay_rule._url_regex.match("https://wwwxpay.com/") is None
+        assert pay_rule._url_regex.match("https://shop.com/checkout?step=2&coupon=1")
+        assert pay_rule._url_regex.match("https://shop.com/checkoutstep=2") is None
+
+        policy_engine.add_rule(rule)
+        command = make_command(IntentType.NAVIGATE, target_url="https://example.com/settings")
+        assert (await policy_engine.check_policy(command, {})).allowed is True
+
+        policy_engine.update_rule("deny_admin", {"conditions": {"url_patterns": ["*/settings"]}})
+        assert (await policy_engine.check_policy(command, {})).allowed is False
+
+        policy_engine.update_rule("deny_admin", {"conditions": {}})
+        assert rule._url_regex is None
+
+    @pytest.mark.asyncio
+    async def test_check_policy_caches_decisions(self, policy_engine):
+        """测试相同输入的检查结果被缓存，规则变更后缓存失效"""
+        command = make_command(IntentType.NAVIGATE, target_url="https://example.com/",
+                               element_types=["link"])
+        first = await policy_engine.check_policy(command, {"level": "low"})
+
+        with patch.object(policy_engine, '_match_rule') as mock_match, \
+                patch('src.core.policy_engine.logger') as mock_logger:
+            again = await policy_engine.check_policy(
+                make_command(IntentType.NAVIGATE, target_url="https://example.com/",
+                             element_types=["link"]),
+                {"level": "low"})
+            mock_match.assert_not_called()
+            # 命中缓存时仍记录匹配的规则
+            mock_logger.info.assert_called_once_with("Policy rule matched: %s", "允许只读操作")
+        assert again is first
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            again.allowed = False
+
+        # 风险级别不同时不命中缓存
+        await policy_engine.check_policy(command, {"level": "high"})
+        assert len(policy_engine._decision_cache) == 2
+
+        policy_engine.add_rule(PolicyRule(
+            id="deny_example", name="禁止示例站点", description="",
+            conditions={"url_patterns": ["https://example.com/*"]},
+            action=PolicyAction.DENY, priority=1
+        ))
+        assert policy_engine._decision_cache == {}
+        assert (await policy_engine.check_policy(command, {"level": "low"})).allowed is False
+
+    @pytest.mark.asyncio
+    async def test_rule_conditions_compiled_to_predicates(self):
+        """测试各类条件编译为匹配函数，任一条件满足即匹配"""
+        engine = PolicyEngine()
+        for rule in engine.get_rules():
+            engine.remove_rule(rule.id)
+        engine.add_rule(PolicyRule(
+            id="mfa", name="敏感操作需要MFA", description="",
+            conditions={
+                "action_types": ["upload"],
+                "element_types": ["file-input"],
+                "min_risk_level": "high",
+                "external_domains": True
+            },
+            action=PolicyAction.REQUIRE_MFA
+        ))
+        assert len(engine.rules[0]._predicates) == 4
+        # 规则的 conditions 保持原样
+        assert engine.rules[0].conditions["action_types"] == ["upload"]
+
+        async def check(command, risk_assessment=None):
+            result = await engine.check_policy(command, risk_assessment or {})
+            return result.mfa_required
+
+        assert await check(make_command(IntentType.UPLOAD))
+        assert await check({"action_type": "UPLOAD"})
+        assert await check(make_command(IntentType.CLICK, element_types=["button", "file-input"]))
+        assert await check(make_command(IntentType.CLICK, is_external_domain=True))
+        assert await check(make_command(IntentType.CLICK), {"level": "critical"})
+        # 风险评估也可以是 RiskAssessment 对象
+        assessment = RiskAssessment(level=RiskLevel.HIGH, score=0.8, factors=[], recommendations=[])
+        assert await check(make_command(IntentType.CLICK), assessment)
+
+        assert not await check(make_command(IntentType.CLICK), {"level": "medium"})
+        # 未知的风险级别不满足任何最低风险级别
+        assert not await check(make_command(IntentType.CLICK), {"level": "unknown"})
+
+        # 规则的最低风险级别在创建时校验
+        with pytest.raises(ValidationError):
+            PolicyRule(id="bad", name="bad", description="", conditions={"min_risk_level": "severe"},
+                       action=PolicyAction.DENY)
+        assert not await check({"action_type": None})
+
+    def test_policy_stats_follow_rule_changes(self, policy_engine):
+        """测试统计信息随规则增删改同步更新"""
+        stats = policy_engine.get_policy_stats()
+        assert stats["total_rules"] == 4
+        assert stats["enabled_rules"] == 4
+        assert stats["rule_types"] == {
+            "allow": 1, "deny": 1, "require_approval": 2, "require_mfa": 0
+        }
+
+        policy_engine.update_rule("allow_read_only", {"action": PolicyAction.REQUIRE_MFA, "enabled": False})
+        policy_engine.remove_rule("deny_sensitive_data")
+        stats = policy_engine.get_policy_stats()
+        assert stats["total_rules"] == 3
+        assert stats["enabled_rules"] == 2
+        assert stats["rule_types"] == {
+            "allow": 0, "deny": 0, "require_approval": 2, "require_mfa": 1
+        }
+
+    @pytest.mark.asyncio
+    async def test_rules_indexed_by_action_type(self, policy_engine):
+        """测试按操作类型索引规则，只检查可能匹配的规则"""
+        def ids(rules):
+            return [rule.id for rule in rules]
+
+        # 限制表单提交规则还有外部域名条件，不能按操作类型跳过
+        assert ids(policy_engine._unindexed_rules) == [
+            "deny_sensitive_data", "require_approval_financial", "limit_form_submission"
+        ]
+        assert ids(policy_engine._rules_by_action_type["navigate"]) == [
+            "deny_sensitive_data", "require_approval_financial", "limit_form_submission", "allow_read_only"
+        ]
+        assert "click" not in policy_engine._rules_by_action_type
+
+        policy_engine.add_rule(PolicyRule(
+            id="mfa_upload", name="上传需要MFA", description="",
+            conditions={"action_types": ["upload"]},
+            action=PolicyAction.REQUIRE_MFA, priority=40
+        ))
+        assert ids(policy_engine._rules_by_action_type["upload"])[-1] == "mfa_upload"
+        assert "mfa_upload" not in ids(policy_engine._rules_by_action_type["navigate"])
+
+        assert (await policy_engine.check_policy(make_command(IntentType.UPLOAD), {})).mfa_required
+        assert (await policy_engine.check_policy(make_command(IntentType.NAVIGATE), {})).allowed
+        result = await policy_engine.check_policy(make_command(IntentType.CLICK, is_external_domain=True), {})
+        assert result.approval_required
+
+    def test_rule_ids_are_unique(self, policy_engine):
+        """测试规则ID唯一，按ID删除和更新"""
+        duplicate = PolicyRule(
+            id="allow_read_only", name="重复规则", description="",
+            conditions={"action_types": ["click"]}, action=PolicyAction.ALLOW
+        )
+        with pytest.raises(ValidationError):
+            policy_engine.add_rule(duplicate)
+        assert len(policy_engine.get_rules()) == 4
+
+        # 规则ID不能通过 update_rule 修改，未知字段也会被拒绝，规则保持不变
+        priority = policy_engine._rules_by_id["allow_read_only"].priority
+        with pytest.raises(ValidationError):
+            policy_engine.update_rule("allow_read_only", {"id": "renamed", "priority": 5})
+        with pytest.raises(ValidationError) as exc_info:
+            policy_engine.update_rule("allow_read_only", {"priority": 5, "_predicates": ()})
+        assert exc_info.value.field == "_predicates"
+        assert policy_engine._rules_by_id["allow_read_only"].priority == priority
+        assert "renamed" not in policy_engine._rules_by_id
+        assert policy_engine.update_rule("allow_read_only", {"id": "allow_read_only", "priority": 5}) is True
+        assert policy_engine.get_rules()[0].id == "allow_read_only"
+        assert policy_engine.update_rule("missing", {"priority": 1}) is False
+
+        assert policy_engine.remove_rule("allow_read_only") is True
+        assert policy_engine.remove_rule("allow_read_only") is False
+        policy_engine.add_rule(duplicate)
+        assert policy_engine._rules_by_id["allow_read_only"] is duplicate
+
+    @pytest.mark.asyncio
+    async def test_unhashable_context_not_cached(self, policy_engine):
+        """测试上下文包含列表等无法哈希的值时按原方式匹配，不写入缓存"""
+        command = make_command(IntentType.NAVIGATE, target_domain=["a.com", "b.com"],
+                               element_types=[{"type": "password"}, "link"])
+        result = await policy_engine.check_policy(command, {})
+        assert result.allowed is True
+        assert len(policy_engine._decision_cache) == 0
+
+        command = make_command(IntentType.CLICK, element_types=[{"type": "x"}, "password"])
+        assert (await policy_engine.check_policy(command, {})).allowed is False
+        assert len(policy_engine._decision_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_rejected_update_leaves_rule_unchanged(self, policy_engine):
+        """测试条件校验失败的更新不修改规则，已有决策保持一致"""
+        command = make_command(IntentType.NAVIGATE)
+        assert (await policy_engine.check_policy(command, {})).allowed is True
+        rule = policy_engine._rules_by_id["allow_read_only"]
+        conditions, predicates = rule.conditions, rule._predicates
+
+        with pytest.raises(ValidationError):
+            policy_engine.update_rule("allow_read_only", {
+                "action": PolicyAction.DENY,
+                "conditions": {"action_types": ["navigate"], "min_risk_level": "severe"}
+            })
+
+        assert rule.conditions is conditions
+        assert rule._predicates is predicates
+        assert rule.action == PolicyAction.ALLOW
+        assert (await policy_engine.check_policy(command, {})).allowed is True
+
+        # 有效的更新替换条件并清空决策缓存
+        policy_engine.update_rule("allow_read_only", {"conditions": {"action_types": ["read"]}})
+        assert policy_engine._rules_by_id["allow_read_only"] is rule
+        assert (await policy_engine.check_policy(command, {})).allowed is False
@@ -1,5 +1,6 @@
 """站点探索器测试"""
 import pytest
+import asyncio
 import json
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from datetime import datetime, timedelta
@@ -40,6 +41,29 @@ class TestSiteExplorer:
         assert "https://example.com" in site_model.pages
         assert site_model.pages["https://example.com"].title == "Example Site"
 
+    @pytest.mark.asyncio
+    async def test_explore_site_yields_to_event_loop(self, site_explorer):
+        """测试没有浏览器上下文的探索过程中其他协程仍能运行"""
+        task = ExplorationTask(
+            id="yield_task",
+            domain="example.com",
+            start_url="https://example.com",
+            strategy=ExplorationStrategy.BREADTH_FIRST,
+            max_pages=4
+        )
+        ticks = []
+
+        async def ticker():
+            for _ in range(3):
+                ticks.append(len(site_explorer.site_models.get("example.com", Mock(pages={})).pages))
+                await asyncio.sleep(0)
+
+        await asyncio.gather(site_explorer.explore_site(task), ticker())
+
+        assert len(site_explorer.site_models["example.com"].pages) == 4
+        # ticker 在探索完成之前就已运行
+        assert ticks[-1] < 4
+
     @pytest.mark.asyncio
     async def test_explore_site_with_depth_limit(self, site_explorer):
         """测试带深度限制的站点探索"""
@@ -257,6 +281,20 @@ class TestSiteExplorer:
         assert len(sample_site_model["pages"]) > 0
         assert sample_site_model["metadata"]["lastExplored"] is not None
 
+    def test_site_model_homepage_index(self):
+        """测试添加页面时维护首页URL索引"""
+        model = SiteModel(domain="example.com", version="1.0.0")
+        assert model.homepage_url is None
+
+        model.add_page("/", PageInfo(url="/", title="Home", type=PageType.HOMEPAGE))
+        model.add_page("/p/1", PageInfo(url="/p/1", title="Item", type=PageType.PRODUCT))
+        model.add_page("/home", PageInfo(url="/home", title="Home", type=PageType.HOMEPAGE))
+        assert model.homepage_url == "/"
+
+        # 原首页被重新分类后，索引指向剩余的首页
+        model.add_page("/", PageInfo(url="/", title="Moved", type=PageType.UNKNOWN))
+        assert model.homepage_url == "/home"
+
     def test_page_model_creation(self):
         """测试PageModel创建"""
         page = {
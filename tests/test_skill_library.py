@@ -240,6 +240,30 @@ module.exports = { executeSkill };
         assert len(matches) >= 1
         assert matches[0].id == sample_skill_manifest.id
 
+    @pytest.mark.asyncio
+    async def test_find_matching_skill_cached(self, skill_library, sample_skill_manifest, temp_dir):
+        """测试意图匹配结果被缓存，注册新技能后缓存失效"""
+        assert await skill_library.find_matching_skill("search", {}) is None
+        assert skill_library._match_cache == {"search": None}
+
+        skill_dir = temp_dir / sample_skill_manifest.id
+        skill_dir.mkdir()
+        skill_library.register_skill(manifest=sample_skill_manifest, skill_path=skill_dir)
+        assert skill_library._match_cache == {}
+
+        match = await skill_library.find_matching_skill("Search", {"query": "kindle"})
+        assert match == {
+            "skill_id": sample_skill_manifest.id,
+            "confidence": 0.9,
+            "parameters": {"query": "kindle"}
+        }
+
+        # 命中缓存时不再遍历技能表
+        with patch.object(skill_library, '_match_skill_id') as mock_match:
+            again = await skill_library.find_matching_skill("search", {"query": "book"})
+            mock_match.assert_not_called()
+        assert again["parameters"] == {"query": "book"}
+
     def test_skill_library_basic_operations(self, skill_library, sample_skill_manifest, temp_dir):
         """测试基本技能库操作"""
         # 注册技能